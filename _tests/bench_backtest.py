@@ -0,0 +1,64 @@
+"""
+Benchmark of the offline alert backtester.
+
+Evaluates ``RULES`` synthetic rules (a mix of avg/max/rate conditions over
+5m-1h ranges with varying thresholds and ``for`` durations) against
+``SERIES`` series of one week of 15-second samples.
+
+Run with:
+    python -m app.core.grafana._tests.bench_backtest
+"""
+
+import time
+
+import numpy as np
+
+from app.core.grafana.alert_manager import AlertRule
+from app.core.grafana.backtest import Backtester, SeriesSet
+
+RULES = 2000
+SERIES = 50
+STEP = 15.0
+SAMPLES = 7 * 24 * 3600 // int(STEP)
+
+
+def build_series() -> SeriesSet:
+    rng = np.random.default_rng(0)
+    ts = np.arange(SAMPLES) * STEP
+    samples = {}
+    for i in range(SERIES):
+        if i % 2:
+            samples[f"requests_total_{i}"] = (ts, np.cumsum(rng.poisson(20, SAMPLES)).astype(float))
+        else:
+            daily = 50 + 30 * np.sin(ts / 86400 * 2 * np.pi)
+            samples[f"cpu_{i}"] = (ts, daily + rng.normal(0, 10, SAMPLES))
+    return SeriesSet.from_samples(samples, STEP)
+
+
+def build_rules() -> tuple[list[AlertRule], dict[str, str]]:
+    rules, for_durations = [], {}
+    ranges = ("5m", "15m", "1h")
+    for i in range(RULES):
+        series = i % SERIES
+        if series % 2:
+            condition = f"rate(requests_total_{series}[{ranges[i % 3]}]) > {1.3 + (i % 7) / 100}"
+        else:
+            func = ("avg", "max")[i % 2]
+            condition = f"{func}(cpu_{series}[{ranges[i % 3]}]) > {70 + i % 25}"
+        rules.append(AlertRule(uid=f"rule-{i}", title=f"Rule {i}", condition=condition, severity="warning"))
+        for_durations[f"rule-{i}"] = ("0s", "5m", "15m")[i % 3]
+    return rules, for_durations
+
+
+def main() -> None:
+    series = build_series()
+    rules, for_durations = build_rules()
+    started = time.perf_counter()
+    results = Backtester(series).run(rules, for_durations=for_durations)
+    elapsed = time.perf_counter() - started
+    episodes = sum(r.fire_count for r in results.values())
+    print(f"{RULES} rules x {SAMPLES} samples: {elapsed:.2f}s ({episodes} firing episodes)")
+
+
+if __name__ == "__main__":
+    main()
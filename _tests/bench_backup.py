@@ -0,0 +1,114 @@
+"""
+Benchmark of backup file formats: size and write/read time.
+
+Builds a synthetic instance from the dashboards in ``provisioning/dashboards``
+(each replicated ``COPIES`` times under distinct uids) and writes it as:
+- the legacy ``save_to_file`` format (pretty-printed JSON)
+- streaming NDJSON
+- gzip NDJSON compressed on one worker and on all workers
+
+Run with:
+    python -m app.core.grafana._tests.bench_backup
+"""
+
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from app.core.grafana.backup_writer import (
+    CompressedBackupWriter,
+    NDJSONBackupWriter,
+    iter_ndjson_records,
+)
+
+DASHBOARD_ROOT = Path(__file__).parent.parent / "provisioning" / "dashboards"
+COPIES = 200
+
+
+def load_dashboards() -> list[dict]:
+    models = []
+    for path in sorted(DASHBOARD_ROOT.rglob("*.json")):
+        with open(path) as f:
+            model = json.load(f)
+        models.append(model.get("dashboard", model))
+    dashboards = []
+    for copy in range(COPIES):
+        for i, model in enumerate(models):
+            dashboard = dict(model, uid=f"bench-{copy}-{i}", version=copy + 1)
+            dashboards.append({"dashboard": dashboard, "meta": {"folderUid": ""}})
+    return dashboards
+
+
+def write_json(path: Path, dashboards: list[dict]) -> None:
+    with open(path, "w") as f:
+        json.dump({"version": "1.0", "dashboards": dashboards}, f, indent=2)
+
+
+def write_stream(path: Path, dashboards: list[dict], writer_factory) -> None:
+    with writer_factory(path) as writer:
+        writer.write("header", {"version": "2.0"})
+        for dashboard in dashboards:
+            writer.write("dashboard", dashboard)
+
+
+def read_json(path: Path) -> int:
+    with open(path) as f:
+        return len(json.load(f)["dashboards"])
+
+
+def read_stream(path: Path) -> int:
+    return sum(1 for _ in iter_ndjson_records(path))
+
+
+def main() -> None:
+    dashboards = load_dashboards()
+    workers = os.cpu_count() or 1
+    formats = [
+        ("json (indent=2)", "backup.json", lambda p: write_json(p, dashboards), read_json),
+        (
+            "ndjson",
+            "backup.ndjson",
+            lambda p: write_stream(p, dashboards, NDJSONBackupWriter),
+            read_stream,
+        ),
+        (
+            "ndjson.gz, 1 worker",
+            "backup1.ndjson.gz",
+            lambda p: write_stream(p, dashboards, lambda q: CompressedBackupWriter(q, workers=1)),
+            read_stream,
+        ),
+        (
+            f"ndjson.gz, {workers} workers",
+            "backupN.ndjson.gz",
+            lambda p: write_stream(
+                p, dashboards, lambda q: CompressedBackupWriter(q, workers=workers)
+            ),
+            read_stream,
+        ),
+    ]
+
+    print(f"{len(dashboards)} dashboards from {DASHBOARD_ROOT}")
+    print(f"{'format':<24}{'size':>12}{'ratio':>8}{'write':>10}{'read':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        baseline = None
+        for name, filename, write, read in formats:
+            path = Path(tmp) / filename
+            started = time.perf_counter()
+            write(path)
+            write_time = time.perf_counter() - started
+            started = time.perf_counter()
+            assert read(path) >= len(dashboards)
+            read_time = time.perf_counter() - started
+
+            size = path.stat().st_size
+            baseline = baseline or size
+            print(
+                f"{name:<24}{size / 1e6:>10.2f}MB{baseline / size:>7.1f}x"
+                f"{write_time * 1e3:>8.0f}ms{read_time * 1e3:>8.0f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
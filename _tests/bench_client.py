@@ -0,0 +1,33 @@
+"""
+Microbenchmark for GrafanaClient.get_client handle construction.
+
+Compares the per-call cost of rebuilding ``GrafanaApi`` on every call
+(the previous behaviour, ``_build_client``) with the cached handle.
+No network access is needed: ``GrafanaApi.from_url`` does not connect.
+
+Run with:
+    python -m app.core.grafana._tests.bench_client
+"""
+
+import timeit
+
+from app.core.grafana.client import GrafanaClient
+from app.core.grafana.config import GrafanaConfig
+
+ITERATIONS = 2000
+
+
+def main() -> None:
+    client = GrafanaClient(config=GrafanaConfig())
+    client.get_client()  # warm the cache and the session
+
+    rebuild = timeit.timeit(client._build_client, number=ITERATIONS) / ITERATIONS
+    cached = timeit.timeit(client.get_client, number=ITERATIONS) / ITERATIONS
+
+    print(f"rebuild per call: {rebuild * 1e6:10.2f} us")
+    print(f"cached per call:  {cached * 1e6:10.2f} us")
+    print(f"speedup:          {rebuild / cached:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
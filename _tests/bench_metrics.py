@@ -0,0 +1,64 @@
+"""
+Benchmark of per-event metric recording cost, direct vs buffered.
+
+Measures ``EVENTS`` calls of the hot-path helpers in ``metrics.py``:
+- ``record_valkey_cache_hit()`` (unlabelled counter behind a factory)
+- ``record_celery_task_success()`` (labelled counter)
+- ``record_grafana_metric()`` (cached children: counter + gauge)
+- ``record_valkey_cache_hits(100)`` (batch API, cost per event)
+
+once with direct recording and once through the buffered recorder, whose
+flush time is reported separately.
+
+Run with:
+    python -m app.core.grafana._tests.bench_metrics
+"""
+
+import time
+
+from app.core.grafana import metrics
+from app.core.grafana.alert_manager import AlertRule
+
+EVENTS = 200_000
+BATCH = 100
+
+
+def per_event_ns(fn, events: int = EVENTS) -> float:
+    started = time.perf_counter()
+    fn()
+    return (time.perf_counter() - started) / events * 1e9
+
+
+def run_suite(label: str) -> None:
+    alert = AlertRule(uid="cpu", title="CPU high", condition="avg() > 1", severity="critical")
+    cases = {
+        "valkey_cache_hit": lambda: [metrics.record_valkey_cache_hit() for _ in range(EVENTS)],
+        "celery_task_success": lambda: [
+            metrics.record_celery_task_success("sync") for _ in range(EVENTS)
+        ],
+        "grafana_metric": lambda: [
+            metrics.record_grafana_metric("alert_create", alert, "success", 0.01, None)
+            for _ in range(EVENTS)
+        ],
+        f"valkey_cache_hits({BATCH})": lambda: [
+            metrics.record_valkey_cache_hits(BATCH) for _ in range(EVENTS // BATCH)
+        ],
+    }
+    for name, fn in cases.items():
+        print(f"{label:>8} {name:<24} {per_event_ns(fn):8.1f} ns/event")
+
+
+def main() -> None:
+    run_suite("direct")
+    recorder = metrics.enable_buffered_metrics(interval=3600)
+    try:
+        run_suite("buffered")
+        started = time.perf_counter()
+        recorder.flush()
+        print(f"buffered flush of {3 * EVENTS + EVENTS} events: {(time.perf_counter() - started) * 1e3:.2f} ms")
+    finally:
+        metrics.disable_buffered_metrics()
+
+
+if __name__ == "__main__":
+    main()
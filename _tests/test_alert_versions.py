@@ -0,0 +1,156 @@
+import logging
+import os
+import sqlite3
+import subprocess
+import sys
+import time
+
+import pytest
+
+from app.core.grafana.alert_versions import AlertVersionStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    with AlertVersionStore(tmp_path / "versions.db", cache_size=2, batch_size=3) as store:
+        yield store
+
+
+def test_versions_persist_with_history(tmp_path):
+    path = tmp_path / "versions.db"
+    with AlertVersionStore(path) as store:
+        store.record({"a": 1}, "alice")
+        store.record({"a": 2, "b": 5}, "bob")
+
+    with AlertVersionStore(path) as reopened:
+        assert reopened.current_versions(["a", "b", "c"]) == {"a": 2, "b": 5, "c": 0}
+        history = reopened.history("a")
+    assert [(h["version"], h["updated_by"]) for h in history] == [(1, "alice"), (2, "bob")]
+
+
+def test_writes_are_batched_but_visible(store):
+    store.record({"a": 1}, "alice")
+    store.record({"b": 1}, "alice")
+    assert store._conn.execute("SELECT COUNT(*) FROM alert_versions").fetchone() == (0,)
+    assert store.current_versions(["a", "b"]) == {"a": 1, "b": 1}
+
+    store.record({"c": 1}, "alice")  # reaches batch_size
+    assert store._conn.execute("SELECT COUNT(*) FROM alert_versions").fetchone() == (3,)
+
+
+def test_non_incrementing_batch_records_nothing(store):
+    store.record({"a": 3}, "alice")
+    with pytest.raises(ValueError, match="a"):
+        store.record({"b": 1, "a": 3}, "bob")
+    assert store.current_versions(["a", "b"]) == {"a": 3, "b": 0}
+
+
+def test_bulk_lookup_uses_one_query_for_misses(tmp_path):
+    path = tmp_path / "versions.db"
+    with AlertVersionStore(path, batch_size=10000) as store:
+        store.record({f"rule-{i}": i + 1 for i in range(5000)}, "alice")
+
+    with AlertVersionStore(path) as store:
+        statements = []
+        store._conn.set_trace_callback(statements.append)
+        versions = store.current_versions(f"rule-{i}" for i in range(5000))
+        assert versions["rule-4999"] == 5000
+        assert len([s for s in statements if s.lstrip().startswith("SELECT")]) == 1
+
+        statements.clear()
+        assert store.current_version("rule-10") == 11  # cached
+        assert statements == []
+
+
+def test_cache_is_bounded(store):
+    store.record({"a": 1, "b": 1, "c": 1}, "alice")
+    assert list(store._cache) == ["b", "c"]
+    assert store.current_version("a") == 1  # evicted, read back from the database
+    assert list(store._cache) == ["c", "a"]
+
+
+def test_buffered_write_is_committed_by_timer(tmp_path):
+    path = tmp_path / "versions.db"
+    store = AlertVersionStore(path, flush_interval=0.01)
+    store.record({"a": 1}, "alice")
+    time.sleep(0.2)
+
+    with AlertVersionStore(path) as reopened:
+        assert reopened.current_version("a") == 1
+    store.close()
+
+
+def test_buffered_write_survives_process_exit(tmp_path):
+    path = tmp_path / "versions.db"
+    script = (
+        "from app.core.grafana.alert_versions import AlertVersionStore\n"
+        f"AlertVersionStore({str(path)!r}, flush_interval=3600).record({{'a': 2}}, 'alice')\n"
+    )
+    subprocess.run([sys.executable, "-c", script], check=True, env=os.environ.copy())
+
+    with AlertVersionStore(path) as reopened:
+        assert reopened.current_version("a") == 2
+        assert [h["updated_by"] for h in reopened.history("a")] == ["alice"]
+
+
+def test_manager_close_commits_versions(tmp_path):
+    from unittest.mock import MagicMock
+
+    from app.core.grafana.alert_manager import GrafanaAlertManager
+
+    path = tmp_path / "versions.db"
+    versions = AlertVersionStore(path, flush_interval=3600)
+    manager = GrafanaAlertManager(MagicMock(), versions=versions)
+    manager.update_alert_version("a", 1, "alice")
+    manager.close()
+
+    with AlertVersionStore(path) as reopened:
+        assert reopened.current_version("a") == 1
+
+
+def test_flush_drops_versions_another_writer_committed_first(tmp_path, caplog):
+    path = tmp_path / "versions.db"
+    ours = AlertVersionStore(path, flush_interval=3600)
+    theirs = AlertVersionStore(path, flush_interval=3600)
+    ours.current_versions(["a", "b"])  # warm the cache before the other process writes
+    theirs.record({"a": 1}, "bob")
+    theirs.flush()
+
+    ours.record({"a": 1, "b": 1}, "alice")
+    with caplog.at_level(logging.WARNING, logger="grafana.alerts.versions"):
+        ours.flush()
+    assert "overtaken by another writer: a" in caplog.text
+    assert ours._pending == []
+
+    assert [h["updated_by"] for h in ours.history("a")] == ["bob"]
+    assert ours.current_versions(["a", "b"]) == {"a": 1, "b": 1}
+    ours.record({"a": 2}, "alice")
+    ours.close()
+    theirs.close()
+
+
+def test_timer_flush_failure_is_logged_and_keeps_rows(tmp_path, caplog, monkeypatch):
+    store = AlertVersionStore(tmp_path / "versions.db", flush_interval=3600)
+    store.record({"a": 1}, "alice")
+    conn = store._conn
+
+    class LockedConnection:
+        # sqlite3.Connection methods are read-only, so wrap it instead of patching
+        def __getattr__(self, name):
+            return getattr(conn, name)
+
+        def execute(self, sql, *args):
+            if sql == "BEGIN IMMEDIATE":
+                raise sqlite3.OperationalError("database is locked")
+            return conn.execute(sql, *args)
+
+    monkeypatch.setattr(store, "_conn", LockedConnection())
+    with caplog.at_level(logging.ERROR, logger="grafana.alerts.versions"):
+        store._flush_from_timer()
+    assert "Failed to flush alert versions" in caplog.text
+    assert len(store._pending) == 1
+
+    monkeypatch.undo()
+    store.close()
+    with AlertVersionStore(tmp_path / "versions.db") as reopened:
+        assert reopened.current_version("a") == 1
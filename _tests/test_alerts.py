@@ -2,6 +2,7 @@ import asyncio
 from datetime import datetime
 from unittest.mock import MagicMock, patch, AsyncMock
 
+import httpx
 import pytest
 
 from app.core.grafana.alert_manager import (
@@ -9,9 +10,19 @@ from app.core.grafana.alert_manager import (
     GrafanaAlertManager,
     GrafanaError,
     GrafanaTimeoutError,
+    _rule_payload,
+    diff_alert_states,
+    plan_reconciliation,
 )
 import os
 
+from app.core.grafana.alert_versions import AlertVersionStore
+from app.core.grafana.exceptions import (
+    GrafanaCircuitOpenError,
+    GrafanaConnectionError,
+    GrafanaValidationError,
+)
+
 from app.core.grafana.client import GrafanaClient
 
 from app.core.grafana.models import TimeoutThresholds
@@ -26,10 +37,11 @@ def mock_grafana_client():
 
 
 @pytest.fixture
-def alert_manager(mock_grafana_client):
+def alert_manager(mock_grafana_client, tmp_path):
     return GrafanaAlertManager(
         client=mock_grafana_client,
-        timeout=TimeoutThresholds(create_alert=10)
+        timeout=TimeoutThresholds(create_alert=10),
+        versions=AlertVersionStore(tmp_path / "alert_versions.db"),
     )
 
 
@@ -102,15 +114,67 @@ async def test_async_create_alert_timeout(alert_manager, sample_alert, mock_graf
         await alert_manager.async_create_alert(sample_alert)
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "error",
+    [
+        GrafanaConnectionError("Connection refused", "http://grafana", None),
+        GrafanaCircuitOpenError("alerting", 5.0, None),
+        GrafanaTimeoutError("create_alert", 30.0, TimeoutThresholds()),
+    ],
+)
+async def test_async_create_alert_reraises_overload_errors(
+    alert_manager, sample_alert, mock_grafana_client, error
+):
+    mock_client = mock_grafana_client.get_async_client.return_value
+    mock_client.alerting.async_create_alert_rule = AsyncMock(side_effect=error)
+
+    with pytest.raises(type(error)) as raised:
+        await alert_manager.async_create_alert(sample_alert)
+    assert raised.value is error
+
+
 def test_bulk_create_alerts(alert_manager, sample_alert, mock_grafana_client):
-    """Test bulk alert creation"""
-    alerts = [sample_alert, sample_alert.model_copy(update={"uid": "alert-2"})]
-    mock_client = mock_grafana_client.get_client.return_value
-    mock_client.alerting.create_alert_rule.return_value = {"uid": "test"}
+    """Test bulk alert creation uses one rule-group PUT per group"""
+    alerts = [
+        sample_alert,
+        sample_alert.model_copy(update={"uid": "alert-2"}),
+        sample_alert.model_copy(update={"uid": "alert-3", "rule_group": "other"}),
+    ]
+    provisioning = mock_grafana_client.get_client.return_value.alertingprovisioning
+    provisioning.get_rule_group.return_value = {
+        "title": "default", "interval": 60, "rules": [{"uid": "existing"}]
+    }
 
     results = alert_manager.bulk_create_alerts(alerts)
-    assert len(results["success"]) == 2
+    assert [r["uid"] for r in results["success"]] == ["test-alert", "alert-2", "alert-3"]
     assert not results["failed"]
+    assert provisioning.update_rule_group.call_count == 2
+    folder_uid, group, body = provisioning.update_rule_group.call_args_list[0].args
+    assert group == "default"
+    assert [r["uid"] for r in body["rules"]] == ["existing", "test-alert", "alert-2"]
+    mock_grafana_client.get_client.return_value.alerting.create_alert_rule.assert_not_called()
+
+
+def test_bulk_create_alerts_isolates_rejected_rules(alert_manager, sample_alert, mock_grafana_client):
+    """A rule Grafana rejects fails alone; the rest of its group is saved"""
+    alerts = [sample_alert.model_copy(update={"uid": f"alert-{i}"}) for i in range(8)]
+    provisioning = mock_grafana_client.get_client.return_value.alertingprovisioning
+    provisioning.get_rule_group.return_value = {"title": "default", "rules": []}
+    stored = {}
+
+    def update_rule_group(folder_uid, group, body):
+        if any(rule["uid"] == "alert-5" for rule in body["rules"]):
+            raise GrafanaValidationError("Invalid rule", {"condition": "bad"}, None)
+        stored["rules"] = [rule["uid"] for rule in body["rules"]]
+
+    provisioning.update_rule_group.side_effect = update_rule_group
+
+    results = alert_manager.bulk_create_alerts(alerts)
+    assert [f["uid"] for f in results["failed"]] == ["alert-5"]
+    assert len(results["success"]) == 7
+    assert sorted(stored["rules"]) == sorted(f"alert-{i}" for i in range(8) if i != 5)
+    assert provisioning.update_rule_group.call_count < len(alerts)
 
 
 def test_validate_alert_response(alert_manager):
@@ -131,3 +195,189 @@ def test_alert_version_management(alert_manager, sample_alert):
 
     with pytest.raises(ValueError):
         alert_manager.update_alert_version("test", 1, "user1")  # Version must increment
+
+
+@pytest.mark.asyncio
+async def test_async_bulk_create_alerts_isolates_failures(alert_manager, sample_alert, mock_grafana_client):
+    """One failing alert does not cancel the others; results are keyed by uid in order"""
+    alerts = [sample_alert.model_copy(update={"uid": f"alert-{i}"}) for i in range(10)]
+    alerts.append(alerts[0])
+    in_flight = peak = 0
+
+    async def create(rule):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.001 * (10 - int(rule["uid"].split("-")[1])))
+        in_flight -= 1
+        if rule["uid"] == "alert-3":
+            raise Exception("API Error")
+        return {"uid": rule["uid"]}
+
+    mock_client = mock_grafana_client.get_async_client.return_value
+    mock_client.alerting.async_create_alert_rule = AsyncMock(side_effect=create)
+    mock_grafana_client.get_async_client = AsyncMock(return_value=mock_client)
+
+    results = await alert_manager.async_bulk_create_alerts(alerts, max_concurrency=3)
+
+    assert peak == 3
+    assert list(results["results"]) == [f"alert-{i}" for i in range(10)]
+    assert results["results"]["alert-3"]["status"] == "failed"
+    assert results["results"]["alert-0"]["status"] == "failed"  # duplicate in batch
+    assert [r["uid"] for r in results["success"]] == [f"alert-{i}" for i in range(1, 10) if i != 3]
+    assert [f["uid"] for f in results["failed"]] == ["alert-0", "alert-3"]
+
+
+@pytest.mark.asyncio
+async def test_reconcile_noop_costs_one_list_request(alert_manager, sample_alert, mock_grafana_client):
+    """Unchanged rules are detected by hash, ignoring server-managed fields"""
+    desired = [sample_alert.model_copy(update={"uid": f"alert-{i}"}) for i in range(1000)]
+    existing = [
+        {**_rule_payload(alert), "id": i, "updated": "2025-01-01T00:00:00Z", "annotations": None}
+        for i, alert in enumerate(desired)
+    ]
+    mock_client = MagicMock()
+    mock_client.alerting.async_get_all_alerts = AsyncMock(return_value=existing)
+    mock_grafana_client.get_async_client = AsyncMock(return_value=mock_client)
+
+    results = await alert_manager.async_reconcile_alerts(desired)
+
+    mock_client.alerting.async_get_all_alerts.assert_awaited_once()
+    mock_client.alerting.async_create_alert_rule.assert_not_called()
+    mock_client.alerting.async_update_alert_rule.assert_not_called()
+    mock_client.alerting.async_delete_alert_rule.assert_not_called()
+    assert len(results["unchanged"]) == 1000 and results["failed"] == []
+
+
+@pytest.mark.asyncio
+async def test_reconcile_applies_only_needed_writes(alert_manager, sample_alert, mock_grafana_client):
+    keep, change, new = (sample_alert.model_copy(update={"uid": u}) for u in ("keep", "change", "new"))
+    existing = [
+        _rule_payload(keep),
+        {**_rule_payload(change), "title": "Old title"},
+        {**_rule_payload(sample_alert.model_copy(update={"uid": "stale"}))},
+        {**_rule_payload(sample_alert.model_copy(update={"uid": "broken"}))},
+    ]
+    mock_client = MagicMock()
+    mock_client.alerting.async_get_all_alerts = AsyncMock(return_value=existing)
+    mock_client.alerting.async_create_alert_rule = AsyncMock(return_value={})
+    mock_client.alerting.async_update_alert_rule = AsyncMock(return_value={})
+
+    async def delete(uid):
+        if uid == "broken":
+            raise Exception("API Error")
+
+    mock_client.alerting.async_delete_alert_rule = AsyncMock(side_effect=delete)
+    mock_grafana_client.get_async_client = AsyncMock(return_value=mock_client)
+
+    results = await alert_manager.async_reconcile_alerts([keep, change, new], prune=True)
+
+    assert results["created"] == ["new"]
+    assert results["updated"] == ["change"]
+    assert results["deleted"] == ["stale"]
+    assert results["unchanged"] == ["keep"]
+    assert results["failed"] == [{"uid": "broken", "action": "delete", "error": "API Error"}]
+    mock_client.alerting.async_update_alert_rule.assert_awaited_once_with("change", _rule_payload(change))
+
+
+def test_plan_reconciliation_matches_rules_as_grafana_returns_them(sample_alert):
+    """Model-only fields (severity, enabled, folder_uid...) are never sent back by Grafana"""
+    alert = sample_alert.model_copy(update={"labels": {"team": "core"}, "folder_uid": "ops"})
+    returned = {
+        "id": 7,
+        "uid": alert.uid,
+        "orgID": 1,
+        "folderUID": "ops",
+        "ruleGroup": "default",
+        "title": alert.title,
+        "condition": alert.condition,
+        "data": [],
+        "updated": "2025-01-01T00:00:00Z",
+        "noDataState": "NoData",
+        "execErrState": "Error",
+        "for": "0s",
+        "annotations": {},
+        "labels": {"team": "core"},
+        "provenance": "api",
+        "isPaused": False,
+    }
+
+    plan = plan_reconciliation([alert], [returned])
+    assert plan.unchanged == [alert.uid] and plan.update == []
+
+    plan = plan_reconciliation([alert], [{**returned, "isPaused": True}])
+    assert plan.update == [alert]
+
+
+def test_prune_only_deletes_within_managed_rule_groups(sample_alert):
+    managed = {**_rule_payload(sample_alert), "uid": "stale"}
+    existing = [
+        managed,
+        {**managed, "uid": "other-team", "folderUID": "payments"},
+        {**managed, "uid": "ui-made", "ruleGroup": "adhoc"},
+    ]
+
+    plan = plan_reconciliation([sample_alert], existing, prune=True)
+    assert plan.delete == ["stale"]
+    assert plan_reconciliation([sample_alert], existing).delete == []
+
+
+def test_plan_reconciliation_without_prune_keeps_unknown_rules(sample_alert):
+    plan = plan_reconciliation([sample_alert, sample_alert], [{"uid": "other"}], prune=False)
+    assert plan.delete == [] and plan.create == []
+    assert plan.duplicates == ["test-alert"]
+
+
+def _rules_response(states, etag):
+    rules = [{"uid": uid, "name": uid.title(), "state": state, "labels": {}} for uid, state in states.items()]
+    body = {"status": "success", "data": {"groups": [{"name": "g", "file": "f", "rules": rules}]}}
+    return httpx.Response(200, json=body, headers={"ETag": etag})
+
+
+@pytest.mark.asyncio
+async def test_watch_alert_states_yields_only_transitions(alert_manager, mock_grafana_client):
+    polls = [
+        _rules_response({"cpu": "pending"}, '"1"'),
+        httpx.Response(304),
+        _rules_response({"cpu": "firing", "disk": "pending"}, '"2"'),
+        _rules_response({"cpu": "firing", "disk": "pending"}, '"2"'),  # same body, no ETag match
+        _rules_response({}, '"3"'),
+    ]
+    validators_sent = []
+
+    async def get_rule_states(validators, states=None):
+        validators_sent.append(dict(validators))
+        return polls.pop(0)
+
+    mock_client = MagicMock()
+    mock_client.alerting.async_get_rule_states = AsyncMock(side_effect=get_rule_states)
+    mock_grafana_client.get_async_client = AsyncMock(return_value=mock_client)
+    sleeps = []
+
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+
+    transitions = []
+    with patch("app.core.grafana.alert_manager.asyncio.sleep", side_effect=fake_sleep):
+        watch = alert_manager.watch_alert_states(min_interval=1, max_interval=10)
+        async for transition in watch:
+            transitions.append((transition.key, transition.previous, transition.state))
+            if len(transitions) == 5:
+                break
+        await watch.aclose()
+
+    assert transitions == [
+        ("cpu", "inactive", "pending"),
+        ("cpu", "pending", "firing"),
+        ("disk", "inactive", "pending"),
+        ("cpu", "firing", "resolved"),
+        ("disk", "pending", "inactive"),
+    ]
+    assert validators_sent[1] == {"If-None-Match": '"1"'}
+    # Reset after changes, back off by half on quiet polls
+    assert sleeps == [1, 1.5, 1, 1.5]
+
+
+def test_diff_alert_states_ignores_unchanged_rules():
+    state = {"cpu": {"title": "CPU", "state": "firing", "labels": {}}}
+    assert diff_alert_states(state, dict(state)) == []
@@ -0,0 +1,95 @@
+import json
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app.core.grafana.alert_manager import AlertRule
+from app.core.grafana.backtest import Backtester, Condition, SeriesSet, evaluate, parse_duration
+
+
+def _rule(uid, condition):
+    return AlertRule(uid=uid, title=uid, condition=condition, severity="warning")
+
+
+def _series(**columns):
+    n = len(next(iter(columns.values())))
+    ts = np.arange(n) * 15.0
+    return SeriesSet.from_samples({k: (ts, np.asarray(v, dtype=float)) for k, v in columns.items()})
+
+
+def test_condition_parsing():
+    assert Condition.parse("avg(cpu[5m]) > 80") == Condition("avg", "cpu", 300.0, ">", 80.0)
+    assert Condition.parse("queue_depth <= 1e3") == Condition("last", "queue_depth", 0.0, "<=", 1000.0)
+    assert Condition.parse("avg() > 10").series == ""
+    assert parse_duration("1h30m") == 5400.0
+    with pytest.raises(ValueError):
+        Condition.parse("histogram_quantile(0.9, x) > 1")
+
+
+def test_rolling_reductions_match_naive_loops():
+    rng = np.random.default_rng(1)
+    x = rng.random(200) * 100
+    x[[5, 6, 50]] = np.nan
+    for func in ("avg", "sum", "min", "max"):
+        got = evaluate(func, x, 8, 120.0)
+        reducer = {"avg": np.nanmean, "sum": np.nansum, "min": np.nanmin, "max": np.nanmax}[func]
+        expected = [reducer(x[max(0, i - 7):i + 1]) for i in range(x.size)]
+        np.testing.assert_allclose(got, expected)
+
+
+def test_rate_handles_counter_resets():
+    counter = np.array([0, 10, 20, 30, 5, 15], dtype=float)
+    increase = evaluate("increase", counter, 3, 30.0, step=10.0)
+    # 20 -> 30 -> 5 (reset): 15 over 20s of samples, extrapolated to the 30s range
+    assert increase[4] == pytest.approx(22.5)
+    assert np.isnan(increase[0])  # one sample is not enough
+    assert evaluate("rate", counter, 3, 30.0, step=10.0)[4] == pytest.approx(0.75)
+
+
+@pytest.mark.parametrize("range_", ["1m", "5m"])
+def test_rate_of_constant_counter_matches_prometheus(range_):
+    counter = 1000 + np.arange(200) * 30.0  # +2/s at a 15s step
+    backtester = Backtester(_series(requests_total=counter))
+
+    results = backtester.run([_rule("fast", f"rate(requests_total[{range_}]) >= 2")])
+
+    window = int(parse_duration(range_) / 15)
+    rate = evaluate("rate", counter, window, parse_duration(range_), step=15.0)
+    np.testing.assert_allclose(rate[window - 1:], 2.0)
+    # Fires from the first full window until the end of the data
+    assert results["fast"].intervals == [((window - 1) * 15.0, 200 * 15.0)]
+
+
+def test_for_duration_and_timeline():
+    values = [0, 90, 90, 90, 90, 90, 0, 90, 0]
+    backtester = Backtester(_series(cpu=values))
+    rules = [_rule("instant", "cpu > 80"), _rule("held", "max(cpu[15s]) > 80"), _rule("bad", "nope(")]
+
+    results = backtester.run(rules, for_durations={"held": "1m"})
+
+    assert results["instant"].intervals == [(15.0, 90.0), (105.0, 120.0)]
+    assert results["instant"].fire_count == 2
+    # Pending from t=15s, fires once the condition held for 1m
+    assert results["held"].intervals == [(75.0, 90.0)]
+    assert results["bad"].error and not results["bad"].firing.any()
+    assert list(results) == ["instant", "held", "bad"]
+
+
+def test_loads_prometheus_json_and_csv(tmp_path):
+    (tmp_path / "range.json").write_text(json.dumps({
+        "status": "success",
+        "data": {"resultType": "matrix", "result": [
+            {"metric": {"__name__": "up", "job": "api"}, "values": [[0, "1"], [15, "0"], [45, "0"]]},
+        ]},
+    }))
+    (tmp_path / "load.csv").write_text("timestamp,load\n0,1.5\n15,2.5\n30,3.5\n45,4.5\n")
+
+    backtester = Backtester.from_files([tmp_path / "range.json", tmp_path / "load.csv"])
+    series = backtester.series
+
+    assert series.step == 15.0
+    assert np.isnan(series.values['up{job="api"}'][2])
+    results = backtester.run([_rule("down", 'up{job="api"} < 1'), _rule("load", "avg(load[30s]) > 3")])
+    assert results["down"].intervals == [(15.0, 30.0), (45.0, 60.0)]
+    assert results["load"].intervals == [(45.0, 60.0)]  # avg(2.5, 3.5) is not > 3
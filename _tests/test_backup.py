@@ -0,0 +1,492 @@
+import asyncio
+import datetime
+import gzip
+import json
+import os
+import shutil
+import threading
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from grafana_client.client import GrafanaClientError
+from prometheus_client import REGISTRY
+
+from app.core.grafana.backup import GrafanaBackup
+from app.core.grafana.backup_archive import ARCHIVE_MAGIC, BackupArchive
+from app.core.grafana.backup_index import BackupIndex, file_checksum
+from app.core.grafana.backup_store import ManifestBuilder, ObjectStore, object_hash
+from app.core.grafana.backup_verify import verify_file
+from app.core.grafana.backup_writer import (
+    AsyncBackupWriter,
+    CompressedBackupWriter,
+    NDJSONBackupWriter,
+    iter_ndjson_records,
+)
+from app.core.grafana.client import GrafanaClient
+from app.core.grafana.exceptions import GrafanaError, GrafanaNotFoundError
+
+
+@pytest.fixture
+def mock_grafana_client():
+    client = MagicMock(spec=GrafanaClient)
+    grafana = MagicMock()
+    grafana.search.async_search_dashboards = AsyncMock(
+        side_effect=lambda limit, page: [{"uid": f"dash-{page}"}] if page <= 3 else []
+    )
+    grafana.dashboard.async_get_dashboard = AsyncMock(
+        side_effect=lambda uid: {"dashboard": {"uid": uid, "panels": []}, "meta": {}}
+    )
+    grafana.datasource.async_get_all_datasources = AsyncMock(return_value=[{"uid": "prometheus"}])
+    grafana.alerting.async_get_all_alerts = AsyncMock(return_value=[{"uid": "alert-1"}])
+    client.get_async_client.return_value = grafana
+    return client
+
+
+@pytest.fixture
+def backup(mock_grafana_client):
+    return GrafanaBackup(client=mock_grafana_client, timeout=None)
+
+
+@pytest.mark.asyncio
+async def test_stream_backup_writes_one_record_per_line(backup, tmp_path, monkeypatch):
+    monkeypatch.setattr("app.core.grafana.backup.BACKUP_PAGE_SIZE", 1)
+    path = await backup.async_save_to_file(str(tmp_path))
+
+    records = list(iter_ndjson_records(path))
+    assert records[0]["kind"] == "header"
+    # Dashboards are written in completion order
+    assert sorted(r["data"]["dashboard"]["uid"] for r in records[1:4]) == [
+        "dash-1", "dash-2", "dash-3"
+    ]
+    assert [r["data"]["uid"] for r in records[4:]] == ["prometheus", "alert-1"]
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+@pytest.mark.asyncio
+async def test_stream_backup_failure_leaves_no_partial_file(backup, mock_grafana_client, tmp_path):
+    grafana = mock_grafana_client.get_async_client.return_value
+    grafana.alerting.async_get_all_alerts.side_effect = RuntimeError("alerting down")
+
+    with pytest.raises(GrafanaError):
+        await backup.async_save_to_file(str(tmp_path))
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_stream_backup_writes_off_the_event_loop(backup, tmp_path, monkeypatch):
+    loop_thread = threading.get_ident()
+    threads = set()
+    fsync = os.fsync
+
+    def record_fsync(fd):
+        threads.add(threading.get_ident())
+        fsync(fd)
+
+    monkeypatch.setattr("app.core.grafana.backup_writer.os.fsync", record_fsync)
+    write = NDJSONBackupWriter.write
+    monkeypatch.setattr(
+        NDJSONBackupWriter,
+        "write",
+        lambda self, kind, data: threads.add(threading.get_ident()) or write(self, kind, data),
+    )
+
+    await backup.async_save_to_file(str(tmp_path))
+    assert threads and loop_thread not in threads
+
+
+@pytest.mark.asyncio
+async def test_compression_backpressure_does_not_block_the_event_loop(tmp_path, monkeypatch):
+    compress = gzip.compress
+
+    def slow_compress(data, *args, **kwargs):
+        time.sleep(0.02)
+        return compress(data, *args, **kwargs)
+
+    monkeypatch.setattr("app.core.grafana.backup_writer.gzip.compress", slow_compress)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.005)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    writer = CompressedBackupWriter(tmp_path / "backup.ndjson.gz", workers=1, block_size=1)
+    async with AsyncBackupWriter(writer) as output:
+        for i in range(10):
+            await output.write("dashboard", {"uid": f"dash-{i}"})
+    task.cancel()
+
+    # ~200ms of compression waits; the loop kept running throughout
+    assert ticks >= 10
+    assert len(list(iter_ndjson_records(writer.path))) == 10
+
+
+def test_writer_aborts_on_error(tmp_path):
+    path = tmp_path / "backup.ndjson"
+    with pytest.raises(ValueError):
+        with NDJSONBackupWriter(path) as writer:
+            writer.write("dashboard", {"uid": "a"})
+            raise ValueError("boom")
+    assert not path.exists()
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_dashboard_fetches_are_bounded(mock_grafana_client, monkeypatch):
+    monkeypatch.setattr("app.core.grafana.backup.BACKUP_PAGE_SIZE", 50)
+    grafana = mock_grafana_client.get_async_client.return_value
+    grafana.search.async_search_dashboards.side_effect = (
+        lambda limit, page: [{"uid": f"dash-{i}"} for i in range(20)] if page == 1 else []
+    )
+    in_flight = peak = 0
+
+    async def get_dashboard(uid):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return {"dashboard": {"uid": uid}}
+
+    grafana.dashboard.async_get_dashboard.side_effect = get_dashboard
+    backup = GrafanaBackup(client=mock_grafana_client, timeout=None, max_concurrency=4)
+
+    data = await backup.async_create_backup()
+    assert sorted(d["dashboard"]["uid"] for d in data["dashboards"]) == sorted(
+        f"dash-{i}" for i in range(20)
+    )
+    assert peak == 4
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "not_found",
+    [
+        GrafanaNotFoundError("dashboard", "dash-2", None),
+        GrafanaClientError(404, None, "Client Error 404: Dashboard not found"),
+    ],
+)
+async def test_dashboard_deleted_during_backup_is_skipped(backup, mock_grafana_client, not_found):
+    grafana = mock_grafana_client.get_async_client.return_value
+
+    async def get_dashboard(uid):
+        if uid == "dash-2":
+            raise not_found
+        return {"dashboard": {"uid": uid}}
+
+    grafana.dashboard.async_get_dashboard.side_effect = get_dashboard
+    data = await backup.async_create_backup()
+    assert sorted(d["dashboard"]["uid"] for d in data["dashboards"]) == ["dash-1"]
+
+
+def test_create_backup_fetches_full_models(mock_grafana_client):
+    grafana = MagicMock()
+    grafana.search.search_dashboards.side_effect = (
+        lambda type_, limit, page: [{"uid": "a"}, {"uid": "b"}] if page == 1 else []
+    )
+    grafana.dashboard.get_dashboard.side_effect = lambda uid: {"dashboard": {"uid": uid}}
+    grafana.datasource.get_all_datasources.return_value = []
+    grafana.alerting.get_all_alerts.return_value = []
+    mock_grafana_client.get_client.return_value = grafana
+
+    data = GrafanaBackup(client=mock_grafana_client, timeout=None).create_backup()
+    assert sorted(d["dashboard"]["uid"] for d in data["dashboards"]) == ["a", "b"]
+
+
+def test_save_to_file_writes_verifiable_ndjson(mock_grafana_client, tmp_path):
+    grafana = MagicMock()
+    grafana.search.search_dashboards.side_effect = (
+        lambda type_, limit, page: [{"uid": "a"}] if page == 1 else []
+    )
+    grafana.dashboard.get_dashboard.side_effect = lambda uid: {"dashboard": {"uid": uid}}
+    grafana.datasource.get_all_datasources.return_value = [{"uid": "prometheus"}]
+    grafana.alerting.get_all_alerts.return_value = [{"uid": "alert-1"}]
+    mock_grafana_client.get_client.return_value = grafana
+    backup = GrafanaBackup(client=mock_grafana_client, timeout=None)
+
+    path = backup.save_to_file(str(tmp_path))
+    assert [r["kind"] for r in iter_ndjson_records(path)] == [
+        "header", "dashboard", "datasource", "alert_rule"
+    ]
+    assert not list(tmp_path.glob("*.tmp"))
+    [result] = backup.verify_backups(str(tmp_path))
+    assert result.ok and result.checked == 4 and result.unchecked == 0
+
+
+def test_create_backup_streams_fetches_and_skips_deleted_dashboards(mock_grafana_client):
+    grafana = MagicMock()
+    grafana.search.search_dashboards.side_effect = (
+        lambda type_, limit, page: [{"uid": f"dash-{i}"} for i in range(20)] if page == 1 else []
+    )
+    in_flight = peak = 0
+    lock = threading.Lock()
+
+    def get_dashboard(uid):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.01)
+        with lock:
+            in_flight -= 1
+        if uid == "dash-2":
+            raise GrafanaClientError(404, None, "Client Error 404: Dashboard not found")
+        return {"dashboard": {"uid": uid}}
+
+    grafana.dashboard.get_dashboard.side_effect = get_dashboard
+    grafana.datasource.get_all_datasources.return_value = []
+    grafana.alerting.get_all_alerts.return_value = []
+    mock_grafana_client.get_client.return_value = grafana
+
+    def fetch_timings():
+        return REGISTRY.get_sample_value(
+            "grafana_backup_operations_latency_seconds_count", {"operation": "fetch_dashboards"}
+        ) or 0
+
+    timings_before = fetch_timings()
+    backup = GrafanaBackup(client=mock_grafana_client, timeout=None, max_concurrency=4)
+    data = backup.create_backup()
+    assert sorted(d["dashboard"]["uid"] for d in data["dashboards"]) == sorted(
+        f"dash-{i}" for i in range(20) if i != 2
+    )
+    assert peak <= 4
+    assert fetch_timings() == timings_before + 1
+
+
+@pytest.mark.asyncio
+async def test_incremental_backup_reuses_unchanged_objects(
+    backup, mock_grafana_client, tmp_path, monkeypatch
+):
+    monkeypatch.setattr("app.core.grafana.backup.BACKUP_PAGE_SIZE", 1)
+    first = await backup.async_save_incremental(str(tmp_path))
+    objects = sorted(p for p in (tmp_path / "objects").rglob("*") if p.is_file())
+    assert len(objects) == 5
+
+    grafana = mock_grafana_client.get_async_client.return_value
+    grafana.alerting.async_get_all_alerts.return_value = [{"uid": "alert-1", "title": "changed"}]
+    first.rename(first.with_name("grafana_00000000_000000.json"))
+    second = await backup.async_save_incremental(str(tmp_path))
+
+    after = sorted(p for p in (tmp_path / "objects").rglob("*") if p.is_file())
+    assert len(after) == 6  # only the changed alert rule was written
+    assert {p: p.stat().st_mtime_ns for p in objects}.items() <= {
+        p: p.stat().st_mtime_ns for p in after
+    }.items()
+
+    restored = ObjectStore(tmp_path).materialize(second)
+    assert restored["alert_rules"] == [{"uid": "alert-1", "title": "changed"}]
+    assert sorted(d["dashboard"]["uid"] for d in restored["dashboards"]) == [
+        "dash-1", "dash-2", "dash-3"
+    ]
+
+
+def test_object_store_rewrites_corrupt_objects(tmp_path):
+    store = ObjectStore(tmp_path)
+    digest = store.put({"uid": "dash-1"})
+    path = store.path_for(digest)
+    path.write_bytes(b'{"uid":')  # torn write from an earlier crash
+
+    assert store.put({"uid": "dash-1"}) == digest
+    assert (store.written, store.reused) == (2, 0)
+    assert store.get(digest) == {"uid": "dash-1"}
+
+    store.put({"uid": "dash-1"})
+    assert store.reused == 1
+
+
+def test_object_hash_ignores_key_order():
+    assert object_hash({"a": 1, "b": [1, 2]}) == object_hash({"b": [1, 2], "a": 1})
+
+
+def test_compressed_writer_round_trips_multi_member_gzip(tmp_path):
+    path = tmp_path / "backup.ndjson.gz"
+    with CompressedBackupWriter(path, workers=2, block_size=64) as writer:
+        for i in range(100):
+            writer.write("dashboard", {"uid": f"dash-{i}", "panels": [{"expr": "up"}] * 3})
+
+    assert [r["data"]["uid"] for r in iter_ndjson_records(path)] == [
+        f"dash-{i}" for i in range(100)
+    ]
+    assert path.read_bytes().count(b"\x1f\x8b\x08") > 1  # several gzip members
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+@pytest.mark.asyncio
+async def test_stream_backup_compressed(backup, tmp_path):
+    path = await backup.async_save_to_file(str(tmp_path), compress=True)
+    assert path.name.endswith(".ndjson.gz")
+    assert [r["kind"] for r in iter_ndjson_records(path)] == [
+        "header", "dashboard", "datasource", "alert_rule"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_indexed_backup_extracts_single_objects(backup, tmp_path, monkeypatch):
+    monkeypatch.setattr("app.core.grafana.backup.BACKUP_PAGE_SIZE", 1)
+    path = await backup.async_save_to_file(str(tmp_path), indexed=True)
+    assert path.suffix == ".gfba"
+
+    entries = backup.list_archive(path)
+    assert sorted((e["kind"], e["uid"]) for e in entries) == [
+        ("alert_rule", "alert-1"),
+        ("dashboard", "dash-1"),
+        ("dashboard", "dash-2"),
+        ("dashboard", "dash-3"),
+        ("datasource", "prometheus"),
+    ]
+    assert backup.extract_from_archive(path, "dash-2")["dashboard"]["uid"] == "dash-2"
+    assert backup.extract_from_archive(path, "alert-1", kind="alert_rule") == {"uid": "alert-1"}
+    with pytest.raises(KeyError):
+        backup.extract_from_archive(path, "missing")
+
+
+@pytest.mark.asyncio
+async def test_diff_dashboard_against_live(backup, mock_grafana_client, tmp_path):
+    path = await backup.async_save_to_file(str(tmp_path), indexed=True)
+    grafana = mock_grafana_client.get_async_client.return_value
+    grafana.dashboard.async_get_dashboard.side_effect = lambda uid: {
+        "dashboard": {"uid": uid, "panels": [], "title": "Renamed"}
+    }
+
+    assert await backup.async_diff_dashboard(path, "dash-1") == {"title": (None, "Renamed")}
+
+
+def test_archive_without_footer_is_rejected(tmp_path):
+    path = tmp_path / "broken.gfba"
+    path.write_bytes(ARCHIVE_MAGIC + b'{"uid":"a"}' + b"\0" * 24)
+    with pytest.raises(ValueError):
+        BackupArchive(path)
+
+
+@pytest.mark.asyncio
+async def test_list_backups_reads_the_index(backup, tmp_path):
+    path = await backup.async_save_to_file(str(tmp_path), compress=True)
+
+    entries = [entry async for entry in backup.list_backups(str(tmp_path))]
+    assert len(entries) == 1
+    entry = entries[0]
+    assert entry.path == path.name and entry.format == "ndjson.gz"
+    assert entry.objects == {"dashboard": 1, "datasource": 1, "alert_rule": 1}
+    assert entry.size == path.stat().st_size
+    assert entry.checksum == file_checksum(path)
+
+    later = entry.created_at + datetime.timedelta(seconds=1)
+    assert [e async for e in backup.list_backups(str(tmp_path), start=later)] == []
+
+
+@pytest.mark.asyncio
+async def test_list_backups_indexes_existing_directory_once(backup, tmp_path):
+    (tmp_path / "grafana_20240101_000000.json").write_text('{"dashboards": []}')
+    entries = [entry async for entry in backup.list_backups(str(tmp_path))]
+    assert [(e.path, e.format) for e in entries] == [("grafana_20240101_000000.json", "json")]
+    assert (tmp_path / "index.ndjson").exists()
+
+
+def test_reconcile_skips_files_without_a_timestamp(tmp_path):
+    (tmp_path / "grafana_latest.json").write_text('{"dashboards": []}')
+    (tmp_path / "grafana_20240101_000000.json").write_text('{"dashboards": []}')
+    index = BackupIndex(tmp_path)
+
+    assert [e.path for e in index.reconcile()] == ["grafana_20240101_000000.json"]
+    assert [e.path for e in index.entries()] == ["grafana_20240101_000000.json"]
+    assert index.prune(max_age=datetime.timedelta(days=1)) != []
+
+
+@pytest.mark.asyncio
+async def test_unindexed_backups_are_listed_and_pruned(backup, tmp_path):
+    await backup.async_save_to_file(str(tmp_path))
+    legacy = tmp_path / "grafana_20200101_000000.json"
+    legacy.write_text('{"dashboards": []}')
+
+    entries = [entry async for entry in backup.list_backups(str(tmp_path))]
+    assert [e.format for e in entries] == ["ndjson"]  # the index exists, so no directory scan
+    entries = [entry async for entry in backup.list_backups(str(tmp_path), reconcile=True)]
+    assert sorted(e.format for e in entries) == ["json", "ndjson"]
+    assert [e.path for e in BackupIndex(tmp_path)].count(legacy.name) == 1
+
+    removed = backup.prune_backups(
+        str(tmp_path), max_age=datetime.timedelta(days=30), keep_last=1
+    )
+    assert [e.path for e in removed] == [legacy.name]
+    assert not legacy.exists()
+
+
+def test_prune_removes_expired_backups_and_unreferenced_objects(tmp_path):
+    store = ObjectStore(tmp_path)
+    index = BackupIndex(tmp_path)
+    for timestamp, objects in [
+        ("20240101_000000", [{"uid": "old"}, {"uid": "shared"}]),
+        ("20240301_000000", [{"uid": "shared"}, {"uid": "new"}]),
+    ]:
+        builder = ManifestBuilder(store, timestamp)
+        for obj in objects:
+            builder.add("datasources", obj)
+        index.add(builder.commit(), timestamp, {"datasource": len(objects)})
+    legacy = tmp_path / "grafana_20240102_000000.json"
+    legacy.write_text("{}")
+    index.add(legacy, "20240102_000000", {})
+
+    removed = index.prune(
+        max_age=datetime.timedelta(days=30), keep_last=1, now=datetime.datetime(2024, 3, 2)
+    )
+
+    assert sorted(e.timestamp for e in removed) == ["20240101_000000", "20240102_000000"]
+    assert [e.timestamp for e in index] == ["20240301_000000"]
+    assert not legacy.exists()
+    remaining = {p.parent.name + p.name for p in (tmp_path / "objects").rglob("*") if p.is_file()}
+    assert remaining == {object_hash({"uid": "shared"}), object_hash({"uid": "new"})}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("options", [{}, {"compress": True}, {"indexed": True}])
+async def test_verify_detects_corrupted_records(backup, tmp_path, options):
+    path = await backup.async_save_to_file(str(tmp_path), **options)
+    [result] = backup.verify_backups(str(tmp_path))
+    assert result.ok and result.checked >= 3
+
+    data = bytearray(path.read_bytes())
+    if options.get("compress"):
+        data[-12] ^= 0xFF  # inside the last gzip member
+    else:
+        position = data.index(b"prometheus")
+        data[position] = ord("P")
+    path.write_bytes(bytes(data))
+
+    [result] = backup.verify_backups(str(tmp_path))
+    assert not result.ok
+    assert "file checksum mismatch" in result.errors
+    if not options:
+        assert any("line" in error for error in result.errors)
+
+
+@pytest.mark.asyncio
+async def test_copied_archive_verifies_without_the_index(backup, tmp_path):
+    path = await backup.async_save_to_file(str(tmp_path / "backups"), indexed=True)
+    copy = tmp_path / path.name
+    shutil.copy(path, copy)
+
+    result = verify_file(copy)
+    assert result.ok and result.checked == 3
+    assert verify_file(copy, file_checksum(path)).ok
+
+    data = bytearray(copy.read_bytes())
+    data[data.index(b"prometheus")] = ord("P")
+    copy.write_bytes(bytes(data))
+    assert "record area checksum mismatch" in verify_file(copy).errors
+
+
+@pytest.mark.asyncio
+async def test_verify_incremental_backups_checks_shared_objects(backup, tmp_path):
+    manifest = await backup.async_save_incremental(str(tmp_path))
+    [result] = backup.verify_backups(str(tmp_path))
+    assert result.ok and result.checked == 3
+
+    store = ObjectStore(tmp_path)
+    digest = json.loads(manifest.read_text())["objects"]["datasources"][0]["hash"]
+    store.path_for(digest).write_text('{"uid":"tampered"}')
+
+    [result] = backup.verify_backups(str(tmp_path))
+    assert result.errors == [f"object {digest} is corrupt"]
@@ -0,0 +1,117 @@
+import json
+
+import httpx
+import pytest
+
+from app.core.grafana.cache import CACHE_EVICTIONS, ResponseCache
+from app.core.grafana.client import GrafanaClient
+from app.core.grafana.config import GrafanaConfig
+
+
+def dashboard_body(uid: str, version: int) -> bytes:
+    return json.dumps({"dashboard": {"uid": uid, "version": version}}).encode()
+
+
+def make_cached_client(handler) -> GrafanaClient:
+    client = GrafanaClient(config=GrafanaConfig())
+    client.read_cache = ResponseCache(max_bytes=1024 * 1024, ttls={"dashboard": 60, "search": 60})
+    client._async_session = httpx.AsyncClient(
+        base_url="http://grafana.test", transport=httpx.MockTransport(handler)
+    )
+    return client
+
+
+def test_resource_for():
+    assert ResponseCache.resource_for("/api/dashboards/uid/fastapi") == "dashboard"
+    assert ResponseCache.resource_for("/api/search?query=api") == "search"
+    assert ResponseCache.resource_for("/api/dashboards/uid/fastapi/versions") is None
+    assert ResponseCache.resource_for("/api/datasources") is None
+
+
+def test_lru_eviction_respects_size_budget():
+    cache = ResponseCache(max_bytes=2000, ttls={"dashboard": 60})
+    evictions = CACHE_EVICTIONS.labels("dashboard")
+    before = evictions._value.get()
+    for uid in ("a", "b", "c"):
+        cache.store(uid, "dashboard", {}, b"x" * 400)
+    cache.lookup("a")  # touch "a" so "b" is the least recently used
+    cache.store("d", "dashboard", {}, b"x" * 400)
+
+    assert cache.lookup("b") is None
+    assert cache.lookup("a") is not None
+    assert evictions._value.get() - before == 1
+
+
+@pytest.mark.asyncio
+async def test_fresh_entries_skip_the_network():
+    hits = []
+
+    def handler(request):
+        hits.append(request.url.path)
+        return httpx.Response(200, content=dashboard_body("fastapi", 3))
+
+    grafana = await make_cached_client(handler).get_async_client()
+    await grafana.dashboard.async_get_dashboard("fastapi")
+    result = await grafana.dashboard.async_get_dashboard("fastapi")
+
+    assert result["dashboard"]["version"] == 3
+    assert hits == ["/api/dashboards/uid/fastapi"]
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_revalidates_with_etag():
+    seen_headers = []
+
+    def handler(request):
+        seen_headers.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v3"':
+            return httpx.Response(304)
+        return httpx.Response(200, content=dashboard_body("fastapi", 3), headers={"ETag": '"v3"'})
+
+    client = make_cached_client(handler)
+    client.read_cache.ttls["dashboard"] = 0
+    grafana = await client.get_async_client()
+    await grafana.dashboard.async_get_dashboard("fastapi")
+    result = await grafana.dashboard.async_get_dashboard("fastapi")
+
+    assert seen_headers == [None, '"v3"']
+    assert result["dashboard"]["version"] == 3
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_revalidates_with_version_probe():
+    paths = []
+
+    def handler(request):
+        paths.append(request.url.path)
+        if request.url.path.endswith("/versions"):
+            return httpx.Response(200, json=[{"version": 3}])
+        return httpx.Response(200, content=dashboard_body("fastapi", 3))
+
+    client = make_cached_client(handler)
+    client.read_cache.ttls["dashboard"] = 0
+    grafana = await client.get_async_client()
+    await grafana.dashboard.async_get_dashboard("fastapi")
+    await grafana.dashboard.async_get_dashboard("fastapi")
+
+    assert paths == ["/api/dashboards/uid/fastapi", "/api/dashboards/uid/fastapi/versions"]
+
+
+@pytest.mark.asyncio
+async def test_dashboard_writes_invalidate_cache():
+    versions = iter([1, 2])
+
+    def handler(request):
+        if request.method == "POST":
+            return httpx.Response(200, json={"status": "success"})
+        if request.url.path == "/api/search":
+            return httpx.Response(200, json=[])
+        return httpx.Response(200, content=dashboard_body("fastapi", next(versions)))
+
+    grafana = await make_cached_client(handler).get_async_client()
+    await grafana.dashboard.async_get_dashboard("fastapi")
+    await grafana.search.async_search_dashboards("fastapi")
+    await grafana.dashboard.async_update_dashboard({"dashboard": {"uid": "fastapi"}})
+    result = await grafana.dashboard.async_get_dashboard("fastapi")
+
+    assert result["dashboard"]["version"] == 2
@@ -0,0 +1,82 @@
+import time
+
+import httpx
+import pytest
+
+from app.core.grafana.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreakerRegistry,
+    EndpointCircuitBreaker,
+)
+from app.core.grafana.client import GrafanaClient
+from app.core.grafana.config import GrafanaConfig
+from app.core.grafana.exceptions import GrafanaCircuitOpenError, GrafanaError
+
+
+def test_breaker_opens_after_consecutive_failures():
+    breaker = EndpointCircuitBreaker("alerting", failure_threshold=3, recovery_timeout=60)
+    for _ in range(3):
+        breaker.before_call()
+        breaker.record_failure()
+    assert breaker.state == OPEN
+    with pytest.raises(GrafanaCircuitOpenError):
+        breaker.before_call()
+
+
+def test_half_open_admits_limited_probes():
+    breaker = EndpointCircuitBreaker(
+        "alerting", failure_threshold=1, recovery_timeout=0.01, half_open_max_calls=1
+    )
+    breaker.before_call()
+    breaker.record_failure()
+    time.sleep(0.02)
+
+    breaker.before_call()  # the probe
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(GrafanaCircuitOpenError):
+        breaker.before_call()
+
+    breaker.record_response(200)
+    assert breaker.state == CLOSED
+
+
+def test_failed_probe_reopens():
+    breaker = EndpointCircuitBreaker("search", failure_threshold=1, recovery_timeout=0.01)
+    breaker.before_call()
+    breaker.record_failure()
+    time.sleep(0.02)
+    breaker.before_call()
+    breaker.record_response(503)
+    assert breaker.state == OPEN
+
+
+def test_registry_isolates_endpoint_families():
+    registry = CircuitBreakerRegistry(failure_threshold=1)
+    registry.get("search").record_failure()
+    assert registry.states() == {"search": OPEN}
+    registry.get("alerting").before_call()
+    assert registry.get("alerting").state == CLOSED
+
+
+@pytest.mark.asyncio
+async def test_sick_endpoint_does_not_block_healthy_ones():
+    def handler(request):
+        if request.url.path == "/api/search":
+            return httpx.Response(500)
+        return httpx.Response(200, json=[])
+
+    client = GrafanaClient(config=GrafanaConfig())
+    client.circuit_breakers = CircuitBreakerRegistry(failure_threshold=2, recovery_timeout=60)
+    client._async_session = httpx.AsyncClient(
+        base_url="http://grafana.test", transport=httpx.MockTransport(handler)
+    )
+
+    for _ in range(2):
+        with pytest.raises(GrafanaError):
+            await client.request("GET", "/api/search")
+    with pytest.raises(GrafanaCircuitOpenError):
+        await client.request("GET", "/api/search")
+
+    assert await client.request("GET", "/api/v1/provisioning/alert-rules") == []
@@ -0,0 +1,288 @@
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+import requests
+
+from app.core.grafana.client import (
+    GrafanaClient,
+    _endpoint_family,
+    _GrafanaHTTPAdapter,
+)
+from app.core.grafana.config import GrafanaConfig
+from app.core.grafana.exceptions import (
+    GrafanaCircuitOpenError,
+    GrafanaConnectionError,
+    GrafanaNotFoundError,
+    GrafanaRateLimitError,
+)
+from app.core.grafana.rate_limit import AdaptiveTokenBucket
+from app.core.grafana.single_flight import SINGLE_FLIGHT_SHARED, SingleFlight
+
+
+def make_client(handler) -> GrafanaClient:
+    """Build a GrafanaClient whose async pool is served by ``handler``"""
+    client = GrafanaClient(config=GrafanaConfig())
+    client._async_session = httpx.AsyncClient(
+        base_url="http://grafana.test", transport=httpx.MockTransport(handler)
+    )
+    return client
+
+
+def test_async_session_uses_pool_config():
+    client = GrafanaClient(config=GrafanaConfig())
+    pool = client.async_session._transport._pool
+    assert pool._max_connections == GrafanaConfig.POOL_MAXSIZE
+    assert pool._max_keepalive_connections == GrafanaConfig.POOL_CONNECTIONS
+
+
+@pytest.mark.asyncio
+async def test_async_client_shares_pool():
+    client = make_client(lambda request: httpx.Response(200, json=[]))
+    first = await client.get_async_client()
+    second = await client.get_async_client()
+    assert first is second
+    assert await first.search.async_search_dashboards("api") == []
+
+
+@pytest.mark.asyncio
+async def test_async_request_maps_http_errors():
+    def handler(request):
+        if request.url.path.startswith("/api/dashboards"):
+            return httpx.Response(404, json={"message": "not found"})
+        return httpx.Response(429, headers={"X-RateLimit-Limit": "10"})
+
+    grafana = await make_client(handler).get_async_client()
+    with pytest.raises(GrafanaNotFoundError):
+        await grafana.dashboard.async_get_dashboard("missing")
+    with pytest.raises(GrafanaRateLimitError):
+        await grafana.alerting.async_get_all_alerts()
+
+
+@pytest.mark.asyncio
+async def test_async_request_maps_transport_errors():
+    def handler(request):
+        raise httpx.ConnectError("refused", request=request)
+
+    grafana = await make_client(handler).get_async_client()
+    with pytest.raises(GrafanaConnectionError):
+        await grafana.datasource.async_get_all_datasources()
+
+
+@pytest.mark.parametrize("path,family", [
+    ("/api/search?query=x", "search"),
+    ("/api/dashboards/uid/abc", "dashboards"),
+    ("/api/v1/provisioning/alert-rules/abc", "alerting"),
+    ("/", "root"),
+])
+def test_endpoint_family(path, family):
+    assert _endpoint_family(path) == family
+
+
+@patch("app.core.grafana.client.GrafanaApi.from_url")
+def test_get_client_is_cached(mock_from_url):
+    client = GrafanaClient(config=GrafanaConfig())
+    assert client.get_client() is client.get_client()
+    assert mock_from_url.call_count == 1
+
+
+@patch("app.core.grafana.client.GrafanaApi.from_url")
+def test_get_client_rebuilds_after_invalidation_or_config_change(mock_from_url):
+    mock_from_url.side_effect = lambda **kwargs: MagicMock()
+    client = GrafanaClient(config=GrafanaConfig())
+    first = client.get_client()
+
+    client.invalidate_client()
+    second = client.get_client()
+    assert second is not first
+
+    client.config.API_KEY = "rotated"
+    assert client.get_client() is not second
+    assert mock_from_url.call_count == 3
+
+
+@patch("app.core.grafana.client.GrafanaApi.from_url")
+def test_get_client_concurrent_first_use_builds_once(mock_from_url):
+    client = GrafanaClient(config=GrafanaConfig())
+    barrier = threading.Barrier(8)
+    handles = []
+
+    def worker():
+        barrier.wait()
+        handles.append(client.get_client())
+        handles.append(client.session)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert mock_from_url.call_count == 1
+    assert len({id(handle) for handle in handles}) == 2
+
+
+def test_adapter_invalidates_client_on_auth_and_connection_failure():
+    owner = MagicMock(single_flight=SingleFlight(), read_cache=None)
+    adapter = _GrafanaHTTPAdapter(owner)
+    request = requests.Request("GET", "http://grafana.test/api/health").prepare()
+
+    with patch.object(requests.adapters.HTTPAdapter, "send", return_value=MagicMock(status_code=401)):
+        adapter.send(request)
+    with patch.object(
+        requests.adapters.HTTPAdapter, "send", side_effect=requests.exceptions.ConnectionError()
+    ):
+        with pytest.raises(requests.exceptions.ConnectionError):
+            adapter.send(request)
+
+    assert owner.invalidate_client.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_does_not_spend_rate_limit_tokens():
+    client = make_client(lambda request: httpx.Response(200, json={}))
+    client.rate_limiter = MagicMock(wraps=client.rate_limiter)
+    breaker = client.circuit_breakers.get(_endpoint_family("/api/health"))
+    for _ in range(client.config.CIRCUIT_BREAKER_CONFIG["failure_threshold"]):
+        breaker.record_failure()
+
+    with pytest.raises(GrafanaCircuitOpenError):
+        await client._send_async("GET", "/api/health")
+    adapter = _GrafanaHTTPAdapter(client)
+    request = requests.Request("GET", "http://grafana.test/api/health").prepare()
+    with pytest.raises(GrafanaCircuitOpenError):
+        adapter.send(request)
+
+    client.rate_limiter.acquire.assert_not_called()
+    client.rate_limiter.async_acquire.assert_not_called()
+
+
+def test_token_bucket_adapts_to_rate_limit_headers():
+    bucket = AdaptiveTokenBucket(rate=100.0, capacity=10)
+    bucket.update_from_headers(
+        {"X-RateLimit-Limit": "60", "X-RateLimit-Remaining": "5", "X-RateLimit-Reset": "10"}
+    )
+    assert bucket.rate == pytest.approx(0.5)
+    assert bucket.capacity == 60
+    # Five tokens left in the window: the sixth request has to wait
+    assert [bucket._reserve(1) for _ in range(5)] == [0.0] * 5
+    assert bucket._reserve(1) > 1.0
+
+
+def test_token_bucket_pauses_after_exhaustion():
+    bucket = AdaptiveTokenBucket(rate=100.0, capacity=10)
+    bucket.update_from_headers(
+        {"X-RateLimit-Limit": "60", "X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "2"}
+    )
+    assert bucket._reserve(1) >= 1.9
+
+
+def test_token_bucket_resumes_promptly_after_reset():
+    bucket = AdaptiveTokenBucket(rate=100.0, capacity=10)
+    bucket.update_from_headers(
+        {"X-RateLimit-Limit": "60", "X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "0.2"}
+    )
+    assert bucket.rate == 100.0
+    time.sleep(0.25)
+    assert bucket.acquire() < 0.05
+
+
+@pytest.mark.asyncio
+async def test_async_request_feeds_rate_limiter():
+    def handler(request):
+        return httpx.Response(
+            200,
+            json=[],
+            headers={"X-RateLimit-Limit": "100", "X-RateLimit-Remaining": "50", "X-RateLimit-Reset": "5"},
+        )
+
+    client = make_client(handler)
+    await client.request("GET", "/api/search")
+    assert client.rate_limiter.rate == pytest.approx(10.0)
+
+
+@pytest.mark.asyncio
+async def test_async_get_with_list_params_is_collapsed():
+    seen = []
+
+    async def handler(request):
+        seen.append(request.url.params.get_list("tag"))
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json=[{"uid": "a"}])
+
+    client = make_client(handler)
+    params = {"tag": ["prod", "db"], "type": "dash-db"}
+    results = await asyncio.gather(
+        *(client.request("GET", "/api/search", params=params) for _ in range(3))
+    )
+
+    assert results == [[{"uid": "a"}]] * 3
+    assert seen == [["prod", "db"]]
+
+
+def test_single_flight_collapses_concurrent_thread_calls():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+    shared = SINGLE_FLIGHT_SHARED.labels("thread")
+    shared_before = shared._value.get()
+
+    def fetch():
+        calls.append(1)
+        release.wait(1)
+        return {"uid": "fastapi"}
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(flight.do("uid", fetch, clone=dict)))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    while shared._value.get() - shared_before < 4:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [{"uid": "fastapi"}] * 5
+
+
+@pytest.mark.asyncio
+async def test_concurrent_async_gets_share_one_round_trip():
+    hits = []
+
+    async def handler(request):
+        hits.append(request.url.path)
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={"dashboard": {"uid": "fastapi"}})
+
+    grafana = await make_client(handler).get_async_client()
+    results = await asyncio.gather(
+        *(grafana.dashboard.async_get_dashboard("fastapi") for _ in range(10))
+    )
+
+    assert hits == ["/api/dashboards/uid/fastapi"]
+    assert all(result == {"dashboard": {"uid": "fastapi"}} for result in results)
+
+
+@pytest.mark.asyncio
+async def test_conditional_request_returns_not_modified():
+    seen = []
+
+    def handler(request):
+        seen.append(request)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json={"data": {}}, headers={"ETag": '"v1"'})
+
+    grafana = await make_client(handler).get_async_client()
+    first = await grafana.alerting.async_get_rule_states(states=["firing"])
+    second = await grafana.alerting.async_get_rule_states({"If-None-Match": first.headers["ETag"]})
+
+    assert (first.status_code, second.status_code) == (200, 304)
+    assert seen[0].url.params.get_list("state") == ["firing"]
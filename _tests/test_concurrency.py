@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+
+from app.core.grafana.concurrency import AdaptiveConcurrencyLimiter
+from app.core.grafana.exceptions import GrafanaRateLimitError
+
+
+async def _run(limiter, n, fn):
+    return await asyncio.gather(*(limiter.call(fn) for _ in range(n)), return_exceptions=True)
+
+
+@pytest.mark.asyncio
+async def test_fixed_limit_caps_in_flight_calls():
+    limiter = AdaptiveConcurrencyLimiter(3)
+    peak = 0
+
+    async def call():
+        nonlocal peak
+        peak = max(peak, limiter.in_flight)
+        await asyncio.sleep(0.001)
+
+    await _run(limiter, 20, call)
+    assert peak == 3
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_adaptive_limit_grows_when_healthy_and_backs_off_on_overload():
+    limiter = AdaptiveConcurrencyLimiter(2, adaptive=True, max_limit=10)
+
+    async def ok():
+        await asyncio.sleep(0)
+
+    await _run(limiter, 40, ok)
+    grown = limiter.limit
+    assert grown > 2
+
+    async def rate_limited():
+        raise GrafanaRateLimitError("slow down", 0, 0, "", None)
+
+    await _run(limiter, 3, rate_limited)
+    assert limiter.limit < grown
+    assert limiter.limit >= 1
+
+
+@pytest.mark.asyncio
+async def test_adaptive_limit_backs_off_on_slow_calls():
+    limiter = AdaptiveConcurrencyLimiter(8, adaptive=True, latency_target=0.001)
+
+    async def slow():
+        await asyncio.sleep(0.01)
+
+    await _run(limiter, 8, slow)
+    assert limiter.limit < 8
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_leak_slots():
+    limiter = AdaptiveConcurrencyLimiter(1)
+    release = asyncio.Event()
+
+    async def hold():
+        await release.wait()
+
+    holder = asyncio.create_task(limiter.call(hold))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    release.set()
+    await holder
+    await asyncio.gather(waiter, return_exceptions=True)
+
+    await asyncio.wait_for(limiter.acquire(), timeout=1)
+    assert limiter.in_flight == 1
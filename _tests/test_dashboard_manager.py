@@ -0,0 +1,57 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.core.grafana.client import GrafanaClient
+from app.core.grafana.dashboard_manager import DashboardManager
+from app.core.grafana.exceptions import ErrorDetail, GrafanaError
+
+
+def search_hit(index: int) -> dict:
+    return {
+        "id": index,
+        "uid": f"dash-{index}",
+        "title": f"Dashboard {index}",
+        "uri": f"db/dashboard-{index}",
+        "url": f"/d/dash-{index}/dashboard-{index}",
+        "slug": f"dashboard-{index}",
+        "type": "dash-db",
+        "tags": [],
+        "isStarred": False,
+    }
+
+
+@pytest.fixture
+def mock_grafana_client():
+    client = MagicMock(spec=GrafanaClient)
+    client.get_async_client.return_value = MagicMock()
+    return client
+
+
+@pytest.mark.asyncio
+async def test_list_dashboards_walks_all_pages(mock_grafana_client):
+    grafana = mock_grafana_client.get_async_client.return_value
+    hits = [search_hit(i) for i in range(1, 6)]
+    grafana.search.async_search_dashboards = AsyncMock(
+        side_effect=lambda query, limit, page: hits[(page - 1) * limit: page * limit]
+    )
+
+    manager = DashboardManager(mock_grafana_client)
+    uids = [meta.uid async for meta in manager.list_dashboards(page_size=2)]
+
+    assert uids == [f"dash-{i}" for i in range(1, 6)]
+    assert [call.kwargs["page"] for call in grafana.search.async_search_dashboards.await_args_list] == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_list_dashboards_propagates_page_errors(mock_grafana_client):
+    grafana = mock_grafana_client.get_async_client.return_value
+    error = GrafanaError(ErrorDetail(code="grafana_http_error", message="boom", context=None))
+    grafana.search.async_search_dashboards = AsyncMock(side_effect=[[search_hit(1)], error])
+
+    manager = DashboardManager(mock_grafana_client)
+    seen = []
+    with pytest.raises(GrafanaError):
+        async for meta in manager.list_dashboards(page_size=1):
+            seen.append(meta.uid)
+    assert seen == ["dash-1"]
@@ -0,0 +1,118 @@
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.core.grafana.dashboard_sync import DashboardSyncEngine
+
+
+@pytest.fixture
+def provisioning_root(tmp_path):
+    (tmp_path / "fastapi").mkdir()
+    (tmp_path / "fastapi" / "requests.json").write_text(json.dumps({"uid": "fastapi-requests", "title": "Requests"}))
+    (tmp_path / "root.json").write_text(json.dumps({"title": "No uid"}))
+    return tmp_path
+
+
+@pytest.fixture
+def manager():
+    remote = {}
+    versions = {}
+
+    async def iter_search_hits():
+        for uid in list(remote):
+            hit = {"uid": uid, "title": manager.titles.get(uid, uid), "type": "dash-db"}
+            if manager.hits_carry_versions:
+                hit["version"] = versions[uid]
+            yield hit
+
+    async def push(model, folder_uid="", message=""):
+        remote[model["uid"]] = folder_uid
+        versions[model["uid"]] = versions.get(model["uid"], 0) + 1
+        return {"uid": model["uid"], "version": versions[model["uid"]]}
+
+    manager = MagicMock()
+    manager.iter_search_hits = iter_search_hits
+    manager.async_push_dashboard = AsyncMock(side_effect=push)
+    grafana = manager.client.get_async_client = AsyncMock()
+    grafana.return_value.folder.async_get_all_folders = AsyncMock(return_value=[])
+    grafana.return_value.folder.async_create_folder = AsyncMock(return_value={"uid": "folder-fastapi"})
+    manager.remote = remote
+    manager.versions = versions
+    manager.titles = {}
+    manager.hits_carry_versions = False
+    return manager
+
+
+@pytest.mark.asyncio
+async def test_sync_pushes_only_changed_dashboards(provisioning_root, manager):
+    engine = DashboardSyncEngine(manager, root=provisioning_root)
+
+    first = await engine.sync()
+    assert sorted(first.pushed) == ["fastapi/requests.json", "root.json"]
+    assert manager.remote["fastapi-requests"] == "folder-fastapi"
+
+    second = await engine.sync()
+    assert second.pushed == []
+    assert len(second.unchanged) == 2
+
+    (provisioning_root / "fastapi" / "requests.json").write_text(
+        json.dumps({"uid": "fastapi-requests", "title": "Requests v2"})
+    )
+    third = await engine.sync()
+    assert third.pushed == ["fastapi/requests.json"]
+    assert manager.async_push_dashboard.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_sync_repushes_dashboards_missing_remotely(provisioning_root, manager):
+    engine = DashboardSyncEngine(manager, root=provisioning_root)
+    await engine.sync()
+    manager.remote.pop("fastapi-requests")
+
+    report = await engine.sync()
+    assert report.pushed == ["fastapi/requests.json"]
+
+
+@pytest.mark.asyncio
+async def test_noop_sync_fetches_no_dashboards(provisioning_root, manager):
+    engine = DashboardSyncEngine(manager, root=provisioning_root)
+    await engine.sync()
+    grafana = manager.client.get_async_client.return_value
+
+    report = await engine.sync()
+    assert report.pushed == [] and len(report.unchanged) == 2
+    grafana.dashboard.async_get_dashboard.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_sync_repushes_dashboards_whose_listed_version_changed(provisioning_root, manager):
+    engine = DashboardSyncEngine(manager, root=provisioning_root)
+    await engine.sync()
+    manager.hits_carry_versions = True
+    manager.versions["fastapi-requests"] += 1  # saved from the UI
+
+    report = await engine.sync()
+    assert report.pushed == ["fastapi/requests.json"]
+    assert report.unchanged == ["root.json"]
+    assert (await engine.sync()).pushed == []
+
+
+@pytest.mark.asyncio
+async def test_dashboards_with_unparseable_metadata_are_not_repushed(provisioning_root, manager):
+    engine = DashboardSyncEngine(manager, root=provisioning_root)
+    await engine.sync()
+    manager.titles["fastapi-requests"] = "x" * 150  # DashboardMeta rejects it
+
+    report = await engine.sync()
+    assert report.pushed == []
+
+
+@pytest.mark.asyncio
+async def test_failed_push_is_retried_next_run(provisioning_root, manager):
+    manager.async_push_dashboard.side_effect = [RuntimeError("boom"), {"version": 1}]
+    engine = DashboardSyncEngine(manager, root=provisioning_root, max_concurrency=1)
+
+    report = await engine.sync()
+    assert list(report.failed) == ["fastapi/requests.json"]
+    assert "fastapi/requests.json" not in engine.load_state()
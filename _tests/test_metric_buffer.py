@@ -0,0 +1,109 @@
+import threading
+
+import pytest
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+
+from app.core.grafana.metric_buffer import BufferedMetricRecorder
+
+
+@pytest.fixture
+def registry():
+    return CollectorRegistry()
+
+
+@pytest.fixture
+def recorder():
+    recorder = BufferedMetricRecorder()
+    yield recorder
+    recorder.stop()
+
+
+def test_events_are_applied_on_flush(registry, recorder):
+    hits = Counter("hits", "hits", registry=registry)
+    tasks = Counter("tasks", "tasks", ["task_name", "status"], registry=registry)
+    latency = Histogram("latency", "latency", ["task_name"], registry=registry)
+    depth = Gauge("depth", "depth", registry=registry)
+
+    for _ in range(10):
+        recorder.inc(hits)
+    recorder.inc(lambda: tasks, 3, (("task_name", "sync"), ("status", "success")))
+    recorder.observe_many(latency, [0.1, 0.2], (("task_name", "sync"),))
+    recorder.set(depth, 5)
+    recorder.set(depth, 7)
+    assert registry.get_sample_value("hits_total") == 0
+
+    recorder.flush()
+    assert registry.get_sample_value("hits_total") == 10
+    assert registry.get_sample_value("tasks_total", {"task_name": "sync", "status": "success"}) == 3
+    assert registry.get_sample_value("latency_count", {"task_name": "sync"}) == 2
+    assert registry.get_sample_value("depth") == 7
+
+    recorder.flush()  # nothing new: nothing applied twice
+    assert registry.get_sample_value("hits_total") == 10
+
+
+def test_concurrent_threads_lose_no_increments(registry, recorder):
+    hits = Counter("hits", "hits", registry=registry)
+    recorder.start(interval=0.001)
+
+    def work():
+        for _ in range(20000):
+            recorder.inc(hits)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    recorder.stop()
+
+    assert registry.get_sample_value("hits_total") == 80000
+    assert recorder._buffers == []  # finished threads are dropped once flushed
+
+
+def test_events_recorded_just_before_thread_exit_are_kept(registry, recorder):
+    hits = Counter("hits", "hits", registry=registry)
+    thread = threading.Thread(target=recorder.inc, args=(hits,))
+    thread.start()
+    thread.join()
+    [buffer] = recorder._buffers
+
+    class ExitingThread:
+        def is_alive(self):
+            # Its last increment lands after flush copied the buffer's totals
+            buffer.counts[(hits, ())] += 1
+            return False
+
+    buffer.thread = ExitingThread()
+    recorder.flush()
+    assert registry.get_sample_value("hits_total") == 2
+    assert recorder._buffers == []
+
+
+def test_scrape_registry_flushes_before_collect(registry, recorder):
+    hits = Counter("hits", "hits", registry=registry)
+    recorder.inc(hits, 4)
+    assert b"hits_total 4.0" in generate_latest(recorder.scrape_registry(registry))
+
+
+def _total(counter):
+    return next(s.value for m in counter.collect() for s in m.samples if s.name.endswith("_total"))
+
+
+def test_metric_helpers_batch_through_recorder():
+    metrics = pytest.importorskip("app.core.grafana.metrics")
+    hits = metrics.get_valkey_cache_hits()
+    before = _total(hits)
+
+    recorder = metrics.enable_buffered_metrics(interval=60)
+    try:
+        metrics.record_valkey_cache_hits(5)
+        metrics.record_valkey_cache_hit()
+        assert _total(hits) == before
+    finally:
+        metrics.disable_buffered_metrics()
+
+    assert _total(hits) == before + 6
+    metrics.record_valkey_cache_hits(2)  # direct again
+    assert _total(hits) == before + 8
+    assert recorder._thread is None
@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+
+from app.core.grafana.alert_manager import AlertRule
+from app.core.grafana.exceptions import (
+    ErrorDetail,
+    GrafanaError,
+    GrafanaNotFoundError,
+    GrafanaRateLimitError,
+    GrafanaTimeoutError,
+)
+from app.core.grafana.metric_labels import (
+    ERROR_CLASSES,
+    MetricChildren,
+    apply_label_policy,
+    error_class,
+)
+from app.core.grafana.models import TimeoutThresholds
+
+
+def test_errors_map_to_fixed_classes():
+    not_found = GrafanaNotFoundError("dashboard", "abc-123", None)
+    assert error_class(not_found) == "grafana_not_found"
+    assert error_class(str(not_found)) == "grafana_not_found"
+    assert error_class(GrafanaRateLimitError("slow down", 1, 0, "", None)) == "grafana_rate_limit"
+    assert error_class(GrafanaTimeoutError("read", 1.0, TimeoutThresholds())) == "grafana_timeout"
+    assert error_class(asyncio.TimeoutError()) == "grafana_timeout"
+    assert error_class(GrafanaError(ErrorDetail("alert_create_error", "boom 42", None))) == "grafana_error"
+    assert error_class(ValueError("free text")) == "unknown"
+    assert error_class("something broke at 12:00") == "unknown"
+    assert error_class(None) == ""
+
+
+def test_distinct_messages_share_one_class():
+    classes = {error_class(GrafanaNotFoundError("dashboard", f"uid-{i}", None)) for i in range(100)}
+    assert classes == {"grafana_not_found"} and classes <= ERROR_CLASSES
+
+
+def test_label_policy_drops_and_hashes_free_text():
+    labels = {"operation": "get", "dashboard_title": "My Dashboard", "alert_title": "CPU high"}
+    bounded = apply_label_policy(labels, {"dashboard_title": "hash", "alert_title": "drop"})
+    assert bounded["operation"] == "get" and bounded["alert_title"] == ""
+    assert len(bounded["dashboard_title"]) == 8
+    assert bounded == apply_label_policy(labels, {"dashboard_title": "hash", "alert_title": "drop"})
+    with pytest.raises(ValueError):
+        apply_label_policy(labels, {"alert_title": "truncate"})
+
+
+def test_metric_children_are_resolved_once():
+    calls = []
+    children = MetricChildren(lambda *key: calls.append(key) or object(), max_size=2)
+    first = children.get(("a", 1))
+    assert children.get(("a", 1)) is first and calls == [("a", 1)]
+    children.get(("b", 1))
+    children.get(("c", 1))  # over max_size: cache restarts
+    assert children.get(("a", 1)) is not first
+
+
+def test_record_grafana_metric_bounds_series():
+    metrics = pytest.importorskip("app.core.grafana.metrics")
+    alert = AlertRule(uid="cpu", title="CPU high", condition="avg() > 1", severity="critical")
+    for i in range(50):
+        metrics.record_grafana_metric("alert_create", alert, "error", 0.1, RuntimeError(f"error {i}"))
+    metrics.handle_grafana_exception("alert_create", alert, RuntimeError("other"))
+
+    samples = [
+        s for m in metrics.TEST_FAILURE.collect() for s in m.samples if s.name.endswith("_total")
+    ]
+    assert len(samples) == 1
+    assert samples[0].labels["error"] == "unknown" and samples[0].labels["alert_title"] == ""
+    assert samples[0].value == 51
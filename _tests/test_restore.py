@@ -0,0 +1,147 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.core.grafana.backup_archive import ArchiveWriter
+from app.core.grafana.backup_writer import NDJSONBackupWriter, iter_ndjson_records
+from app.core.grafana.client import GrafanaClient
+from app.core.grafana.exceptions import GrafanaConflictError, GrafanaNotFoundError
+from app.core.grafana.restore import JOURNAL_SUFFIX, RestoreEngine, RestoreJournal
+
+
+def _write_backup(path, writer_cls=NDJSONBackupWriter, dashboards=3):
+    with writer_cls(path) as writer:
+        writer.write("header", {"version": "2.0", "timestamp": "20250101_000000"})
+        for i in range(dashboards):
+            writer.write(
+                "dashboard",
+                {
+                    "dashboard": {"uid": f"dash-{i}", "id": 7, "title": f"D{i}"},
+                    "meta": {"folderUid": "ops", "folderTitle": "Ops"},
+                },
+            )
+        writer.write("datasource", {"id": 1, "uid": "prometheus", "name": "Prometheus"})
+        writer.write("alert_rule", {"id": 3, "uid": "alert-1", "folderUID": "alerts"})
+    return path
+
+
+@pytest.fixture
+def grafana():
+    grafana = MagicMock()
+    grafana.calls = []
+
+    def track(name, result=None):
+        async def call(*args, **kwargs):
+            await asyncio.sleep(0)
+            grafana.calls.append(name)
+            return result
+
+        return AsyncMock(side_effect=call)
+
+    grafana.folder.async_create_folder = track("folder")
+    grafana.datasource.async_create_datasource = track("datasource")
+    grafana.datasource.async_update_datasource = track("datasource_update")
+    grafana.dashboard.async_update_dashboard = track("dashboard")
+    grafana.alerting.async_update_alert_rule = track("alert_rule")
+    grafana.alerting.async_create_alert_rule = track("alert_rule_create")
+    return grafana
+
+
+@pytest.fixture
+def engine(grafana):
+    client = MagicMock(spec=GrafanaClient)
+    client.get_async_client = AsyncMock(return_value=grafana)
+    return RestoreEngine(client, max_concurrency=2)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("writer_cls,suffix", [(NDJSONBackupWriter, ".ndjson"), (ArchiveWriter, ".gfba")])
+async def test_restore_runs_stages_in_dependency_order(engine, grafana, tmp_path, writer_cls, suffix):
+    backup_path = _write_backup(tmp_path / f"backup{suffix}", writer_cls)
+
+    report = await engine.restore(backup_path)
+
+    assert report.failed == {}
+    assert report.restored == {"folder": 2, "datasource": 1, "dashboard": 3, "alert_rule": 1}
+    assert grafana.calls == ["folder"] * 2 + ["datasource"] + ["dashboard"] * 3 + ["alert_rule"]
+    payload = grafana.dashboard.async_update_dashboard.await_args.args[0]
+    assert payload["dashboard"]["id"] is None and payload["folderUid"] == "ops"
+    assert not (tmp_path / f"backup{suffix}{JOURNAL_SUFFIX}").exists()
+
+
+@pytest.mark.asyncio
+async def test_restore_reads_the_backup_once(engine, grafana, tmp_path, monkeypatch):
+    backup_path = _write_backup(tmp_path / "backup.ndjson")
+    reads = []
+
+    def counting_records(path):
+        reads.append(path)
+        return iter_ndjson_records(path)
+
+    monkeypatch.setattr("app.core.grafana.restore.iter_ndjson_records", counting_records)
+
+    report = await engine.restore(backup_path)
+    assert report.failed == {} and sum(report.restored.values()) == 7
+    assert reads == [backup_path]
+
+
+@pytest.mark.asyncio
+async def test_interrupted_restore_resumes_from_journal(engine, grafana, tmp_path):
+    backup_path = _write_backup(tmp_path / "backup.ndjson", dashboards=5)
+    dashboard_calls = []
+    failures = ["dash-3"]
+
+    async def flaky_update(payload):
+        uid = payload["dashboard"]["uid"]
+        dashboard_calls.append(uid)
+        if uid in failures:
+            failures.remove(uid)
+            raise RuntimeError("boom")
+
+    grafana.dashboard.async_update_dashboard = AsyncMock(side_effect=flaky_update)
+
+    first = await engine.restore(backup_path)
+    assert list(first.failed) == ["dashboard:dash-3"]
+    assert (tmp_path / f"backup.ndjson{JOURNAL_SUFFIX}").exists()
+
+    dashboard_calls.clear()
+    second = await engine.restore(backup_path)
+    assert second.failed == {}
+    assert dashboard_calls == ["dash-3"]
+    assert second.skipped == {"folder": 2, "datasource": 1, "dashboard": 4, "alert_rule": 1}
+    assert not (tmp_path / f"backup.ndjson{JOURNAL_SUFFIX}").exists()
+
+
+@pytest.mark.asyncio
+async def test_restore_updates_existing_and_creates_missing(engine, grafana, tmp_path):
+    backup_path = _write_backup(tmp_path / "backup.ndjson", dashboards=0)
+    grafana.datasource.async_create_datasource.side_effect = GrafanaConflictError(
+        "datasource", "prometheus", None
+    )
+    grafana.alerting.async_update_alert_rule.side_effect = GrafanaNotFoundError(
+        "alert_rule", "alert-1", None
+    )
+
+    report = await engine.restore(backup_path)
+
+    assert report.failed == {}
+    assert "datasource_update" in grafana.calls and "alert_rule_create" in grafana.calls
+    assert "id" not in grafana.alerting.async_create_alert_rule.await_args.args[0]
+
+
+def test_journal_fsyncs_records_in_batches(tmp_path, monkeypatch):
+    synced = []
+    monkeypatch.setattr("app.core.grafana.restore.os.fsync", synced.append)
+    journal = RestoreJournal(tmp_path / "journal", sync_interval=0.0)
+    journal.record("dashboard:a")
+    assert len(synced) == 1
+
+    journal.sync_interval = 3600.0
+    journal.record("dashboard:b")
+    assert len(synced) == 1
+    journal.close()
+    assert len(synced) == 2
+    reopened = RestoreJournal(tmp_path / "journal")
+    assert reopened.done == {"dashboard:a", "dashboard:b"}
+    reopened.close()
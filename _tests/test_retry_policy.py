@@ -0,0 +1,113 @@
+import time
+
+import pytest
+from tenacity import RetryError
+
+from app.core.grafana.exceptions import GrafanaRateLimitError, GrafanaTimeoutError
+from app.core.grafana.models import TimeoutThresholds
+from app.core.grafana.retry_policy import attempt_timeout, grafana_retry
+
+
+def rate_limit_error(retry_after: float) -> GrafanaRateLimitError:
+    return GrafanaRateLimitError(
+        message="Grafana rate limit exceeded",
+        limit=10,
+        remaining=0,
+        reset_time="",
+        context={"retry_after": retry_after},
+    )
+
+
+class FlakyOperation:
+    def __init__(self, errors, timeout: TimeoutThresholds):
+        self.errors = list(errors)
+        self.timeout = timeout
+        self.calls = 0
+
+    @grafana_retry("read")
+    def run(self) -> str:
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+def test_transient_failure_retries_in_milliseconds():
+    operation = FlakyOperation(
+        [GrafanaTimeoutError("read", 1.0, TimeoutThresholds())], TimeoutThresholds()
+    )
+    start = time.monotonic()
+    assert operation.run() == "ok"
+    assert operation.calls == 2
+    assert time.monotonic() - start < 0.5
+
+
+def test_retry_after_is_honored():
+    operation = FlakyOperation([rate_limit_error(0.3)], TimeoutThresholds())
+    start = time.monotonic()
+    assert operation.run() == "ok"
+    assert time.monotonic() - start >= 0.3
+
+
+def test_retry_after_beyond_budget_fails_fast():
+    operation = FlakyOperation([rate_limit_error(60.0)], TimeoutThresholds(read=1.0))
+    start = time.monotonic()
+    with pytest.raises(RetryError):
+        operation.run()
+    assert operation.calls == 1
+    assert time.monotonic() - start < 0.5
+
+
+def test_attempts_bounded_by_thresholds():
+    errors = [GrafanaTimeoutError("read", 1.0, TimeoutThresholds()) for _ in range(5)]
+    operation = FlakyOperation(errors, TimeoutThresholds(retry_attempts=2))
+    with pytest.raises(RetryError):
+        operation.run()
+    assert operation.calls == 2
+
+
+def test_attempt_timeout_is_clamped_to_the_remaining_budget():
+    timeouts = []
+
+    class SlowRead:
+        timeout = TimeoutThresholds(read=0.5)
+
+        @grafana_retry("read")
+        def run(self):
+            timeouts.append(attempt_timeout(30.0))
+            if len(timeouts) < 2:
+                time.sleep(0.2)
+                raise GrafanaTimeoutError("read", 0.2, self.timeout)
+            return "ok"
+
+    assert SlowRead().run() == "ok"
+    assert timeouts[0] <= 0.5
+    assert timeouts[1] <= 0.3
+    # Outside a retried operation the configured timeout applies as is
+    assert attempt_timeout(30.0) == 30.0
+
+
+def test_spent_budget_raises_instead_of_clamping():
+    class Expired:
+        timeout = TimeoutThresholds(read=0.05)
+
+        @grafana_retry("read", retry_on=())
+        def run(self):
+            time.sleep(0.1)
+            return attempt_timeout(30.0)
+
+    with pytest.raises(GrafanaTimeoutError) as excinfo:
+        Expired().run()
+    assert excinfo.value.operation == "read"
+
+
+def test_bulk_operations_do_not_bound_their_requests():
+    class Bulk:
+        timeout = TimeoutThresholds(backup=0.05)
+
+        @grafana_retry("backup", bound_requests=False)
+        def run(self):
+            time.sleep(0.1)  # a large backup outliving its budget
+            return attempt_timeout(30.0)
+
+    assert Bulk().run() == 30.0
@@ -8,24 +8,31 @@ Production-ready Grafana alert management with:
 """
 
 import asyncio
+import hashlib
 import logging
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any, Optional
 
-
-from circuitbreaker import circuit
 from prometheus_client import Counter, Histogram
 from pydantic import BaseModel, Field, validator
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
+from app.core.grafana.alert_versions import AlertVersionStore
+from app.core.grafana.backup_store import object_hash
 from app.core.grafana.client import GrafanaClient
+from app.core.grafana.concurrency import OVERLOAD_ERRORS, AdaptiveConcurrencyLimiter
+from app.core.grafana.config import GrafanaConfig
 from app.core.grafana.exceptions import (
     ErrorDetail,
+    GrafanaConflictError,
     GrafanaError,
     GrafanaRateLimitError,
     GrafanaTimeoutError,
+    GrafanaValidationError,
 )
 from app.core.grafana.models.index import TimeoutThresholds
+from app.core.grafana.retry_policy import grafana_retry
 
 # Metrics
 ALERT_OPERATIONS = Counter(
@@ -48,6 +55,8 @@ class AlertRule(BaseModel):
     enabled: bool = True
     annotations: dict[str, str] = {}
     labels: dict[str, str] = {}
+    folder_uid: str = ""
+    rule_group: str = "default"
 
     @validator("condition")
     def validate_condition(cls, v):
@@ -64,22 +73,42 @@ class AlertRuleVersion(BaseModel):
     updated_by: str
 
 
+@dataclass
+class AlertStateTransition:
+    """Change of an alert rule's state between two polls"""
+
+    key: str
+    title: str
+    previous: str
+    state: str
+    labels: dict[str, str] = field(default_factory=dict)
+    at: datetime = field(default_factory=datetime.utcnow)
+
+
 class GrafanaAlertManager:
     def __init__(
         self,
         client: GrafanaClient,
         timeout: Optional[TimeoutThresholds] = None,
+        versions: Optional[AlertVersionStore] = None,
     ):
         """Initialize with production-ready configuration"""
         self.client = client
         self.timeout = timeout or TimeoutThresholds()
+        self._versions = versions
+
+    @property
+    def versions(self) -> AlertVersionStore:
+        """Local version store, opened on first use"""
+        if self._versions is None:
+            self._versions = AlertVersionStore(
+                GrafanaConfig.ALERT_VERSION_DB_PATH,
+                cache_size=GrafanaConfig.ALERT_VERSION_CACHE_SIZE,
+                batch_size=GrafanaConfig.ALERT_VERSION_BATCH_SIZE,
+            )
+        return self._versions
 
-    @circuit(failure_threshold=5, recovery_timeout=60, name="grafana_alerts")
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10),
-        retry=retry_if_exception_type(GrafanaRateLimitError) | retry_if_exception_type(GrafanaTimeoutError),
-    )
+    @grafana_retry("write")
     @ALERT_LATENCY.labels("create").time()
     def create_alert(self, alert: AlertRule) -> dict[str, Any]:
         """Create a new alert rule with production hardening"""
@@ -91,6 +120,9 @@ class GrafanaAlertManager:
             logger.info(f"Created alert {alert.uid}")
             return result
 
+        except (GrafanaRateLimitError, GrafanaTimeoutError):
+            ALERT_OPERATIONS.labels("create", "error").inc()
+            raise  # Left unwrapped so the retry policy can see it
         except Exception as e:
             ALERT_OPERATIONS.labels("create", "error").inc()
             error = GrafanaError(
@@ -104,17 +136,78 @@ class GrafanaAlertManager:
             raise error
 
     def bulk_create_alerts(self, alerts: list[AlertRule]) -> dict[str, Any]:
-        """Bulk create alerts and collect results"""
+        """Bulk create alerts with one rule-group PUT per (folder, rule group).
+
+        Rules rejected by Grafana are isolated by bisecting their group, so
+        ``failed`` lists exactly the offending rules while the rest are saved.
+        """
         results = {"success": [], "failed": []}
-        for alert in alerts:
+        with ALERT_LATENCY.labels("bulk_create").time():
+            grafana = self.client.get_client()
+            for (folder_uid, group), rules in _group_rules(alerts).items():
+                try:
+                    saved, rejected = self._put_rule_group(grafana, folder_uid, group, rules)
+                except Exception as e:
+                    saved, rejected = [], {rule.uid: str(e) for rule in rules}
+                    logger.error(f"Rule group {folder_uid}/{group} failed: {str(e)}")
+
+                results["success"].extend(
+                    {"uid": rule.uid, "folderUID": folder_uid, "ruleGroup": group}
+                    for rule in saved
+                )
+                results["failed"].extend(
+                    {"uid": uid, "error": error} for uid, error in rejected.items()
+                )
+                ALERT_OPERATIONS.labels("bulk_create", "success").inc(len(saved))
+                ALERT_OPERATIONS.labels("bulk_create", "error").inc(len(rejected))
+        return results
+
+    @grafana_retry("write")
+    def _put_rule_group(
+        self,
+        grafana: Any,
+        folder_uid: str,
+        group: str,
+        alerts: list[AlertRule],
+    ) -> tuple[list[AlertRule], dict[str, str]]:
+        """Merge ``alerts`` into a rule group; return (saved, {uid: error})"""
+        provisioning = grafana.alertingprovisioning
+        try:
+            existing = provisioning.get_rule_group(folder_uid, group)
+        except Exception as e:
+            if getattr(e, "status_code", None) != 404:
+                raise
+            existing = {
+                "title": group,
+                "folderUid": folder_uid,
+                "interval": GrafanaConfig.ALERT_RULE_GROUP_INTERVAL,
+                "rules": [],
+            }
+
+        # A PUT replaces the whole group, so rules not in this batch are kept as is
+        new_uids = {alert.uid for alert in alerts}
+        kept = [r for r in existing.get("rules", []) if r.get("uid") not in new_uids]
+        saved: list[AlertRule] = []
+        rejected: dict[str, str] = {}
+        chunks = [alerts]
+        while chunks:
+            chunk = chunks.pop(0)
+            rules = kept + [_rule_payload(alert) for alert in saved + chunk]
             try:
-                result = self.create_alert(alert)
-                results["success"].append(result)
+                with ALERT_LATENCY.labels("rule_group_put").time():
+                    provisioning.update_rule_group(folder_uid, group, {**existing, "rules": rules})
+                saved.extend(chunk)
             except Exception as e:
-                results["failed"].append({"uid": alert.uid, "error": str(e)})
-        return results
+                if not _is_rule_error(e):
+                    raise
+                if len(chunk) == 1:
+                    rejected[chunk[0].uid] = str(e)
+                else:
+                    middle = len(chunk) // 2
+                    chunks[:0] = [chunk[:middle], chunk[middle:]]
+        logger.info(f"Rule group {folder_uid}/{group}: {len(saved)} saved, {len(rejected)} rejected")
+        return saved, rejected
 
-    @circuit(failure_threshold=5, recovery_timeout=60, name="grafana_alerts_async")
     async def async_create_alert(self, alert: AlertRule) -> dict[str, Any]:
         """Async version with timeout handling"""
         try:
@@ -133,6 +226,9 @@ class GrafanaAlertManager:
                 timeout=self.timeout.default,
                 threshold=self.timeout,
             )
+        except OVERLOAD_ERRORS:
+            ALERT_OPERATIONS.labels("create", "error").inc()
+            raise  # Left unwrapped so callers (and the adaptive limiter) can back off
         except Exception as e:
             ALERT_OPERATIONS.labels("create", "error").inc()
             error = GrafanaError(
@@ -145,22 +241,70 @@ class GrafanaAlertManager:
             error.log_error()
             raise error
 
-    @circuit(failure_threshold=5, recovery_timeout=60, name="grafana_alerts_bulk_async")
-    async def async_bulk_create_alerts(self, alerts: list[AlertRule]) -> dict[str, Any]:
-        """Async batch create with circuit breaker"""
-        results = {"success": [], "failed": []}
-
-        async with asyncio.TaskGroup() as tg:
-            tasks = [tg.create_task(self._safe_async_create(alert)) for alert in alerts]
+    async def async_bulk_create_alerts(
+        self,
+        alerts: list[AlertRule],
+        max_concurrency: Optional[int] = None,
+        adaptive: bool = False,
+    ) -> dict[str, Any]:
+        """Async batch create with bounded concurrency and per-alert error isolation.
+
+        At most ``max_concurrency`` creates are in flight. With ``adaptive`` the
+        limit starts there and moves between 1 and
+        ``GrafanaConfig.ALERT_BULK_MAX_CONCURRENCY``: it backs off when Grafana
+        rate limits, times out or slows past ``ALERT_BULK_LATENCY_TARGET`` and
+        grows again while calls are healthy.
+
+        ``results`` maps every uid, in input order, to ``{"status": "success",
+        "result": ...}`` or ``{"status": "failed", "error": ...}``; ``success``
+        and ``failed`` keep the previous list layout.
+        """
+        limit = max_concurrency or GrafanaConfig.ALERT_BULK_CONCURRENCY
+        limiter = AdaptiveConcurrencyLimiter(
+            limit,
+            operation="alert_bulk_create",
+            adaptive=adaptive,
+            max_limit=max(limit, GrafanaConfig.ALERT_BULK_MAX_CONCURRENCY) if adaptive else limit,
+            latency_target=GrafanaConfig.ALERT_BULK_LATENCY_TARGET if adaptive else None,
+        )
+        results: dict[str, Any] = {"results": {}, "success": [], "failed": []}
+
+        # A uid given twice is ambiguous, so none of its definitions is sent
+        seen: set[str] = set()
+        duplicates = {a.uid for a in alerts if a.uid in seen or seen.add(a.uid)}
+        unique: list[AlertRule] = []
+        for alert in alerts:
+            if alert.uid in duplicates:
+                results["results"][alert.uid] = {
+                    "status": "failed",
+                    "error": "duplicate uid in batch",
+                }
+            else:
+                results["results"][alert.uid] = None
+                unique.append(alert)
+
+        with ALERT_LATENCY.labels("async_bulk_create").time():
+            outcomes = await asyncio.gather(
+                *(
+                    limiter.call(lambda alert=alert: self._safe_async_create(alert))
+                    for alert in unique
+                ),
+                return_exceptions=True,
+            )
 
-        for task in tasks:
-            if task.exception():
-                results["failed"].append(
-                    {"uid": task.get_name(), "error": str(task.exception())}
-                )
+        for alert, outcome in zip(unique, outcomes):
+            if isinstance(outcome, asyncio.CancelledError):
+                raise outcome
+            if isinstance(outcome, BaseException):
+                results["results"][alert.uid] = {"status": "failed", "error": str(outcome)}
             else:
-                results["success"].append(task.result())
+                results["results"][alert.uid] = {"status": "success", "result": outcome}
 
+        for uid, outcome in results["results"].items():
+            if outcome["status"] == "success":
+                results["success"].append(outcome["result"])
+            else:
+                results["failed"].append({"uid": uid, "error": outcome["error"]})
         return results
 
     async def _safe_async_create(self, alert: AlertRule) -> dict[str, Any]:
@@ -171,22 +315,174 @@ class GrafanaAlertManager:
             logger.error(f"Async alert creation failed for {alert.uid}: {str(e)}")
             raise
 
+    async def async_reconcile_alerts(
+        self,
+        desired: list[AlertRule],
+        prune: bool = False,
+        max_concurrency: Optional[int] = None,
+    ) -> dict[str, Any]:
+        """Converge Grafana's alert rules on ``desired`` with the minimum set of writes.
+
+        Existing rules are fetched with a single list request and compared to
+        the desired rules by a normalized content hash; only missing rules are
+        created, changed rules updated and, with ``prune``, rules absent from
+        ``desired`` deleted, but only within the folder/rule-group pairs
+        ``desired`` manages: rules of other teams or made in the UI elsewhere
+        are never touched. Writes run concurrently, at most
+        ``max_concurrency`` (default ``GrafanaConfig.ALERT_BULK_CONCURRENCY``)
+        at a time, and one failure does not stop the others.
+
+        Returns the uids per action plus ``failed``: ``[{uid, action, error}]``.
+        """
+        with ALERT_LATENCY.labels("reconcile").time():
+            grafana = await self.client.get_async_client()
+            existing = await grafana.alerting.async_get_all_alerts()
+            plan = plan_reconciliation(desired, existing, prune=prune)
+            results: dict[str, Any] = {
+                "created": [],
+                "updated": [],
+                "deleted": [],
+                "unchanged": plan.unchanged,
+                "failed": [
+                    {"uid": uid, "action": "create", "error": "duplicate uid in batch"}
+                    for uid in plan.duplicates
+                ],
+            }
+            alerting = grafana.alerting
+            operations = (
+                [("create", a.uid, lambda a=a: alerting.async_create_alert_rule(_rule_payload(a)))
+                 for a in plan.create]
+                + [("update", a.uid,
+                    lambda a=a: alerting.async_update_alert_rule(a.uid, _rule_payload(a)))
+                   for a in plan.update]
+                + [("delete", uid, lambda uid=uid: alerting.async_delete_alert_rule(uid))
+                   for uid in plan.delete]
+            )
+            limiter = AdaptiveConcurrencyLimiter(
+                max_concurrency or GrafanaConfig.ALERT_BULK_CONCURRENCY,
+                operation="alert_reconcile",
+            )
+            outcomes = await asyncio.gather(
+                *(limiter.call(call) for _, _, call in operations), return_exceptions=True
+            )
+
+        for (action, uid, _), outcome in zip(operations, outcomes):
+            if isinstance(outcome, asyncio.CancelledError):
+                raise outcome
+            if isinstance(outcome, BaseException):
+                ALERT_OPERATIONS.labels(f"reconcile_{action}", "error").inc()
+                logger.error(f"Reconcile {action} failed for {uid}: {str(outcome)}")
+                results["failed"].append({"uid": uid, "action": action, "error": str(outcome)})
+            else:
+                ALERT_OPERATIONS.labels(f"reconcile_{action}", "success").inc()
+                results[_RECONCILE_RESULT_KEYS[action]].append(uid)
+        logger.info(
+            f"Reconciled alerts: {len(results['created'])} created, "
+            f"{len(results['updated'])} updated, {len(results['deleted'])} deleted, "
+            f"{len(plan.unchanged)} unchanged, {len(results['failed'])} failed"
+        )
+        return results
+
+    async def watch_alert_states(
+        self,
+        min_interval: Optional[float] = None,
+        max_interval: Optional[float] = None,
+        include_initial: bool = True,
+    ) -> AsyncIterator[AlertStateTransition]:
+        """Yield alert rule state transitions (pending, firing, resolved) as they happen.
+
+        Each poll asks Grafana only for rules that are pending or firing, as a
+        conditional request, and diffs them against the previous snapshot
+        kept in memory; a rule that drops out of the response has gone back
+        to normal. A ``304`` or a byte-identical body is not even parsed, so
+        cost follows the number of active alerts and changes, not the number
+        of rules.
+
+        The interval resets to ``min_interval`` whenever something changed
+        and grows by half after each quiet poll, up to ``max_interval``.
+        Overload errors (rate limits, timeouts, unreachable Grafana) are
+        logged and retried after ``max_interval``; anything else is raised.
+        With ``include_initial`` the first poll reports every active rule as
+        a transition from ``inactive``.
+        """
+        min_interval = min_interval or GrafanaConfig.ALERT_WATCH_MIN_INTERVAL
+        max_interval = max(max_interval or GrafanaConfig.ALERT_WATCH_MAX_INTERVAL, min_interval)
+        grafana = await self.client.get_async_client()
+        snapshot: dict[str, dict[str, Any]] = {}
+        validators: dict[str, str] = {}
+        body_digest = None
+        first_poll = True
+        interval = min_interval
+
+        while True:
+            try:
+                response = await grafana.alerting.async_get_rule_states(
+                    validators, states=list(_ACTIVE_STATES)
+                )
+            except OVERLOAD_ERRORS as e:
+                ALERT_OPERATIONS.labels("watch_poll", "error").inc()
+                logger.warning(f"Alert state poll failed, retrying in {max_interval}s: {str(e)}")
+                interval = max_interval
+                await asyncio.sleep(interval)
+                continue
+
+            transitions: list[AlertStateTransition] = []
+            if response.status_code == 304:
+                ALERT_OPERATIONS.labels("watch_poll", "not_modified").inc()
+            elif hashlib.sha256(response.content).digest() == body_digest:
+                ALERT_OPERATIONS.labels("watch_poll", "unchanged").inc()
+            else:
+                body_digest = hashlib.sha256(response.content).digest()
+                validators = _response_validators(response.headers)
+                current = active_rule_states(response.json())
+                if not first_poll or include_initial:
+                    transitions = diff_alert_states(snapshot, current)
+                snapshot = current
+                ALERT_OPERATIONS.labels("watch_poll", "changed").inc()
+            first_poll = False
+
+            for transition in transitions:
+                yield transition
+            interval = min_interval if transitions else min(interval * 1.5, max_interval)
+            await asyncio.sleep(interval)
+
     def update_alert_version(
         self, uid: str, new_version: int, updated_by: str
     ) -> AlertRuleVersion:
         """Track alert rule changes"""
-        if new_version <= self.get_alert_version(uid):
-            raise ValueError("Version must increment")
+        return self.bulk_update_alert_versions({uid: new_version}, updated_by)[uid]
+
+    def bulk_update_alert_versions(
+        self, versions: dict[str, int], updated_by: str
+    ) -> dict[str, AlertRuleVersion]:
+        """Record new versions for many alerts, checked with a single store query.
+
+        Raises ``ValueError`` (recording nothing) if any version does not increment.
+        """
+        updated_at = datetime.utcnow()
+        self.versions.record(versions, updated_by, updated_at)
+        return {
+            uid: AlertRuleVersion(version=version, updated_at=updated_at, updated_by=updated_by)
+            for uid, version in versions.items()
+        }
 
-        version = AlertRuleVersion(version=new_version, updated_by=updated_by)
+    def get_alert_version(self, uid: str) -> int:
+        """Get current version of alert (0 if no version was recorded)"""
+        return self.versions.current_version(uid)
 
-        # Store version in DB
-        return version
+    def get_alert_versions(self, uids: list[str]) -> dict[str, int]:
+        """Current versions of many alerts in one lookup"""
+        return self.versions.current_versions(uids)
 
-    def get_alert_version(self, uid: str) -> int:
-        """Get current version of alert"""
-        # Implementation would fetch from DB
-        return 1
+    def get_alert_history(self, uid: str) -> list[AlertRuleVersion]:
+        """Every recorded version of an alert, oldest first"""
+        return [AlertRuleVersion(**row) for row in self.versions.history(uid)]
+
+    def close(self) -> None:
+        """Commit buffered version writes and close the version store"""
+        if self._versions is not None:
+            self._versions.close()
+            self._versions = None
 
     def _validate_alert_response(self, response: dict[str, Any]) -> bool:
         """Validate Grafana alert API response"""
@@ -196,3 +492,163 @@ class GrafanaAlertManager:
                 f"Alert response missing required keys: {required_keys - response.keys()}"
             )
         return True
+
+
+def _group_rules(alerts: list[AlertRule]) -> dict[tuple[str, str], list[AlertRule]]:
+    """Alerts grouped by (folder uid, rule group), keeping input order"""
+    groups: dict[tuple[str, str], list[AlertRule]] = {}
+    for alert in alerts:
+        groups.setdefault((alert.folder_uid, alert.rule_group), []).append(alert)
+    return groups
+
+
+def _rule_payload(alert: AlertRule) -> dict[str, Any]:
+    return {
+        **alert.model_dump(),
+        "folderUID": alert.folder_uid,
+        "ruleGroup": alert.rule_group,
+        "isPaused": not alert.enabled,
+    }
+
+
+# Fields of a provisioned rule that Grafana stores and returns; anything else
+# in the desired payload (severity, enabled, folder_uid...) is never read back
+_GRAFANA_RULE_KEYS = (
+    "title",
+    "condition",
+    "data",
+    "labels",
+    "annotations",
+    "folderUID",
+    "ruleGroup",
+    "for",
+    "isPaused",
+)
+
+
+def _grafana_rule(rule: dict[str, Any]) -> dict[str, Any]:
+    """``rule`` restricted to Grafana's provisioning schema"""
+    return {key: rule[key] for key in _GRAFANA_RULE_KEYS if key in rule}
+
+
+_ACTIVE_STATES = ("pending", "firing")
+
+
+def active_rule_states(payload: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    """Pending/firing rules from a Prometheus-compatible rules response, by rule key"""
+    states = {}
+    for group in payload.get("data", {}).get("groups", []):
+        for rule in group.get("rules", []):
+            state = rule.get("state")
+            if state not in _ACTIVE_STATES:
+                continue
+            key = rule.get("uid") or f"{group.get('file', '')}/{group.get('name', '')}/{rule.get('name')}"
+            states[key] = {
+                "title": rule.get("name", key),
+                "state": state,
+                "labels": rule.get("labels") or {},
+            }
+    return states
+
+
+def diff_alert_states(
+    previous: dict[str, dict[str, Any]],
+    current: dict[str, dict[str, Any]],
+) -> list[AlertStateTransition]:
+    """Transitions between two snapshots of active rules.
+
+    A firing rule that is no longer active is ``resolved``; a pending rule
+    that never fired goes back to ``inactive``.
+    """
+    transitions = []
+    for key, rule in current.items():
+        before = previous.get(key, {}).get("state", "inactive")
+        if before != rule["state"]:
+            transitions.append(
+                AlertStateTransition(key, rule["title"], before, rule["state"], rule["labels"])
+            )
+    for key, rule in previous.items():
+        if key not in current:
+            state = "resolved" if rule["state"] == "firing" else "inactive"
+            transitions.append(
+                AlertStateTransition(key, rule["title"], rule["state"], state, rule["labels"])
+            )
+    return transitions
+
+
+def _response_validators(headers: Any) -> dict[str, str]:
+    validators = {}
+    if headers.get("ETag"):
+        validators["If-None-Match"] = headers["ETag"]
+    if headers.get("Last-Modified"):
+        validators["If-Modified-Since"] = headers["Last-Modified"]
+    return validators
+
+
+_RECONCILE_RESULT_KEYS = {"create": "created", "update": "updated", "delete": "deleted"}
+
+
+@dataclass
+class ReconcilePlan:
+    """Writes needed to turn the existing alert rules into the desired ones"""
+
+    create: list[AlertRule] = field(default_factory=list)
+    update: list[AlertRule] = field(default_factory=list)
+    delete: list[str] = field(default_factory=list)
+    unchanged: list[str] = field(default_factory=list)
+    duplicates: list[str] = field(default_factory=list)
+
+
+def rule_hash(rule: dict[str, Any], keys: Iterable[str]) -> str:
+    """Content hash of ``rule`` over ``keys``, ignoring key order and empty values"""
+    return object_hash({k: rule[k] for k in keys if rule.get(k) not in (None, "", {}, [])})
+
+
+def plan_reconciliation(
+    desired: list[AlertRule],
+    existing: list[dict[str, Any]],
+    prune: bool = False,
+) -> ReconcilePlan:
+    """Diff desired rules against the rules Grafana returned.
+
+    Both sides are reduced to Grafana's rule schema and only the fields the
+    desired rule sets are compared, so server-managed fields (``id``,
+    ``updated``, ``provenance``...) never count as a change, and neither do
+    model fields Grafana does not store. With ``prune``, existing rules absent
+    from ``desired`` are deleted only in the (folder, rule group) pairs that
+    ``desired`` uses.
+    """
+    plan = ReconcilePlan()
+    seen: set[str] = set()
+    duplicates = {a.uid for a in desired if a.uid in seen or seen.add(a.uid)}
+    plan.duplicates = sorted(duplicates)
+    current = {rule["uid"]: rule for rule in existing if rule.get("uid")}
+
+    for alert in desired:
+        if alert.uid in duplicates:
+            continue
+        if alert.uid not in current:
+            plan.create.append(alert)
+            continue
+        rule = _grafana_rule(_rule_payload(alert))
+        if rule_hash(rule, rule) == rule_hash(_grafana_rule(current[alert.uid]), rule):
+            plan.unchanged.append(alert.uid)
+        else:
+            plan.update.append(alert)
+    if prune:
+        managed = set(_group_rules(desired))
+        plan.delete = [
+            uid
+            for uid, rule in current.items()
+            if uid not in seen and (rule.get("folderUID", ""), rule.get("ruleGroup")) in managed
+        ]
+    return plan
+
+
+def _is_rule_error(error: Exception) -> bool:
+    """Whether Grafana rejected the submitted rules (vs. a transport or auth failure)"""
+    if isinstance(error, (GrafanaValidationError, GrafanaConflictError)):
+        return True
+    if isinstance(error, GrafanaError):
+        return (error.detail.context or {}).get("status_code") == 400
+    return getattr(error, "status_code", None) in (400, 409, 422)
@@ -0,0 +1,232 @@
+"""
+Persistent local store of alert rule versions.
+
+Versions live in an embedded SQLite database keyed by ``(uid, version)``, so
+every recorded version is kept as history and the primary key doubles as the
+uid index. On top of it:
+- Writes are buffered and committed in batches: one transaction per
+  ``batch_size`` rows, at the latest ``flush_interval`` seconds after the
+  first buffered write (timer), and on ``close()`` or interpreter exit
+- Current versions are served from an in-memory LRU cache, including
+  versions still waiting in the write buffer. Other processes may share the
+  database, so ``flush`` re-checks every buffered version against the table
+  inside its write transaction and drops (and logs) rows that no longer
+  increment instead of failing the whole batch
+- ``current_versions`` resolves any number of uids with a single query, so
+  version checks for bulk updates do not cost one round trip per rule
+"""
+
+import atexit
+import datetime
+import json
+import logging
+import sqlite3
+import threading
+import weakref
+from collections import OrderedDict
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS alert_versions (
+    uid TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    updated_at TEXT NOT NULL,
+    updated_by TEXT NOT NULL,
+    PRIMARY KEY (uid, version)
+) WITHOUT ROWID
+"""
+# json_each binds the whole uid list as one parameter, whatever its length
+_CURRENT_VERSIONS = """
+SELECT v.uid, MAX(v.version)
+FROM json_each(?) AS u JOIN alert_versions AS v ON v.uid = u.value
+GROUP BY v.uid
+"""
+
+logger = logging.getLogger("grafana.alerts.versions")
+
+
+class AlertVersionStore:
+    """SQLite-backed alert version history with batched writes and a read cache"""
+
+    def __init__(
+        self,
+        path: Path,
+        cache_size: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+    ):
+        self.path = Path(path)
+        self.cache_size = cache_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._lock = threading.RLock()
+        # uid -> current version (0 = no version recorded)
+        self._cache: "OrderedDict[str, int]" = OrderedDict()
+        self._pending: list[tuple[str, int, str, str]] = []
+        self._pending_versions: dict[str, int] = {}
+        self._timer: Optional[threading.Timer] = None
+        self._closed = False
+
+        if str(path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.execute(_SCHEMA)
+        # Weak, so the hook does not keep abandoned stores alive
+        self._exit_hook = _exit_flusher(weakref.ref(self))
+        atexit.register(self._exit_hook)
+
+    def current_version(self, uid: str) -> int:
+        """Latest recorded version of an alert, or 0 if it has none"""
+        return self.current_versions([uid])[uid]
+
+    def current_versions(self, uids: Iterable[str]) -> dict[str, int]:
+        """Latest recorded version of each uid (0 if none), with one query for cache misses"""
+        with self._lock:
+            versions: dict[str, int] = {}
+            missing: list[str] = []
+            for uid in uids:
+                if uid in self._pending_versions:
+                    versions[uid] = self._pending_versions[uid]
+                elif uid in self._cache:
+                    self._cache.move_to_end(uid)
+                    versions[uid] = self._cache[uid]
+                elif uid not in versions:
+                    versions[uid] = 0
+                    missing.append(uid)
+            if missing:
+                found = dict(self._conn.execute(_CURRENT_VERSIONS, (json.dumps(missing),)))
+                for uid in missing:
+                    versions[uid] = found.get(uid, 0)
+                    self._remember(uid, versions[uid])
+            return versions
+
+    def record(
+        self,
+        versions: dict[str, int],
+        updated_by: str,
+        updated_at: Optional[datetime.datetime] = None,
+    ) -> None:
+        """Record new versions; every one must be greater than the current version.
+
+        The check covers the whole batch up front, so nothing is recorded if
+        any version would not increment.
+        """
+        updated_at = updated_at or datetime.datetime.utcnow()
+        with self._lock:
+            current = self.current_versions(versions)
+            stale = sorted(uid for uid, v in versions.items() if v <= current[uid])
+            if stale:
+                raise ValueError(f"Version must increment for: {', '.join(stale)}")
+            for uid, version in versions.items():
+                self._pending.append((uid, version, updated_at.isoformat(), updated_by))
+                self._pending_versions[uid] = version
+            if len(self._pending) >= self.batch_size:
+                self.flush()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self._flush_from_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def history(self, uid: str) -> list[dict[str, Any]]:
+        """All recorded versions of an alert, oldest first"""
+        with self._lock:
+            self.flush()
+            rows = self._conn.execute(
+                "SELECT version, updated_at, updated_by FROM alert_versions "
+                "WHERE uid = ? ORDER BY version",
+                (uid,),
+            )
+            return [
+                {
+                    "version": version,
+                    "updated_at": datetime.datetime.fromisoformat(updated_at),
+                    "updated_by": updated_by,
+                }
+                for version, updated_at, updated_by in rows
+            ]
+
+    def flush(self) -> None:
+        """Commit buffered versions in a single transaction.
+
+        Rows that another writer has overtaken since they were buffered are
+        dropped with a warning. If the transaction itself fails, every row
+        stays buffered for the next flush.
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._pending or self._closed:
+                return
+            pending = self._pending
+            # IMMEDIATE takes the write lock before the check, so no other
+            # process can commit a version between the read and the insert
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                stored = dict(
+                    self._conn.execute(
+                        _CURRENT_VERSIONS, (json.dumps(sorted({row[0] for row in pending})),)
+                    )
+                )
+                accepted = [row for row in pending if row[1] > stored.get(row[0], 0)]
+                rejected = sorted({row[0] for row in pending if row[1] <= stored.get(row[0], 0)})
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO alert_versions "
+                    "(uid, version, updated_at, updated_by) VALUES (?, ?, ?, ?)",
+                    accepted,
+                )
+                self._conn.commit()
+            except BaseException:
+                self._conn.rollback()
+                raise
+
+            if rejected:
+                logger.warning(
+                    f"Dropped alert versions overtaken by another writer: {', '.join(rejected)}"
+                )
+            for uid, version in self._pending_versions.items():
+                self._remember(uid, max(version, stored.get(uid, 0)))
+            self._pending = []
+            self._pending_versions.clear()
+
+    def _flush_from_timer(self) -> None:
+        # Nothing would see an exception raised on the timer thread
+        try:
+            self.flush()
+        except Exception:
+            logger.exception(f"Failed to flush alert versions to {self.path}")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self.flush()
+            self._closed = True
+            self._conn.close()
+        atexit.unregister(self._exit_hook)
+
+    def __enter__(self) -> "AlertVersionStore":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def _remember(self, uid: str, version: int) -> None:
+        self._cache[uid] = version
+        self._cache.move_to_end(uid)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+
+def _exit_flusher(store_ref: "weakref.ref[AlertVersionStore]"):
+    def flush_at_exit() -> None:
+        store = store_ref()
+        if store is not None:
+            store.close()
+
+    return flush_at_exit
@@ -0,0 +1,130 @@
+"""
+Asyncio facade over the Grafana HTTP API.
+
+Mirrors the element layout of ``grafana_client.GrafanaApi`` (``alerting``,
+``dashboard``, ``datasource``, ``folder``, ``search``) with ``async_`` prefixed methods.
+All requests go through ``GrafanaClient.request`` so they share a single
+pooled ``httpx.AsyncClient``, exception mapping and latency metrics.
+"""
+
+from typing import TYPE_CHECKING, Any, Optional
+
+if TYPE_CHECKING:
+    import httpx
+
+    from app.core.grafana.client import GrafanaClient
+
+
+class _AsyncElement:
+    def __init__(self, client: "GrafanaClient"):
+        self.client = client
+
+
+class AsyncAlerting(_AsyncElement):
+    """Alert rule provisioning endpoints"""
+
+    BASE_PATH = "/api/v1/provisioning/alert-rules"
+    STATE_PATH = "/api/prometheus/grafana/api/v1/rules"
+
+    async def async_get_all_alerts(self) -> list[dict[str, Any]]:
+        return await self.client.request("GET", self.BASE_PATH)
+
+    async def async_get_alert_rule(self, uid: str) -> dict[str, Any]:
+        return await self.client.request("GET", f"{self.BASE_PATH}/{uid}")
+
+    async def async_create_alert_rule(self, rule: dict[str, Any]) -> dict[str, Any]:
+        return await self.client.request("POST", self.BASE_PATH, json=rule)
+
+    async def async_update_alert_rule(
+        self, uid: str, rule: dict[str, Any]
+    ) -> dict[str, Any]:
+        return await self.client.request("PUT", f"{self.BASE_PATH}/{uid}", json=rule)
+
+    async def async_delete_alert_rule(self, uid: str) -> None:
+        await self.client.request("DELETE", f"{self.BASE_PATH}/{uid}")
+
+    async def async_get_rule_states(
+        self,
+        validators: Optional[dict[str, str]] = None,
+        states: Optional[list[str]] = None,
+    ) -> "httpx.Response":
+        """Raw Prometheus-compatible rule state response, optionally filtered by state.
+
+        Sent as a conditional request; a ``304`` response means nothing changed.
+        """
+        params = {"state": states} if states else None
+        return await self.client.request_conditional(
+            self.STATE_PATH, params=params, validators=validators
+        )
+
+
+class AsyncDashboard(_AsyncElement):
+    """Dashboard CRUD endpoints"""
+
+    async def async_get_dashboard(self, uid: str) -> dict[str, Any]:
+        return await self.client.request("GET", f"/api/dashboards/uid/{uid}")
+
+    async def async_update_dashboard(self, payload: dict[str, Any]) -> dict[str, Any]:
+        return await self.client.request("POST", "/api/dashboards/db", json=payload)
+
+    async def async_delete_dashboard(self, uid: str) -> dict[str, Any]:
+        return await self.client.request("DELETE", f"/api/dashboards/uid/{uid}")
+
+
+class AsyncDatasource(_AsyncElement):
+    """Datasource endpoints"""
+
+    async def async_get_all_datasources(self) -> list[dict[str, Any]]:
+        return await self.client.request("GET", "/api/datasources")
+
+    async def async_create_datasource(self, datasource: dict[str, Any]) -> dict[str, Any]:
+        return await self.client.request("POST", "/api/datasources", json=datasource)
+
+    async def async_update_datasource(
+        self, uid: str, datasource: dict[str, Any]
+    ) -> dict[str, Any]:
+        return await self.client.request("PUT", f"/api/datasources/uid/{uid}", json=datasource)
+
+
+class AsyncFolder(_AsyncElement):
+    """Folder endpoints"""
+
+    async def async_get_all_folders(self) -> list[dict[str, Any]]:
+        return await self.client.request("GET", "/api/folders", params={"limit": 1000})
+
+    async def async_create_folder(self, title: str, uid: Optional[str] = None) -> dict[str, Any]:
+        payload = {"title": title}
+        if uid:
+            payload["uid"] = uid
+        return await self.client.request("POST", "/api/folders", json=payload)
+
+
+class AsyncSearch(_AsyncElement):
+    """Search endpoint"""
+
+    async def async_search_dashboards(
+        self,
+        query: str = "",
+        limit: Optional[int] = None,
+        page: Optional[int] = None,
+    ) -> list[dict[str, Any]]:
+        params: dict[str, Any] = {"type": "dash-db"}
+        if query:
+            params["query"] = query
+        if limit is not None:
+            params["limit"] = limit
+        if page is not None:
+            params["page"] = page
+        return await self.client.request("GET", "/api/search", params=params)
+
+
+class AsyncGrafanaApi:
+    """Async counterpart of ``GrafanaApi`` returned by ``GrafanaClient.get_async_client``"""
+
+    def __init__(self, client: "GrafanaClient"):
+        self.client = client
+        self.alerting = AsyncAlerting(client)
+        self.dashboard = AsyncDashboard(client)
+        self.datasource = AsyncDatasource(client)
+        self.folder = AsyncFolder(client)
+        self.search = AsyncSearch(client)
@@ -0,0 +1,184 @@
+"""
+Indexed, random-access backup archive (``.gfba``).
+
+Layout::
+
+    b"GFBA1\\n"
+    <record bytes> ...            compact JSON, one object per record
+    <index>                       JSON: header, records_sha256 and
+                                  [{kind, uid, title, offset, length, sha256}]
+    <footer>                      struct "<QQ8s": index offset, index length, b"GFBAIDX1"
+
+The footer is read first, then only the index, so listing an archive never
+touches the records. ``BackupArchive`` memory-maps the file and slices out a
+single record by uid, so extracting one dashboard from a multi-hundred-MB
+backup parses only that dashboard.
+
+``records_sha256`` covers every byte before the index (magic and records),
+so a copied archive can be verified without the backup index.
+"""
+
+import hashlib
+import json
+import mmap
+import struct
+from pathlib import Path
+from typing import Any, Optional
+
+from app.core.grafana.backup_writer import NDJSONBackupWriter
+
+ARCHIVE_SUFFIX = ".gfba"
+ARCHIVE_MAGIC = b"GFBA1\n"
+INDEX_MAGIC = b"GFBAIDX1"
+_FOOTER = struct.Struct("<QQ8s")
+
+
+def record_uid(kind: str, data: Any) -> Optional[str]:
+    """uid of a backup record (dashboards keep it inside the model)"""
+    if kind == "dashboard":
+        return (data.get("dashboard") or {}).get("uid")
+    return data.get("uid")
+
+
+def _record_title(kind: str, data: Any) -> Optional[str]:
+    if kind == "dashboard":
+        return (data.get("dashboard") or {}).get("title")
+    return data.get("title") or data.get("name")
+
+
+class ArchiveWriter(NDJSONBackupWriter):
+    """Writes records back to back and appends the index on commit.
+
+    ``header`` records are kept in the index instead of the record area.
+    """
+
+    def __init__(self, path: Path):
+        super().__init__(path)
+        self.header: dict[str, Any] = {}
+        self.entries: list[dict[str, Any]] = []
+        self._offset = 0
+
+    def __enter__(self) -> "ArchiveWriter":
+        super().__enter__()
+        self._emit(ARCHIVE_MAGIC)
+        self._offset = len(ARCHIVE_MAGIC)
+        return self
+
+    def write(self, kind: str, data: Any) -> None:
+        if kind == "header":
+            self.header = dict(data)
+            return
+        record = json.dumps(data, separators=(",", ":")).encode("utf-8")
+        self._emit(record)
+        self.entries.append(
+            {
+                "kind": kind,
+                "uid": record_uid(kind, data),
+                "title": _record_title(kind, data),
+                "offset": self._offset,
+                "length": len(record),
+                "sha256": hashlib.sha256(record).hexdigest(),
+            }
+        )
+        self._offset += len(record)
+        self.records += 1
+        self.counts[kind] += 1
+
+    def commit(self) -> Path:
+        index = json.dumps(
+            {"header": self.header, "records_sha256": self.checksum, "entries": self.entries},
+            separators=(",", ":"),
+        ).encode("utf-8")
+        self._emit(index)
+        self._emit(_FOOTER.pack(self._offset, len(index), INDEX_MAGIC))
+        return super().commit()
+
+
+class BackupArchive:
+    """Read-only, memory-mapped view of a ``.gfba`` archive"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"{self.path} is not a backup archive (empty file)")
+        try:
+            self.header, self.entries = self._read_index()
+        except ValueError:
+            self.close()
+            raise
+        self._by_uid = {(e["kind"], e["uid"]): e for e in self.entries}
+
+    def _read_index(self) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+        if (
+            len(self._mm) < len(ARCHIVE_MAGIC) + _FOOTER.size
+            or self._mm[:len(ARCHIVE_MAGIC)] != ARCHIVE_MAGIC
+        ):
+            raise ValueError(f"{self.path} is not a backup archive")
+        index_offset, index_length, magic = _FOOTER.unpack_from(
+            self._mm, len(self._mm) - _FOOTER.size
+        )
+        if magic != INDEX_MAGIC:
+            raise ValueError(f"{self.path} has no index footer (incomplete archive?)")
+        index = json.loads(self._mm[index_offset:index_offset + index_length])
+        self.index_offset = index_offset
+        # Absent in archives written before it was recorded
+        self.records_sha256: Optional[str] = index.get("records_sha256")
+        return index["header"], index["entries"]
+
+    def __enter__(self) -> "BackupArchive":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._mm.close()
+        self._file.close()
+
+    def list(self, kind: Optional[str] = None) -> list[dict[str, Any]]:
+        """Index entries (kind, uid, title, offset, length), optionally for one kind"""
+        return [e for e in self.entries if kind is None or e["kind"] == kind]
+
+    def raw(self, kind: str, uid: str) -> bytes:
+        """Serialized record bytes, without parsing"""
+        entry = self._by_uid.get((kind, uid))
+        if entry is None:
+            raise KeyError(f"{kind} {uid} not in {self.path.name}")
+        return self.read(entry)
+
+    def read(self, entry: dict[str, Any]) -> bytes:
+        """Record bytes for an index entry returned by ``list``"""
+        return self._mm[entry["offset"]:entry["offset"] + entry["length"]]
+
+    def span(self, start: int, end: int) -> bytes:
+        """Raw archive bytes in ``[start, end)``"""
+        return self._mm[start:end]
+
+    def __len__(self) -> int:
+        return len(self._mm)
+
+    def get(self, kind: str, uid: str) -> Any:
+        """Parse and return a single record"""
+        return json.loads(self.raw(kind, uid))
+
+    def __contains__(self, key: tuple[str, str]) -> bool:
+        return key in self._by_uid
+
+
+def json_diff(old: Any, new: Any, path: str = "") -> dict[str, tuple[Any, Any]]:
+    """Changed leaves between two JSON documents, keyed by dotted path"""
+    if isinstance(old, dict) and isinstance(new, dict):
+        changes = {}
+        for key in old.keys() | new.keys():
+            changes.update(json_diff(old.get(key), new.get(key), f"{path}.{key}" if path else key))
+        return changes
+    if isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        changes = {}
+        for i, (a, b) in enumerate(zip(old, new)):
+            changes.update(json_diff(a, b, f"{path}[{i}]"))
+        return changes
+    return {} if old == new else {path: (old, new)}
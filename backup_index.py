@@ -0,0 +1,261 @@
+"""
+Manifest index of the backups in a backup directory.
+
+``<backup_dir>/index.ndjson`` holds one line per backup (relative path,
+timestamp, format, size, per-kind object counts and SHA-256), appended when
+the backup is committed. Listing backups therefore reads one short line per
+entry instead of opening multi-MB backup files.
+
+Backups the index does not list yet (older directories, external copies)
+are picked up by ``reconcile``, which appends them like any writer does, so
+it cannot drop an entry appended concurrently. Files whose names do not
+carry a backup timestamp (``grafana_latest.json``) are skipped.
+
+Retention pruning deletes expired backups and rewrites the index in one
+pass, then garbage-collects incremental objects no remaining manifest
+refers to.
+"""
+
+import datetime
+import hashlib
+import json
+import logging
+import os
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+from app.core.grafana.backup_archive import ARCHIVE_SUFFIX
+from app.core.grafana.backup_store import MANIFESTS_DIR, ObjectStore
+from app.core.grafana.backup_writer import COMPRESSED_SUFFIX
+
+INDEX_FILENAME = "index.ndjson"
+TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+_CHUNK_SIZE = 1024 * 1024
+
+logger = logging.getLogger("grafana.backup")
+
+
+@dataclass
+class BackupEntry:
+    """Index record of a single backup"""
+
+    path: str
+    timestamp: str
+    format: str
+    size: int
+    checksum: str
+    objects: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def created_at(self) -> datetime.datetime:
+        return datetime.datetime.strptime(self.timestamp, TIMESTAMP_FORMAT)
+
+
+def backup_format(path: Path) -> str:
+    """Format name of a backup file, derived from its name and location"""
+    name = Path(path).name
+    if name.endswith(ARCHIVE_SUFFIX):
+        return "archive"
+    if name.endswith(".ndjson" + COMPRESSED_SUFFIX):
+        return "ndjson.gz"
+    if name.endswith(".ndjson"):
+        return "ndjson"
+    if Path(path).parent.name == MANIFESTS_DIR:
+        return "manifest"
+    return "json"
+
+
+def file_checksum(path: Path) -> str:
+    """SHA-256 of a file, read in fixed-size chunks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class BackupIndex:
+    """Append-only index of backups, rewritten atomically on prune"""
+
+    def __init__(self, backup_dir: Path):
+        self.backup_dir = Path(backup_dir)
+        self.path = self.backup_dir / INDEX_FILENAME
+
+    def add(
+        self,
+        backup_path: Path,
+        timestamp: str,
+        objects: dict[str, int],
+        checksum: Optional[str] = None,
+        size: Optional[int] = None,
+    ) -> BackupEntry:
+        """Record a committed backup; checksum and size are computed if not given"""
+        backup_path = Path(backup_path)
+        entry = BackupEntry(
+            path=backup_path.relative_to(self.backup_dir).as_posix(),
+            timestamp=timestamp,
+            format=backup_format(backup_path),
+            size=backup_path.stat().st_size if size is None else size,
+            checksum=checksum or file_checksum(backup_path),
+            objects=dict(objects),
+        )
+        self.backup_dir.mkdir(parents=True, exist_ok=True)
+        self._append([entry])
+        return entry
+
+    def _append(self, entries: list[BackupEntry]) -> None:
+        with open(self.path, "a") as f:
+            f.write(
+                "".join(json.dumps(asdict(e), separators=(",", ":")) + "\n" for e in entries)
+            )
+            f.flush()
+            os.fsync(f.fileno())
+
+    def __iter__(self) -> Iterator[BackupEntry]:
+        if not self.path.exists():
+            return
+        seen: set[str] = set()
+        with open(self.path) as f:
+            for line in f:
+                if line.strip():
+                    entry = BackupEntry(**json.loads(line))
+                    # A backup reconciled before its writer recorded it is listed twice
+                    if entry.path not in seen:
+                        seen.add(entry.path)
+                        yield entry
+
+    def entries(
+        self,
+        start: Optional[datetime.datetime] = None,
+        end: Optional[datetime.datetime] = None,
+    ) -> Iterator[BackupEntry]:
+        """Entries created within ``[start, end)``, in the order they were added"""
+        for entry in self:
+            created_at = entry.created_at
+            if start is not None and created_at < start:
+                continue
+            if end is not None and created_at >= end:
+                continue
+            yield entry
+
+    def rewrite(self, entries: list[BackupEntry]) -> None:
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            for entry in entries:
+                f.write(json.dumps(asdict(entry), separators=(",", ":")) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def rebuild(self) -> list[BackupEntry]:
+        """Recreate the index from the backups on disk (for directories that predate it)"""
+        entries = [self._entry_for(path) for path in self._backups_on_disk()]
+        self.backup_dir.mkdir(parents=True, exist_ok=True)
+        self.rewrite(entries)
+        return entries
+
+    def reconcile(self) -> list[BackupEntry]:
+        """Index backups on disk that the index does not list yet; return the new entries.
+
+        Covers backups written before the index existed or by writers that do
+        not record themselves. Only unlisted files are hashed, and they are
+        appended rather than rewriting the index.
+        """
+        if not self.backup_dir.exists():
+            return []
+        indexed = {entry.path for entry in self}
+        added = [
+            self._entry_for(path)
+            for path in self._backups_on_disk()
+            if path.relative_to(self.backup_dir).as_posix() not in indexed
+        ]
+        if added:
+            self._append(added)
+        return added
+
+    def _backups_on_disk(self) -> list[Path]:
+        suffixes = (".json", ".ndjson", ".ndjson" + COMPRESSED_SUFFIX, ARCHIVE_SUFFIX)
+        candidates = [p for p in self.backup_dir.glob("grafana_*") if p.name.endswith(suffixes)]
+        candidates += [
+            p for p in (self.backup_dir / MANIFESTS_DIR).glob("grafana_*.json")
+        ]
+        backups = []
+        for path in sorted(candidates, key=lambda p: p.name):
+            try:
+                datetime.datetime.strptime(_timestamp_of(path), TIMESTAMP_FORMAT)
+            except ValueError:
+                logger.warning(f"Not indexing {path}: no backup timestamp in its name")
+                continue
+            backups.append(path)
+        return backups
+
+    def _entry_for(self, path: Path) -> BackupEntry:
+        return BackupEntry(
+            path=path.relative_to(self.backup_dir).as_posix(),
+            timestamp=_timestamp_of(path),
+            format=backup_format(path),
+            size=path.stat().st_size,
+            checksum=file_checksum(path),
+        )
+
+    def prune(
+        self,
+        max_age: Optional[datetime.timedelta] = None,
+        keep_last: int = 0,
+        now: Optional[datetime.datetime] = None,
+    ) -> list[BackupEntry]:
+        """Delete backups older than ``max_age``, always keeping the newest ``keep_last``.
+
+        Returns the removed entries.
+        """
+        if max_age is None:
+            return []
+        cutoff = (now or datetime.datetime.now()) - max_age
+        entries = sorted(self, key=lambda e: e.timestamp)
+        protected = {id(e) for e in entries[-keep_last:]} if keep_last > 0 else set()
+        expired = [e for e in entries if e.created_at < cutoff and id(e) not in protected]
+        if not expired:
+            return []
+
+        expired_ids = {id(e) for e in expired}
+        kept = [e for e in entries if id(e) not in expired_ids]
+        self.rewrite(kept)
+        for entry in expired:
+            (self.backup_dir / entry.path).unlink(missing_ok=True)
+        if any(e.format == "manifest" for e in expired):
+            self.collect_garbage(kept)
+        return expired
+
+    def collect_garbage(self, kept: Optional[list[BackupEntry]] = None) -> int:
+        """Delete incremental objects no indexed manifest refers to; return the count.
+
+        Must not run concurrently with ``async_save_incremental`` on the same
+        directory, whose new objects are not referenced until its manifest lands.
+        """
+        store = ObjectStore(self.backup_dir)
+        referenced: set[str] = set()
+        for entry in kept if kept is not None else list(self):
+            if entry.format != "manifest":
+                continue
+            with open(self.backup_dir / entry.path) as f:
+                manifest: dict[str, Any] = json.load(f)
+            for objects in manifest["objects"].values():
+                referenced.update(o["hash"] for o in objects)
+
+        removed = 0
+        if not store.objects_dir.exists():
+            return removed
+        for shard in store.objects_dir.iterdir():
+            for path in shard.iterdir():
+                if path.suffix != ".tmp" and shard.name + path.name not in referenced:
+                    path.unlink()
+                    removed += 1
+            if not any(shard.iterdir()):
+                shard.rmdir()
+        return removed
+
+
+def _timestamp_of(path: Path) -> str:
+    return path.name.split(".", 1)[0].removeprefix("grafana_")
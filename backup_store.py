@@ -0,0 +1,148 @@
+"""
+Content-addressed object store for incremental Grafana backups.
+
+Every dashboard, datasource and alert rule is serialized canonically
+(sorted keys, compact separators) and stored once under its SHA-256:
+
+    <backup_dir>/objects/ab/cdef0123...
+    <backup_dir>/manifests/grafana_<timestamp>.json
+
+A backup is just a manifest listing ``(uid, hash)`` per object kind, so an
+object that did not change since the previous run costs no bytes and no
+writes - only a read-back to confirm the stored copy is intact.
+"""
+
+import hashlib
+import json
+import os
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, Optional
+
+OBJECTS_DIR = "objects"
+MANIFESTS_DIR = "manifests"
+MANIFEST_FORMAT_VERSION = "3.0"
+
+# Manifest section -> uid lookup for the stored object
+OBJECT_KINDS = {
+    "dashboards": lambda obj: (obj.get("dashboard") or {}).get("uid"),
+    "datasources": lambda obj: obj.get("uid"),
+    "alert_rules": lambda obj: obj.get("uid"),
+}
+
+
+def canonical_bytes(obj: Any) -> bytes:
+    """Stable serialization so equal objects always hash the same"""
+    return json.dumps(obj, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def object_hash(obj: Any) -> str:
+    return hashlib.sha256(canonical_bytes(obj)).hexdigest()
+
+
+class ObjectStore:
+    """Write-once blob store keyed by content hash"""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.objects_dir = self.root / OBJECTS_DIR
+        self.manifests_dir = self.root / MANIFESTS_DIR
+        self.written = 0
+        self.reused = 0
+        self.bytes_written = 0
+
+    def path_for(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest[2:]
+
+    def put(self, obj: Any) -> str:
+        """Store ``obj`` unless an identical object already exists; return its hash"""
+        data = canonical_bytes(obj)
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.path_for(digest)
+        if self._intact(path, data):
+            self.reused += 1
+            return digest
+
+        # A torn or bit-rotted object is rewritten rather than reused forever
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        self.written += 1
+        self.bytes_written += len(data)
+        return digest
+
+    @staticmethod
+    def _intact(path: Path, data: bytes) -> bool:
+        """True if ``path`` already holds exactly ``data``"""
+        try:
+            if path.stat().st_size != len(data):
+                return False
+            with open(path, "rb") as f:
+                return f.read() == data
+        except FileNotFoundError:
+            return False
+
+    def get(self, digest: str) -> Any:
+        with open(self.path_for(digest), "rb") as f:
+            return json.load(f)
+
+    def write_manifest(self, manifest: dict[str, Any]) -> Path:
+        """Atomically write a manifest named after its timestamp"""
+        self.manifests_dir.mkdir(parents=True, exist_ok=True)
+        path = self.manifests_dir / f"grafana_{manifest['timestamp']}.json"
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        return path
+
+    def iter_manifests(self) -> Iterator[Path]:
+        """Manifest paths, oldest first"""
+        if not self.manifests_dir.exists():
+            return iter(())
+        return iter(sorted(self.manifests_dir.glob("grafana_*.json")))
+
+    def materialize(self, manifest_path: Path) -> dict[str, Any]:
+        """Rebuild a full backup (``create_backup`` layout) from a manifest"""
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        backup_data = {"version": manifest["version"], "timestamp": manifest["timestamp"]}
+        for kind in OBJECT_KINDS:
+            backup_data[kind] = [self.get(entry["hash"]) for entry in manifest["objects"][kind]]
+        return backup_data
+
+
+class ManifestBuilder:
+    """Collects ``(uid, hash)`` entries while objects are streamed into the store"""
+
+    def __init__(self, store: ObjectStore, timestamp: str):
+        self.store = store
+        self.timestamp = timestamp
+        self.objects: dict[str, list[dict[str, Optional[str]]]] = {
+            kind: [] for kind in OBJECT_KINDS
+        }
+
+    def add(self, kind: str, obj: Any) -> str:
+        digest = self.store.put(obj)
+        self.objects[kind].append({"uid": OBJECT_KINDS[kind](obj), "hash": digest})
+        return digest
+
+    def manifest(self) -> dict[str, Any]:
+        # Sorted by uid so identical instances produce identical manifests
+        return {
+            "version": MANIFEST_FORMAT_VERSION,
+            "timestamp": self.timestamp,
+            "objects": {
+                kind: sorted(entries, key=lambda e: (e["uid"] or "", e["hash"]))
+                for kind, entries in self.objects.items()
+            },
+        }
+
+    def commit(self) -> Path:
+        return self.store.write_manifest(self.manifest())
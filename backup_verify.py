@@ -0,0 +1,257 @@
+"""
+Streaming, parallel verification of backup checksums.
+
+Every backup carries a whole-file SHA-256 in the backup index, and every
+object a checksum of its own:
+- NDJSON (``.ndjson`` / ``.ndjson.gz``): ``sha256`` of the ``data`` bytes on
+  each line, checked without parsing the record
+- ``.gfba`` archives: ``sha256`` per index entry, checked on memory-mapped
+  slices, plus ``records_sha256`` over the record area, so an archive copied
+  out of its backup directory still verifies on its own
+- Incremental manifests: objects are content-addressed, so an object's path
+  is its checksum
+
+Each file is read once in fixed-size chunks, updating the whole-file hash and
+the per-record hashes in the same pass, so memory stays flat. Backups are
+verified concurrently on a thread pool (hashlib and zlib release the GIL), and
+objects shared by many incremental manifests are only re-hashed once.
+
+Usage:
+    python -m app.core.grafana.backup_verify [BACKUP_DIR] [--days N] [--workers N]
+"""
+
+import argparse
+import datetime
+import gzip
+import hashlib
+import io
+import json
+import os
+import re
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Optional
+
+from app.core.grafana.backup_archive import BackupArchive
+from app.core.grafana.backup_index import BackupIndex, backup_format, file_checksum
+from app.core.grafana.backup_store import ObjectStore
+
+_CHUNK_SIZE = 1024 * 1024
+_RECORD_PREFIX = re.compile(rb'^\{"kind":"[^"]*","sha256":"([0-9a-f]{64})","data":')
+
+
+@dataclass
+class VerifyResult:
+    """Outcome of verifying one backup"""
+
+    path: str
+    checked: int = 0
+    unchecked: int = 0
+    errors: list[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+class _HashingReader(io.RawIOBase):
+    """Raw reader that hashes every byte read from the underlying file"""
+
+    def __init__(self, f: IO[bytes]):
+        self._f = f
+        self.digest = hashlib.sha256()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        n = self._f.readinto(buffer)
+        if n:
+            self.digest.update(memoryview(buffer)[:n])
+        return n
+
+    def drain(self) -> str:
+        """Hash whatever was not consumed yet and return the file digest"""
+        while chunk := self._f.read(_CHUNK_SIZE):
+            self.digest.update(chunk)
+        return self.digest.hexdigest()
+
+
+def verify_ndjson(path: Path, checksum: Optional[str] = None) -> VerifyResult:
+    """Verify every record checksum and the whole-file checksum in one pass"""
+    result = VerifyResult(path=str(path))
+    with open(path, "rb", buffering=0) as f:
+        # The file checksum covers the bytes on disk, before decompression
+        raw = _HashingReader(f)
+        stream: IO[bytes] = io.BufferedReader(raw, buffer_size=_CHUNK_SIZE)
+        if backup_format(path) == "ndjson.gz":
+            stream = gzip.GzipFile(fileobj=stream)
+        try:
+            for line_number, line in enumerate(stream, 1):
+                _verify_line(line, line_number, result)
+        except (OSError, EOFError) as e:
+            result.errors.append(f"unreadable: {e}")
+        file_digest = raw.drain()
+    if checksum and file_digest != checksum:
+        result.errors.append("file checksum mismatch")
+    return result
+
+
+def _verify_line(line: bytes, line_number: int, result: VerifyResult) -> None:
+    if not line.strip():
+        return
+    match = _RECORD_PREFIX.match(line)
+    if match is None:
+        result.unchecked += 1  # written before per-record checksums
+        return
+    payload = line[match.end():].rstrip(b"\n")[:-1]
+    if hashlib.sha256(payload).hexdigest() != match.group(1).decode("ascii"):
+        result.errors.append(f"record checksum mismatch on line {line_number}")
+    else:
+        result.checked += 1
+
+
+def verify_archive(path: Path, checksum: Optional[str] = None) -> VerifyResult:
+    """Verify a ``.gfba`` archive's records, record area and file checksum in one pass.
+
+    Records are walked in offset order and each slice feeds both its own
+    hash and the whole-file hash, so the file is mapped and read once.
+    """
+    result = VerifyResult(path=str(path))
+    try:
+        archive = BackupArchive(path)
+    except ValueError as e:
+        result.errors.append(str(e))
+        return result
+    file_digest = hashlib.sha256()
+    position = 0
+    with archive:
+        for entry in sorted(archive.list(), key=lambda e: e["offset"]):
+            record = archive.read(entry)
+            if "sha256" not in entry:
+                result.unchecked += 1
+            elif hashlib.sha256(record).hexdigest() != entry["sha256"]:
+                result.errors.append(f"record checksum mismatch for {entry['kind']} {entry['uid']}")
+            else:
+                result.checked += 1
+            end = entry["offset"] + len(record)
+            if end > position:
+                if entry["offset"] > position:
+                    file_digest.update(archive.span(position, entry["offset"]))
+                file_digest.update(memoryview(record)[max(0, position - entry["offset"]):])
+                position = end
+        if position < archive.index_offset:
+            file_digest.update(archive.span(position, archive.index_offset))
+            position = archive.index_offset
+        if archive.records_sha256 and (
+            position != archive.index_offset
+            or file_digest.hexdigest() != archive.records_sha256
+        ):
+            result.errors.append("record area checksum mismatch")
+        file_digest.update(archive.span(position, len(archive)))
+    if checksum and file_digest.hexdigest() != checksum:
+        result.errors.append("file checksum mismatch")
+    return result
+
+
+def verify_manifest(path: Path, checksum: Optional[str] = None) -> tuple[VerifyResult, set[str]]:
+    """Check a manifest's own checksum and return the object hashes it references"""
+    result = VerifyResult(path=str(path))
+    if checksum and file_checksum(path) != checksum:
+        result.errors.append("file checksum mismatch")
+        return result, set()
+    with open(path) as f:
+        manifest = json.load(f)
+    hashes = {o["hash"] for objects in manifest["objects"].values() for o in objects}
+    return result, hashes
+
+
+def verify_object(store: ObjectStore, digest: str) -> Optional[str]:
+    """Error message if a stored object is missing or does not match its hash"""
+    path = store.path_for(digest)
+    try:
+        if file_checksum(path) != digest:
+            return f"object {digest} is corrupt"
+    except FileNotFoundError:
+        return f"object {digest} is missing"
+    return None
+
+
+def verify_file(path: Path, checksum: Optional[str] = None) -> VerifyResult:
+    """Verify a single non-incremental backup file"""
+    path = Path(path)
+    if not path.exists():
+        return VerifyResult(path=str(path), errors=["missing"])
+    fmt = backup_format(path)
+    if fmt in ("ndjson", "ndjson.gz"):
+        return verify_ndjson(path, checksum)
+    if fmt == "archive":
+        return verify_archive(path, checksum)
+    result = VerifyResult(path=str(path), unchecked=1)  # legacy JSON: file checksum only
+    if checksum and file_checksum(path) != checksum:
+        result.errors.append("file checksum mismatch")
+    return result
+
+
+def verify_backups(
+    backup_dir: Path,
+    start: Optional[datetime.datetime] = None,
+    end: Optional[datetime.datetime] = None,
+    workers: Optional[int] = None,
+) -> list[VerifyResult]:
+    """Verify every indexed backup created within ``[start, end)`` in parallel"""
+    backup_dir = Path(backup_dir)
+    entries = list(BackupIndex(backup_dir).entries(start, end))
+    workers = workers or min(8, os.cpu_count() or 1)
+    results: list[VerifyResult] = []
+    manifests: list[tuple[VerifyResult, set[str]]] = []
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="grafana-verify") as pool:
+        files = [e for e in entries if e.format != "manifest"]
+        file_results = pool.map(lambda e: verify_file(backup_dir / e.path, e.checksum), files)
+        for entry in (e for e in entries if e.format == "manifest"):
+            path = backup_dir / entry.path
+            if not path.exists():
+                results.append(VerifyResult(path=str(path), errors=["missing"]))
+                continue
+            manifests.append(verify_manifest(path, entry.checksum))
+
+        # Objects are shared between manifests; hash each one once
+        store = ObjectStore(backup_dir)
+        unique = sorted(set().union(*(hashes for _, hashes in manifests)))
+        bad = {
+            digest: error
+            for digest, error in zip(unique, pool.map(lambda d: verify_object(store, d), unique))
+            if error
+        }
+        results.extend(file_results)
+
+    for result, hashes in manifests:
+        result.checked += len(hashes)
+        result.errors.extend(bad[d] for d in sorted(hashes & bad.keys()))
+        result.checked -= len(hashes & bad.keys())
+        results.append(result)
+    return results
+
+
+def _print_results(results: Iterable[VerifyResult]) -> int:
+    failed = 0
+    for result in results:
+        status = "OK" if result.ok else "FAILED"
+        print(f"{status} {result.path} checked={result.checked} unchecked={result.unchecked}")
+        for error in result.errors:
+            print(f"    {error}")
+        failed += not result.ok
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Verify Grafana backup checksums")
+    parser.add_argument("backup_dir", type=Path, nargs="?", default=Path("/backups"))
+    parser.add_argument("--days", type=int, default=None, help="only backups from the last N days")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+    since = datetime.datetime.now() - datetime.timedelta(days=args.days) if args.days else None
+    raise SystemExit(_print_results(verify_backups(args.backup_dir, start=since, workers=args.workers)))
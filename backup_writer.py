@@ -0,0 +1,208 @@
+"""
+Streaming backup file formats for GrafanaBackup.
+
+NDJSON layout: one JSON record per line, ``{"kind": ..., "sha256": ...,
+"data": ...}``, starting with a ``header`` record. ``sha256`` covers the
+serialized ``data`` bytes, which always come last on the line, so a record can
+be verified without parsing it. Records are written as soon as each object
+is fetched, so memory stays flat regardless of instance size. Files are
+written to a temp path and atomically renamed after a single fsync.
+
+Compressed layout (``.ndjson.gz``): the same records, cut into ~1 MiB blocks
+that are gzip-compressed on a thread pool (zlib releases the GIL) and written
+in order as independent gzip members. The result is a standard multi-member
+gzip file, readable with ``gzip.open`` / ``zcat`` and decompressed as a stream.
+
+Writers block on file I/O; async callers drive them through
+``AsyncBackupWriter``, which runs every call on a worker thread.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+from collections import Counter, deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, BinaryIO, Optional
+
+BACKUP_FORMAT_VERSION = "2.0"
+COMPRESSED_SUFFIX = ".gz"
+_WRITE_BUFFER_SIZE = 1024 * 1024
+_COMPRESS_BLOCK_SIZE = 1024 * 1024
+
+
+class NDJSONBackupWriter:
+    """Append-only NDJSON backup writer with atomic commit.
+
+    Use as a context manager: the file is committed (fsync + rename) on a
+    clean exit and the temp file is removed if the block raises.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.tmp_path = self.path.with_name(self.path.name + ".tmp")
+        self.records = 0
+        self.counts: Counter[str] = Counter()
+        self.size = 0
+        self._digest = hashlib.sha256()
+        self._file: Optional[BinaryIO] = None
+
+    def __enter__(self) -> "NDJSONBackupWriter":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.tmp_path, "wb", buffering=_WRITE_BUFFER_SIZE)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> bool:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+        return False
+
+    def write(self, kind: str, data: Any) -> None:
+        """Append one record"""
+        self._write_line(_encode_record(kind, data))
+        self.records += 1
+        self.counts[kind] += 1
+
+    @property
+    def checksum(self) -> str:
+        """SHA-256 of the bytes written so far"""
+        return self._digest.hexdigest()
+
+    def _write_line(self, line: bytes) -> None:
+        self._emit(line)
+
+    def _emit(self, data: bytes) -> None:
+        """Write to the file, keeping the whole-file checksum and size current"""
+        self._file.write(data)
+        self._digest.update(data)
+        self.size += len(data)
+
+    def commit(self) -> Path:
+        """Flush, fsync once and atomically move the file into place"""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        os.replace(self.tmp_path, self.path)
+        return self.path
+
+    def abort(self) -> None:
+        """Discard a partially written backup"""
+        if self._file is not None and not self._file.closed:
+            self._file.close()
+        self.tmp_path.unlink(missing_ok=True)
+
+
+class CompressedBackupWriter(NDJSONBackupWriter):
+    """NDJSON writer that gzip-compresses blocks off the calling thread.
+
+    The caller only serializes records and appends them to the current block;
+    full blocks are compressed by ``workers`` threads while fetching continues.
+    At most ``2 * workers`` blocks are in flight, so memory stays bounded;
+    ``write`` and ``commit`` wait for the oldest block when that limit is hit,
+    so coroutines must go through ``AsyncBackupWriter``.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        workers: Optional[int] = None,
+        level: int = 6,
+        block_size: int = _COMPRESS_BLOCK_SIZE,
+    ):
+        super().__init__(path)
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self.level = level
+        self.block_size = block_size
+        self._block: list[bytes] = []
+        self._block_bytes = 0
+        self._pending: "deque[Future[bytes]]" = deque()
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def __enter__(self) -> "CompressedBackupWriter":
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="grafana-backup-gzip"
+        )
+        return super().__enter__()
+
+    def _write_line(self, line: bytes) -> None:
+        self._block.append(line)
+        self._block_bytes += len(line)
+        if self._block_bytes >= self.block_size:
+            self._submit_block()
+
+    def _submit_block(self) -> None:
+        if not self._block:
+            return
+        data = b"".join(self._block)
+        self._block, self._block_bytes = [], 0
+        self._pending.append(self._pool.submit(gzip.compress, data, self.level, mtime=0))
+        while len(self._pending) > 2 * self.workers:
+            self._emit(self._pending.popleft().result())
+
+    def commit(self) -> Path:
+        self._submit_block()
+        while self._pending:
+            self._emit(self._pending.popleft().result())
+        self._pool.shutdown()
+        return super().commit()
+
+    def abort(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+        self._pending.clear()
+        super().abort()
+
+
+class AsyncBackupWriter:
+    """Drives a backup writer from a coroutine without blocking the event loop.
+
+    Opening, every ``write`` (buffer flushes, compression backpressure) and
+    the commit (fsync + rename) or abort run on a worker thread, one call at
+    a time, so records keep their order.
+    """
+
+    def __init__(self, writer: NDJSONBackupWriter):
+        self.writer = writer
+
+    async def __aenter__(self) -> "AsyncBackupWriter":
+        await asyncio.to_thread(self.writer.__enter__)
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> bool:
+        return await asyncio.to_thread(self.writer.__exit__, exc_type, exc_val, exc_tb)
+
+    async def write(self, kind: str, data: Any) -> None:
+        await asyncio.to_thread(self.writer.write, kind, data)
+
+
+def _encode_record(kind: str, data: Any) -> bytes:
+    payload = json.dumps(data, separators=(",", ":")).encode("utf-8")
+    digest = hashlib.sha256(payload).hexdigest()
+    return b"".join(
+        (
+            b'{"kind":',
+            json.dumps(kind).encode("utf-8"),
+            b',"sha256":"',
+            digest.encode("ascii"),
+            b'","data":',
+            payload,
+            b"}\n",
+        )
+    )
+
+
+def iter_ndjson_records(path: Path) -> Iterator[dict[str, Any]]:
+    """Stream records back from an NDJSON backup, one line at a time.
+
+    ``.gz`` backups are decompressed on the fly.
+    """
+    opener = gzip.open if str(path).endswith(COMPRESSED_SUFFIX) else open
+    with opener(path, "rb") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
@@ -0,0 +1,185 @@
+"""
+Opt-in read cache for Grafana dashboard and search responses.
+
+Responses are cached in the client transport by request URL with:
+- LRU eviction bounded by total body size (``max_bytes``)
+- Per-resource TTLs (``dashboard``, ``search``)
+- Conditional revalidation once an entry goes stale: ``If-None-Match`` /
+  ``If-Modified-Since`` when the server sent validators, otherwise a cheap
+  dashboard version probe
+- Invalidation on any write to the dashboards/folders APIs
+"""
+
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable, Mapping
+from dataclasses import dataclass, field
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+from prometheus_client import Counter, Gauge
+
+CACHE_HITS = Counter(
+    "grafana_client_cache_hits_total",
+    "Read cache hits (including successful revalidations)",
+    ["resource"],
+)
+CACHE_MISSES = Counter(
+    "grafana_client_cache_misses_total",
+    "Read cache misses that required a full fetch",
+    ["resource"],
+)
+CACHE_EVICTIONS = Counter(
+    "grafana_client_cache_evictions_total",
+    "Read cache entries evicted to stay within the size budget",
+    ["resource"],
+)
+CACHE_BYTES = Gauge(
+    "grafana_client_cache_bytes",
+    "Approximate bytes held by the read cache",
+)
+
+_DASHBOARD_PATH = re.compile(r"^/api/dashboards/uid/[^/]+$")
+_SEARCH_PATH = "/api/search"
+# Writes to these endpoint prefixes can change dashboard or search results
+_INVALIDATING_PREFIXES = ("/api/dashboards", "/api/folders")
+_ENTRY_OVERHEAD = 256
+
+
+@dataclass
+class CachedResponse:
+    """Body and metadata of a cached 200 response"""
+
+    resource: str
+    body: bytes
+    headers: dict[str, str]
+    expires_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    version: Optional[int] = None
+    size: int = field(init=False)
+
+    def __post_init__(self):
+        self.size = len(self.body) + sum(len(k) + len(v) for k, v in self.headers.items())
+        self.size += _ENTRY_OVERHEAD
+
+    @property
+    def fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+    def validators(self) -> dict[str, str]:
+        """Conditional request headers for revalidation"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def json(self) -> Any:
+        return json.loads(self.body) if self.body else None
+
+
+class ResponseCache:
+    """Thread-safe TTL + size-bounded LRU cache of GET responses"""
+
+    def __init__(self, max_bytes: int, ttls: Mapping[str, float]):
+        self.max_bytes = max_bytes
+        self.ttls = dict(ttls)
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def resource_for(path: str) -> Optional[str]:
+        """Cacheable resource type of a request path, if any"""
+        path = urlsplit(path).path.rstrip("/")
+        if _DASHBOARD_PATH.match(path):
+            return "dashboard"
+        if path == _SEARCH_PATH:
+            return "search"
+        return None
+
+    def lookup(self, key: Hashable) -> Optional[CachedResponse]:
+        """Return the entry for ``key`` (fresh or stale) and mark it recently used"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def get_fresh(self, key: Hashable) -> Optional[CachedResponse]:
+        """Return a still-fresh entry, counting it as a hit"""
+        entry = self.lookup(key)
+        if entry is None or not entry.fresh:
+            return None
+        CACHE_HITS.labels(entry.resource).inc()
+        return entry
+
+    def store(
+        self,
+        key: Hashable,
+        resource: str,
+        headers: Mapping[str, str],
+        body: bytes,
+    ) -> None:
+        """Cache a full 200 response (counted as a miss)"""
+        CACHE_MISSES.labels(resource).inc()
+        entry = CachedResponse(
+            resource=resource,
+            body=body,
+            headers=dict(headers),
+            expires_at=time.monotonic() + self.ttls.get(resource, 0.0),
+            etag=headers.get("ETag"),
+            last_modified=headers.get("Last-Modified"),
+            version=_dashboard_version(body) if resource == "dashboard" else None,
+        )
+        if entry.size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.size
+            self._entries[key] = entry
+            self._bytes += entry.size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+                CACHE_EVICTIONS.labels(evicted.resource).inc()
+            CACHE_BYTES.set(self._bytes)
+
+    def refresh(self, key: Hashable, entry: CachedResponse) -> None:
+        """Extend a stale entry's TTL after the server confirmed it is unchanged"""
+        CACHE_HITS.labels(entry.resource).inc()
+        with self._lock:
+            entry.expires_at = time.monotonic() + self.ttls.get(entry.resource, 0.0)
+
+    def invalidate(self, resources: tuple[str, ...] = ("dashboard", "search")) -> None:
+        """Drop every entry of the given resource types"""
+        with self._lock:
+            for key in [k for k, e in self._entries.items() if e.resource in resources]:
+                self._bytes -= self._entries.pop(key).size
+            CACHE_BYTES.set(self._bytes)
+
+    def invalidate_for_write(self, path: str) -> None:
+        """Invalidate cached reads a write to ``path`` may have changed"""
+        if urlsplit(path).path.startswith(_INVALIDATING_PREFIXES):
+            self.invalidate()
+
+
+def latest_version(payload: Any) -> Optional[int]:
+    """Newest version from a ``/api/dashboards/uid/<uid>/versions`` response"""
+    versions = payload.get("versions", []) if isinstance(payload, dict) else payload
+    if not versions:
+        return None
+    return versions[0].get("version")
+
+
+def _dashboard_version(body: bytes) -> Optional[int]:
+    try:
+        return json.loads(body)["dashboard"]["version"]
+    except (ValueError, KeyError, TypeError):
+        return None
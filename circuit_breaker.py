@@ -0,0 +1,150 @@
+"""
+Per-endpoint circuit breakers for the Grafana transport layer.
+
+Breakers are keyed by endpoint family (``search``, ``dashboards``,
+``alerting``, ...) so one unhealthy API fails fast without tripping the
+others. After ``recovery_timeout`` an open breaker lets a limited number of
+probe requests through (half-open); they decide whether it closes again.
+"""
+
+import logging
+import threading
+import time
+
+from prometheus_client import Counter, Gauge
+
+from app.core.grafana.exceptions import GrafanaCircuitOpenError
+
+logger = logging.getLogger("grafana.circuit")
+
+CIRCUIT_STATE = Counter(
+    "grafana_client_circuit_state_changes_total",
+    "Circuit breaker state changes",
+    ["endpoint", "state"],
+)
+CIRCUIT_STATE_GAUGE = Gauge(
+    "grafana_client_circuit_state",
+    "Circuit breaker state per endpoint family (0=closed, 1=half_open, 2=open)",
+    ["endpoint"],
+)
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class EndpointCircuitBreaker:
+    """Consecutive-failure breaker with bounded half-open probing"""
+
+    def __init__(
+        self,
+        endpoint: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 60.0,
+        half_open_max_calls: int = 1,
+    ):
+        self.endpoint = endpoint
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self._lock = threading.Lock()
+        CIRCUIT_STATE_GAUGE.labels(endpoint).set(_STATE_VALUES[CLOSED])
+
+    def before_call(self) -> None:
+        """Admit a request or raise ``GrafanaCircuitOpenError``"""
+        with self._lock:
+            if self.state == OPEN:
+                retry_in = self._opened_at + self.recovery_timeout - time.monotonic()
+                if retry_in > 0:
+                    raise GrafanaCircuitOpenError(self.endpoint, retry_in, context=None)
+                self._transition(HALF_OPEN)
+            if self.state == HALF_OPEN:
+                if self._probes_in_flight >= self.half_open_max_calls:
+                    raise GrafanaCircuitOpenError(
+                        self.endpoint, 0.0, context={"reason": "half_open_probe_in_flight"}
+                    )
+                self._probes_in_flight += 1
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+                self._probe_successes += 1
+                if self._probe_successes >= self.half_open_max_calls:
+                    self._transition(CLOSED)
+            elif self.state == CLOSED:
+                self._failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._transition(OPEN)
+            elif self.state == CLOSED:
+                self._failures += 1
+                if self._failures >= self.failure_threshold:
+                    self._transition(OPEN)
+
+    def release(self) -> None:
+        """Free a probe slot for a call that ended without a verdict (e.g. cancelled)"""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+    def record_response(self, status_code: int) -> None:
+        """Server errors count against the endpoint; any other response proves it healthy"""
+        if status_code >= 500:
+            self.record_failure()
+        else:
+            self.record_success()
+
+    def _transition(self, state: str) -> None:
+        self.state = state
+        self._failures = 0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+        CIRCUIT_STATE.labels(self.endpoint, state).inc()
+        CIRCUIT_STATE_GAUGE.labels(self.endpoint).set(_STATE_VALUES[state])
+        logger.warning(f"Grafana {self.endpoint} circuit is now {state}")
+
+
+class CircuitBreakerRegistry:
+    """Lazily creates one breaker per endpoint family with shared settings"""
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 60.0,
+        half_open_max_calls: int = 1,
+    ):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._breakers: dict[str, EndpointCircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, endpoint: str) -> EndpointCircuitBreaker:
+        breaker = self._breakers.get(endpoint)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.get(endpoint)
+                if breaker is None:
+                    breaker = EndpointCircuitBreaker(
+                        endpoint,
+                        failure_threshold=self.failure_threshold,
+                        recovery_timeout=self.recovery_timeout,
+                        half_open_max_calls=self.half_open_max_calls,
+                    )
+                    self._breakers[endpoint] = breaker
+        return breaker
+
+    def states(self) -> dict[str, str]:
+        """Current state of every known endpoint family"""
+        return {endpoint: breaker.state for endpoint, breaker in self._breakers.items()}
@@ -1,13 +1,19 @@
 # app/core/grafana/client.py
+import copy
 import logging
-from typing import Optional
+import threading
+from typing import Any, Optional
+from urllib.parse import urlsplit
 
+import httpx
 import requests
-from circuitbreaker import circuit
 from grafana_client import GrafanaApi
-from prometheus_client import Counter, Histogram
-from tenacity import RetryCallState, retry, stop_after_attempt, wait_exponential
+from prometheus_client import Histogram
+from tenacity import RetryCallState
 
+from app.core.grafana.async_api import AsyncGrafanaApi
+from app.core.grafana.cache import CachedResponse, ResponseCache, latest_version
+from app.core.grafana.circuit_breaker import CircuitBreakerRegistry
 from app.core.grafana.config import GrafanaConfig
 from app.core.grafana.exceptions import (
     ErrorDetail,  # Add this import
@@ -19,6 +25,9 @@ from app.core.grafana.exceptions import (
     GrafanaRateLimitError,
     GrafanaValidationError,
 )
+from app.core.grafana.rate_limit import AdaptiveTokenBucket, retry_after_seconds
+from app.core.grafana.retry_policy import attempt_timeout, grafana_retry
+from app.core.grafana.single_flight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
@@ -28,11 +37,6 @@ REQUEST_LATENCY = Histogram(
     "Grafana API request latency",
     ["method", "endpoint"],
 )
-CIRCUIT_STATE = Counter(
-    "grafana_client_circuit_state_changes_total",
-    "Circuit breaker state changes",
-    ["state"],
-)
 
 
 class GrafanaClient:
@@ -40,33 +44,67 @@ class GrafanaClient:
         """Initialize a production-ready Grafana client"""
         self.config = config or GrafanaConfig()
         self._session = None  # For connection pooling
-        self._circuit_state = "closed"
+        self.rate_limiter = AdaptiveTokenBucket(
+            rate=self.config.RATE_LIMIT_PER_SECOND,
+            capacity=self.config.RATE_LIMIT_BURST,
+        )
+        self._lock = threading.RLock()
+        self._api_entry: Optional[tuple[tuple, GrafanaApi]] = None  # (fingerprint, api)
+        self._async_session: Optional[httpx.AsyncClient] = None
+        self._async_api: Optional[AsyncGrafanaApi] = None
+        self.single_flight = SingleFlight()
+        self.read_cache: Optional[ResponseCache] = (
+            ResponseCache(self.config.READ_CACHE_MAX_BYTES, self.config.READ_CACHE_TTLS)
+            if self.config.READ_CACHE_ENABLED
+            else None
+        )
+        self.circuit_breakers = CircuitBreakerRegistry(
+            failure_threshold=self.config.CIRCUIT_BREAKER_CONFIG["failure_threshold"],
+            recovery_timeout=self.config.CIRCUIT_BREAKER_CONFIG["recovery_timeout"],
+            half_open_max_calls=self.config.CIRCUIT_BREAKER_CONFIG.get("half_open_max_calls", 1),
+        )
 
     @property
     def session(self) -> requests.Session:
         """Reusable connection session with pooling"""
-        if self._session is None:
-            self._session = self._create_session()
-        return self._session
-
-    @circuit(
-        failure_threshold=5,
-        recovery_timeout=60,
-        expected_exception=(
-            GrafanaConnectionError,
-            GrafanaRateLimitError,
-     
-        )
-    )
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10),
+        session = self._session
+        if session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._create_session()
+                session = self._session
+        return session
+
+    def get_client(self) -> GrafanaApi:
+        """Get the long-lived Grafana client, building it on first use.
+
+        The handle is rebuilt only after ``invalidate_client`` (auth or
+        connection failure) or when the connection-relevant config changes.
+        """
+        fingerprint = self._config_fingerprint()
+        entry = self._api_entry
+        if entry is not None and entry[0] == fingerprint:
+            return entry[1]
+        with self._lock:
+            entry = self._api_entry
+            if entry is None or entry[0] != fingerprint:
+                entry = (fingerprint, self._build_client())
+                self._api_entry = entry
+            return entry[1]
+
+    def invalidate_client(self) -> None:
+        """Drop the cached Grafana client so the next call rebuilds it"""
+        self._api_entry = None
+
+    @grafana_retry(
+        "read",
+        retry_on=Exception,
         before_sleep=lambda retry_state: retry_state.args[0]._log_retry_attempt(
             retry_state
         ),
     )
-    def get_client(self) -> GrafanaApi:
-        """Get a production-ready Grafana client with proper error handling"""
+    def _build_client(self) -> GrafanaApi:
+        """Build a production-ready Grafana client with proper error handling"""
         with REQUEST_LATENCY.labels("connect", "grafana").time():
             try:
                 client = GrafanaApi.from_url(
@@ -75,7 +113,7 @@ class GrafanaClient:
                     timeout=(self.config.CONNECT_TIMEOUT, self.config.READ_TIMEOUT),
                     **self.config.SSL_CONFIG,
                 )
-                client.session = self.session
+                client.client.s = self.session  # route API calls through the paced pool
                 return client
             except requests.exceptions.ConnectionError as e:
                 raise GrafanaConnectionError(
@@ -84,55 +122,7 @@ class GrafanaClient:
                     context={"error": str(e)},
                 )
             except requests.exceptions.HTTPError as http_error:
-                status_code = http_error.response.status_code
-                error_context = {"error": str(http_error)}
-                
-                if status_code == 401:
-                    error = GrafanaAuthError(
-                        message="Invalid Grafana credentials",
-                        status_code=401,
-                        context=error_context
-                    )
-                elif status_code == 404:
-                    error = GrafanaNotFoundError(
-                        message="Grafana resource not found",
-                        resource_type="endpoint",
-                        resource_id=self.config.SERVICE_URL,
-                        context=error_context
-                    )
-                elif status_code == 409:
-                    error = GrafanaConflictError(
-                        message="Grafana resource conflict",
-                        resource_type="endpoint",
-                        conflict_reason=str(http_error),
-                        context=error_context
-                    )
-                elif status_code == 422:
-                    error = GrafanaValidationError(
-                        message="Invalid Grafana request",
-                        validation_errors=http_error.response.json().get("errors", {}),
-                        context=error_context
-                    )
-                elif status_code == 429:
-                    error = GrafanaRateLimitError(
-                        message="Grafana rate limit exceeded",
-                        limit=http_error.response.headers.get("X-RateLimit-Limit", 0),
-                        remaining=http_error.response.headers.get("X-RateLimit-Remaining", 0),
-                        reset_time=http_error.response.headers.get("X-RateLimit-Reset", ""),
-                        context=error_context
-                    )
-                else:
-                    error = GrafanaError(
-                        ErrorDetail(
-                            code="grafana_http_error",
-                            message=f"Grafana HTTP error: {str(http_error)}",
-                            context={
-                                "status_code": status_code,
-                                "url": self.config.SERVICE_URL
-                            }
-                        )
-                    )
-                
+                error = self._map_http_error(http_error.response, http_error)
                 error.log_error()
                 raise error
             except Exception as e:
@@ -146,9 +136,244 @@ class GrafanaClient:
                 error.log_error()
                 raise error
 
-    async def get_async_client(self):
-        """Stub async client for testing (mocked in tests)"""
-        pass
+    @property
+    def async_session(self) -> httpx.AsyncClient:
+        """Shared asyncio connection pool, created on first use"""
+        if self._async_session is None or self._async_session.is_closed:
+            self._async_session = self._create_async_session()
+        return self._async_session
+
+    async def get_async_client(self) -> AsyncGrafanaApi:
+        """Get the asyncio Grafana client backed by the shared connection pool"""
+        if self._async_api is None:
+            self._async_api = AsyncGrafanaApi(self)
+        return self._async_api
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        json: Any = None,
+        params: Optional[dict[str, Any]] = None,
+    ) -> Any:
+        """Issue an async API request and map failures to Grafana exceptions.
+
+        Identical concurrent GETs share one upstream round-trip, and cacheable
+        reads are served from ``read_cache`` when it is enabled.
+        """
+        cache = self.read_cache
+        try:
+            if method.upper() == "GET":
+                key = (path, _params_key(params))
+                entry = cache.get_fresh(key) if cache is not None else None
+                if entry is not None:
+                    return entry.json()
+                response = await self.single_flight.do_async(
+                    key, lambda: self._fetch_async(key, path, params)
+                )
+            else:
+                try:
+                    response = await self._send_async(method, path, json=json, params=params)
+                finally:
+                    if cache is not None:
+                        cache.invalidate_for_write(path)
+            response.raise_for_status()
+        except Exception as e:
+            raise self._request_error(e, path)
+
+        if not response.content:
+            return None
+        return response.json()
+
+    async def request_conditional(
+        self,
+        path: str,
+        *,
+        params: Optional[dict[str, Any]] = None,
+        validators: Optional[dict[str, str]] = None,
+    ) -> httpx.Response:
+        """GET ``path`` with conditional headers, bypassing the read cache.
+
+        Returns the raw response so the caller can tell ``304 Not Modified``
+        from new content and keep the ``ETag`` / ``Last-Modified`` validators.
+        """
+        try:
+            response = await self._send_async("GET", path, params=params, headers=validators or None)
+            if response.status_code != 304:
+                response.raise_for_status()
+        except Exception as e:
+            raise self._request_error(e, path)
+        return response
+
+    def _request_error(self, e: Exception, path: str) -> GrafanaError:
+        """Grafana exception (already logged) for a failed async request"""
+        if isinstance(e, GrafanaError):
+            return e
+        if isinstance(e, httpx.HTTPStatusError):
+            error = self._map_http_error(e.response, e)
+        else:
+            error = GrafanaError(
+                ErrorDetail(
+                    code="grafana_client_error",
+                    message=f"Unexpected Grafana error: {str(e)}",
+                    context={"url": self.config.SERVICE_URL, "path": path, "error": str(e)},
+                )
+            )
+        error.log_error()
+        return error
+
+    async def _fetch_async(
+        self, key: tuple, path: str, params: Optional[dict[str, Any]]
+    ) -> httpx.Response:
+        """GET ``path``, revalidating and filling the read cache for cacheable resources"""
+        cache = self.read_cache
+        resource = cache.resource_for(path) if cache is not None else None
+        if resource is None:
+            return await self._send_async("GET", path, params=params)
+
+        entry = cache.lookup(key)
+        headers = entry.validators() if entry is not None else None
+        if entry is not None and not headers and entry.version is not None:
+            probe = await self._send_async("GET", f"{path}/versions", params={"limit": 1})
+            if probe.status_code == 200 and latest_version(probe.json()) == entry.version:
+                cache.refresh(key, entry)
+                return _cached_httpx_response(entry, path)
+
+        response = await self._send_async("GET", path, params=params, headers=headers)
+        if response.status_code == 304 and entry is not None:
+            cache.refresh(key, entry)
+            return _cached_httpx_response(entry, path)
+        if response.status_code == 200:
+            cache.store(key, resource, response.headers, response.content)
+        return response
+
+    async def _send_async(
+        self,
+        method: str,
+        path: str,
+        *,
+        json: Any = None,
+        params: Optional[dict[str, Any]] = None,
+        headers: Optional[dict[str, str]] = None,
+    ) -> httpx.Response:
+        """Send one request through the rate limiter and endpoint circuit breaker"""
+        endpoint = _endpoint_family(path)
+        # Fails fast once the retry budget is spent, before taking a breaker slot or token
+        timeout = httpx.Timeout(
+            attempt_timeout(self.config.READ_TIMEOUT),
+            connect=attempt_timeout(self.config.CONNECT_TIMEOUT),
+        )
+        breaker = self.circuit_breakers.get(endpoint)
+        # Check the breaker first so an open circuit does not spend a rate-limit token
+        breaker.before_call()
+        try:
+            await self.rate_limiter.async_acquire()
+        except BaseException:
+            breaker.release()
+            raise
+        with REQUEST_LATENCY.labels(method, endpoint).time():
+            try:
+                response = await self.async_session.request(
+                    method,
+                    path,
+                    json=json,
+                    params=params,
+                    headers=headers,
+                    timeout=timeout,
+                )
+            except httpx.TransportError as e:
+                breaker.record_failure()
+                raise GrafanaConnectionError(
+                    message="Failed to connect to Grafana",
+                    url=self.config.SERVICE_URL,
+                    context={"error": str(e), "path": path},
+                )
+            except BaseException:
+                breaker.release()
+                raise
+        breaker.record_response(response.status_code)
+        self._observe_rate_limit(response)
+        return response
+
+    async def aclose(self) -> None:
+        """Close the async connection pool"""
+        if self._async_session is not None:
+            await self._async_session.aclose()
+            self._async_session = None
+
+    def _create_async_session(self) -> httpx.AsyncClient:
+        """Configure a pooled httpx client sized from the requests pool settings"""
+        transport = httpx.AsyncHTTPTransport(
+            verify=self.config.SSL_CONFIG.get("verify", True),
+            retries=self.config.MAX_RETRIES,
+            limits=httpx.Limits(
+                max_connections=self.config.POOL_MAXSIZE,
+                max_keepalive_connections=self.config.POOL_CONNECTIONS,
+            ),
+        )
+        return httpx.AsyncClient(
+            base_url=self.config.SERVICE_URL,
+            headers={
+                "Authorization": f"Bearer {self.config.API_KEY}",
+                "Accept": "application/json",
+            },
+            timeout=httpx.Timeout(
+                self.config.READ_TIMEOUT, connect=self.config.CONNECT_TIMEOUT
+            ),
+            transport=transport,
+        )
+
+    def _map_http_error(self, response: Any, http_error: Exception) -> GrafanaError:
+        """Translate an HTTP error response (requests or httpx) into a GrafanaError"""
+        status_code = response.status_code
+        error_context = {"error": str(http_error)}
+
+        if status_code == 401:
+            return GrafanaAuthError(
+                message="Invalid Grafana credentials",
+                status_code=401,
+                context=error_context
+            )
+        if status_code == 404:
+            return GrafanaNotFoundError(
+                resource_type="endpoint",
+                resource_id=str(response.url),
+                context=error_context
+            )
+        if status_code == 409:
+            return GrafanaConflictError(
+                resource_type="endpoint",
+                conflict_reason=str(http_error),
+                context=error_context
+            )
+        if status_code == 422:
+            return GrafanaValidationError(
+                message="Invalid Grafana request",
+                validation_errors=response.json().get("errors", {}),
+                context=error_context
+            )
+        if status_code == 429:
+            return GrafanaRateLimitError(
+                message="Grafana rate limit exceeded",
+                limit=response.headers.get("X-RateLimit-Limit", 0),
+                remaining=response.headers.get("X-RateLimit-Remaining", 0),
+                reset_time=response.headers.get("X-RateLimit-Reset", ""),
+                context={
+                    **error_context,
+                    "retry_after": retry_after_seconds(response.headers),
+                },
+            )
+        return GrafanaError(
+            ErrorDetail(
+                code="grafana_http_error",
+                message=f"Grafana HTTP error: {str(http_error)}",
+                context={
+                    "status_code": status_code,
+                    "url": self.config.SERVICE_URL
+                }
+            )
+        )
 
     def _create_session(self) -> requests.Session:
         """Configure a production-ready requests session"""
@@ -158,7 +383,8 @@ class GrafanaClient:
         session.verify = self.config.SSL_CONFIG.get("verify", True)
 
         # Connection pooling
-        adapter = requests.adapters.HTTPAdapter(
+        adapter = _GrafanaHTTPAdapter(
+            self,
             pool_connections=self.config.POOL_CONNECTIONS,
             pool_maxsize=self.config.POOL_MAXSIZE,
             max_retries=self.config.MAX_RETRIES,
@@ -168,6 +394,22 @@ class GrafanaClient:
 
         return session
 
+    def _observe_rate_limit(self, response: Any) -> None:
+        """Feed rate limit headers (and 429s) back into the shared token bucket"""
+        self.rate_limiter.update_from_headers(response.headers)
+        if response.status_code == 429:
+            self.rate_limiter.pause(retry_after_seconds(response.headers) or 1.0)
+
+    def _config_fingerprint(self) -> tuple:
+        """Connection-relevant config values; a change forces a client rebuild"""
+        return (
+            self.config.SERVICE_URL,
+            self.config.API_KEY,
+            self.config.CONNECT_TIMEOUT,
+            self.config.READ_TIMEOUT,
+            tuple(sorted(self.config.SSL_CONFIG.items())),
+        )
+
     def _log_retry_attempt(self, retry_state: RetryCallState) -> None:
         """Log retry attempts with context"""
         logger.warning(
@@ -184,3 +426,161 @@ class GrafanaClient:
         if self._session:
             self._session.close()
         return False  # Propagate exceptions
+
+    async def __aenter__(self) -> AsyncGrafanaApi:
+        """Enter the async runtime context"""
+        return await self.get_async_client()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> bool:
+        """Exit the async runtime context and release pooled connections"""
+        await self.aclose()
+        return False
+
+
+class _GrafanaHTTPAdapter(requests.adapters.HTTPAdapter):
+    """Pooled adapter that paces requests through the client's token bucket,
+    guards them with per-endpoint circuit breakers and invalidates the cached
+    client on auth/connection failures"""
+
+    def __init__(self, owner: GrafanaClient, **kwargs):
+        self._owner = owner
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        cache = self._owner.read_cache
+        if request.method != "GET" or kwargs.get("stream"):
+            try:
+                return self._send(request, **kwargs)
+            finally:
+                if cache is not None:
+                    cache.invalidate_for_write(request.path_url)
+
+        if cache is not None:
+            entry = cache.get_fresh(request.url)
+            if entry is not None:
+                return _cached_requests_response(entry, request)
+        key = (request.url, tuple(sorted(request.headers.items())))
+        # Followers get their own copy so Session.send can post-process it independently
+        return self._owner.single_flight.do(
+            key, lambda: self._fetch(request, **kwargs), clone=copy.copy
+        )
+
+    def _fetch(self, request, **kwargs):
+        """GET with read-cache revalidation and fill for cacheable resources"""
+        cache = self._owner.read_cache
+        resource = cache.resource_for(request.path_url) if cache is not None else None
+        if resource is None:
+            return self._send(request, **kwargs)
+
+        entry = cache.lookup(request.url)
+        if entry is not None:
+            validators = entry.validators()
+            if validators:
+                request.headers.update(validators)
+            elif entry.version is not None:
+                probe = request.copy()
+                probe.prepare_url(urlsplit(request.url)._replace(query="").geturl() + "/versions", {"limit": 1})
+                probe_response = self._send(probe, **kwargs)
+                if (
+                    probe_response.status_code == 200
+                    and latest_version(probe_response.json()) == entry.version
+                ):
+                    cache.refresh(request.url, entry)
+                    return _cached_requests_response(entry, request)
+
+        response = self._send(request, **kwargs)
+        if response.status_code == 304 and entry is not None:
+            cache.refresh(request.url, entry)
+            return _cached_requests_response(entry, request)
+        if response.status_code == 200:
+            cache.store(request.url, resource, response.headers, response.content)
+        return response
+
+    def _send(self, request, **kwargs):
+        # Fails fast once the retry budget is spent, before taking a breaker slot or token
+        if kwargs.get("timeout") is not None:
+            kwargs["timeout"] = _attempt_timeout(kwargs["timeout"])
+        breaker = self._owner.circuit_breakers.get(_endpoint_family(request.path_url))
+        # Check the breaker first so an open circuit does not spend a rate-limit token
+        breaker.before_call()
+        try:
+            self._owner.rate_limiter.acquire()
+        except BaseException:
+            breaker.release()
+            raise
+        try:
+            response = super().send(request, **kwargs)
+        except requests.exceptions.ConnectionError:
+            breaker.record_failure()
+            self._owner.invalidate_client()
+            raise
+        except requests.exceptions.Timeout:
+            breaker.record_failure()
+            raise
+        except BaseException:
+            breaker.release()
+            raise
+        breaker.record_response(response.status_code)
+        self._owner._observe_rate_limit(response)
+        if response.status_code == 401:
+            self._owner.invalidate_client()
+        elif response.status_code == 429:
+            # Surface as GrafanaRateLimitError so the retry policy can honor Retry-After
+            raise self._owner._map_http_error(
+                response, requests.exceptions.HTTPError("429 Too Many Requests", response=response)
+            )
+        response.content  # Load the body before the response is shared with followers
+        return response
+
+
+def _params_key(params: Optional[dict[str, Any]]) -> tuple:
+    """Hashable, order-independent query params; repeated params (``tag=[...]``) become tuples"""
+    return tuple(
+        sorted(
+            (name, tuple(value) if isinstance(value, list) else value)
+            for name, value in (params or {}).items()
+        )
+    )
+
+
+def _attempt_timeout(timeout: Any) -> Any:
+    """``requests`` timeout (seconds or ``(connect, read)``) clamped to the retry budget"""
+    if isinstance(timeout, tuple):
+        return tuple(None if t is None else attempt_timeout(t) for t in timeout)
+    return attempt_timeout(timeout)
+
+
+def _cached_requests_response(entry: CachedResponse, request: requests.PreparedRequest) -> requests.Response:
+    """Rebuild a ``requests`` response from a cache entry"""
+    response = requests.Response()
+    response.status_code = 200
+    response.reason = "OK"
+    response._content = entry.body
+    response.headers = requests.structures.CaseInsensitiveDict(entry.headers)
+    response.url = request.url
+    response.request = request
+    return response
+
+
+def _cached_httpx_response(entry: CachedResponse, path: str) -> httpx.Response:
+    """Rebuild an ``httpx`` response from a cache entry"""
+    return httpx.Response(
+        200,
+        headers=entry.headers,
+        content=entry.body,
+        request=httpx.Request("GET", path),
+    )
+
+
+def _endpoint_family(path: str) -> str:
+    """Collapse an API path into a low-cardinality endpoint label"""
+    parts = [part for part in urlsplit(path).path.split("/") if part]
+    if parts and parts[0] == "api":
+        parts = parts[1:]
+    if parts and parts[0] == "v1":
+        parts = parts[1:]
+    if not parts:
+        return "root"
+    if parts[0] in ("provisioning", "alertmanager", "ruler", "prometheus", "alerts"):
+        return "alerting"
+    return parts[0]
@@ -0,0 +1,130 @@
+"""
+Concurrency limiting for bulk asyncio operations.
+
+``AdaptiveConcurrencyLimiter`` caps the number of in-flight calls. With
+``adaptive=True`` the cap follows AIMD (as in TCP congestion control): it
+grows by one per "window" of healthy calls and is cut multiplicatively when
+a call overloads Grafana (rate limited, timed out, unreachable) or exceeds
+the latency target. Bulk jobs therefore speed up on an idle instance and back
+off by themselves when it struggles.
+"""
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import Awaitable
+from typing import Callable, Optional, TypeVar
+
+from prometheus_client import Gauge
+
+from app.core.grafana.exceptions import (
+    GrafanaCircuitOpenError,
+    GrafanaConnectionError,
+    GrafanaRateLimitError,
+    GrafanaTimeoutError,
+)
+
+CONCURRENCY_LIMIT = Gauge(
+    "grafana_client_concurrency_limit",
+    "Current concurrency limit of adaptive bulk operations",
+    ["operation"],
+)
+
+T = TypeVar("T")
+
+OVERLOAD_ERRORS = (
+    GrafanaRateLimitError,
+    GrafanaTimeoutError,
+    GrafanaConnectionError,
+    GrafanaCircuitOpenError,
+    asyncio.TimeoutError,
+)
+
+
+def is_overload(error: BaseException) -> bool:
+    """Whether an error signals an overloaded server rather than a bad request"""
+    return isinstance(error, OVERLOAD_ERRORS)
+
+
+class AdaptiveConcurrencyLimiter:
+    """Async concurrency cap, optionally adjusted with AIMD"""
+
+    def __init__(
+        self,
+        limit: int,
+        operation: str = "default",
+        adaptive: bool = False,
+        min_limit: int = 1,
+        max_limit: Optional[int] = None,
+        latency_target: Optional[float] = None,
+        backoff: float = 0.5,
+    ):
+        self.operation = operation
+        self.adaptive = adaptive
+        self.min_limit = min_limit
+        self.max_limit = max_limit or limit
+        self.latency_target = latency_target
+        self.backoff = backoff
+        self._limit = float(max(min_limit, min(limit, self.max_limit)))
+        self._in_flight = 0
+        self._waiters: "deque[asyncio.Future[None]]" = deque()
+        CONCURRENCY_LIMIT.labels(operation).set(self.limit)
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    async def acquire(self) -> None:
+        while self._in_flight >= self.limit:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    self._wake()  # hand the slot we were woken for to the next waiter
+                raise
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        self._in_flight += 1
+
+    def release(self, latency: float = 0.0, overloaded: bool = False) -> None:
+        self._in_flight -= 1
+        if self.adaptive:
+            self._adjust(latency, overloaded)
+        self._wake()
+
+    async def call(self, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run ``fn()`` within the limit, feeding its outcome back into the limiter"""
+        await self.acquire()
+        started = time.monotonic()
+        overloaded = False
+        try:
+            return await fn()
+        except BaseException as e:
+            overloaded = is_overload(e)
+            raise
+        finally:
+            self.release(time.monotonic() - started, overloaded)
+
+    def _adjust(self, latency: float, overloaded: bool) -> None:
+        slow = self.latency_target is not None and latency > self.latency_target
+        if overloaded or slow:
+            self._limit = max(float(self.min_limit), self._limit * self.backoff)
+        else:
+            # +1 per full window of successful calls
+            self._limit = min(float(self.max_limit), self._limit + 1.0 / self._limit)
+        CONCURRENCY_LIMIT.labels(self.operation).set(self.limit)
+
+    def _wake(self) -> None:
+        free = self.limit - self._in_flight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
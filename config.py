@@ -24,9 +24,17 @@ class GrafanaConfig:
         "environment": settings.ENVIRONMENT,  # Changed from settings.global_settings.ENVIRONMENT
     }
     MULTIPROC_DIR: str = "/tmp/prometheus"
+    # Flush interval (seconds) of metrics.enable_buffered_metrics
+    METRICS_FLUSH_INTERVAL = 1.0
+    # Free-text metric labels: "keep", "hash" (short digest) or "drop" (empty value)
+    METRIC_LABEL_POLICY: dict = {
+        "dashboard_title": "drop",
+        "alert_title": "drop",
+    }
     CIRCUIT_BREAKER_CONFIG = {
         "failure_threshold": 5,
         "recovery_timeout": 300,
+        "half_open_max_calls": 1,
         "expected_exception": (requests.exceptions.RequestException,),
     }
 
@@ -35,3 +43,36 @@ class GrafanaConfig:
     MAX_RETRIES = 3
     CONNECT_TIMEOUT = 3.05
     READ_TIMEOUT = 30.0
+
+    # Client-side pacing; re-tuned at runtime from X-RateLimit-* headers
+    RATE_LIMIT_PER_SECOND = 50.0
+    RATE_LIMIT_BURST = 100
+
+    # Retry policy (decorrelated jitter); total budgets come from TimeoutThresholds
+    RETRY_BASE_DELAY = 0.05
+    RETRY_MAX_DELAY = 2.0
+
+    # Opt-in read cache for dashboard/search responses (TTL + size-bounded LRU)
+    READ_CACHE_ENABLED = False
+    READ_CACHE_MAX_BYTES = 64 * 1024 * 1024
+    READ_CACHE_TTLS = {"dashboard": 300.0, "search": 30.0}
+
+    # Concurrent full-model fetches during backups (shares the client rate limiter)
+    BACKUP_CONCURRENCY = 16
+    # Evaluation interval (seconds) for rule groups created by bulk alert provisioning
+    ALERT_RULE_GROUP_INTERVAL = 60
+    # async_bulk_create_alerts concurrency (adaptive mode grows up to the max)
+    ALERT_BULK_CONCURRENCY = 8
+    ALERT_BULK_MAX_CONCURRENCY = 32
+    ALERT_BULK_LATENCY_TARGET = 2.0
+    # watch_alert_states poll interval: shortest while states change, backing off to the max
+    ALERT_WATCH_MIN_INTERVAL = 1.0
+    ALERT_WATCH_MAX_INTERVAL = 30.0
+    # Local alert rule version history (SQLite); writes are committed in batches
+    ALERT_VERSION_DB_PATH = "/tmp/grafana/alert_versions.db"
+    ALERT_VERSION_CACHE_SIZE = 10000
+    ALERT_VERSION_BATCH_SIZE = 500
+
+    # Retention for GrafanaBackup.prune_backups; the newest backups are always kept
+    BACKUP_RETENTION_DAYS = 30
+    BACKUP_RETENTION_KEEP_LAST = 24
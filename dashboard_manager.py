@@ -7,15 +7,18 @@ Production-ready dashboard operations with:
 - Comprehensive logging
 """
 
+import asyncio
 import logging
 from collections.abc import AsyncIterator
+from typing import Any, Optional
 
 from prometheus_client import Counter, Histogram
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+from pydantic import ValidationError
 
 from .client import GrafanaClient
-from .exceptions import GrafanaError, GrafanaRateLimitError, GrafanaTimeoutError
-from .models.index import DashboardMeta, GrafanaDashboard
+from .exceptions import GrafanaError
+from .models.index import DashboardMeta, GrafanaDashboard, TimeoutThresholds
+from .retry_policy import grafana_retry
 
 # Metrics
 DASHBOARD_OPERATIONS = Counter(
@@ -33,20 +36,17 @@ logger = logging.getLogger(__name__)
 
 
 class DashboardManager:
-    def __init__(self, client: GrafanaClient):
+    def __init__(self, client: GrafanaClient, timeout: Optional[TimeoutThresholds] = None):
         """Initialize with configured Grafana client"""
         self.client = client
+        self.timeout = timeout or TimeoutThresholds()
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10),
-        retry=retry_if_exception_type((GrafanaRateLimitError, GrafanaTimeoutError)),
-    )
-    @DASHBOARD_LATENCY.time()
+    @grafana_retry("read")
+    @DASHBOARD_LATENCY.labels("get").time()
     def get_dashboard(self, uid: str) -> GrafanaDashboard:
         """Get dashboard by UID with error handling"""
         try:
-            dashboard = self.client.dashboard.get_dashboard(uid)
+            dashboard = self.client.get_client().dashboard.get_dashboard(uid)
             DASHBOARD_OPERATIONS.labels("get", "success").inc()
             return dashboard
         except GrafanaError as e:
@@ -54,16 +54,14 @@ class DashboardManager:
             logger.error(f"Failed to get dashboard {uid}: {str(e)}")
             raise
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10),
-        retry=retry_if_exception_type((GrafanaRateLimitError, GrafanaTimeoutError)),
-    )
-    @DASHBOARD_LATENCY.time()
+    @grafana_retry("write")
+    @DASHBOARD_LATENCY.labels("create").time()
     def create_dashboard(self, dashboard: GrafanaDashboard) -> DashboardMeta:
         """Create new dashboard with validation"""
         try:
-            dashboard_meta = self.client.create_dashboard(dashboard)
+            dashboard_meta = self.client.get_client().dashboard.update_dashboard(
+                {"dashboard": dashboard.model_dump(by_alias=True), "overwrite": False}
+            )
             DASHBOARD_OPERATIONS.labels("create", "success").inc()
             return dashboard_meta
         except GrafanaError as e:
@@ -71,16 +69,14 @@ class DashboardManager:
             logger.error(f"Failed to create dashboard: {str(e)}")
             raise
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10),
-        retry=retry_if_exception_type((GrafanaRateLimitError, GrafanaTimeoutError)),
-    )
-    @DASHBOARD_LATENCY.time()
+    @grafana_retry("write")
+    @DASHBOARD_LATENCY.labels("update").time()
     def update_dashboard(self, dashboard: GrafanaDashboard) -> DashboardMeta:
         """Update existing dashboard"""
         try:
-            dashboard_meta = self.client.update_dashboard(dashboard)
+            dashboard_meta = self.client.get_client().dashboard.update_dashboard(
+                {"dashboard": dashboard.model_dump(by_alias=True), "overwrite": True}
+            )
             DASHBOARD_OPERATIONS.labels("update", "success").inc()
             return dashboard_meta
         except GrafanaError as e:
@@ -88,33 +84,27 @@ class DashboardManager:
             logger.error(f"Failed to update dashboard: {str(e)}")
             raise
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10),
-        retry=retry_if_exception_type((GrafanaRateLimitError, GrafanaTimeoutError)),
-    )
-    @DASHBOARD_LATENCY.time()
+    @grafana_retry("write")
+    @DASHBOARD_LATENCY.labels("delete").time()
     def delete_dashboard(self, uid: str) -> bool:
         """Delete dashboard by UID"""
         try:
-            result = self.client.delete_dashboard(uid)
+            self.client.get_client().dashboard.delete_dashboard(uid)
             DASHBOARD_OPERATIONS.labels("delete", "success").inc()
-            return result
+            return True
         except GrafanaError as e:
             DASHBOARD_OPERATIONS.labels("delete", "error").inc()
             logger.error(f"Failed to delete dashboard {uid}: {str(e)}")
             raise
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10),
-        retry=retry_if_exception_type((GrafanaRateLimitError, GrafanaTimeoutError)),
-    )
-    @DASHBOARD_LATENCY.time()
+    @grafana_retry("read")
+    @DASHBOARD_LATENCY.labels("search").time()
     def search_dashboards(self, query: str = "") -> list[DashboardMeta]:
         """Search dashboards with query"""
         try:
-            dashboards = self.client.search_dashboards(query)
+            dashboards = self.client.get_client().search.search_dashboards(
+                query=query, type_="dash-db"
+            )
             DASHBOARD_OPERATIONS.labels("search", "success").inc()
             return dashboards
         except GrafanaError as e:
@@ -124,30 +114,155 @@ class DashboardManager:
 
     async def async_get_dashboard(self, uid: str) -> GrafanaDashboard:
         """Async version of get_dashboard"""
-        # Async implementation
-        pass
+        with DASHBOARD_LATENCY.labels("get").time():
+            try:
+                grafana = await self.client.get_async_client()
+                dashboard = await grafana.dashboard.async_get_dashboard(uid)
+                DASHBOARD_OPERATIONS.labels("get", "success").inc()
+                return dashboard
+            except GrafanaError as e:
+                DASHBOARD_OPERATIONS.labels("get", "error").inc()
+                logger.error(f"Failed to get dashboard {uid}: {str(e)}")
+                raise
 
     async def async_create_dashboard(self, dashboard: GrafanaDashboard) -> DashboardMeta:
         """Async version of create_dashboard"""
-        # Async implementation
-        pass
+        with DASHBOARD_LATENCY.labels("create").time():
+            try:
+                grafana = await self.client.get_async_client()
+                dashboard_meta = await grafana.dashboard.async_update_dashboard(
+                    {"dashboard": dashboard.model_dump(by_alias=True), "overwrite": False}
+                )
+                DASHBOARD_OPERATIONS.labels("create", "success").inc()
+                return dashboard_meta
+            except GrafanaError as e:
+                DASHBOARD_OPERATIONS.labels("create", "error").inc()
+                logger.error(f"Failed to create dashboard: {str(e)}")
+                raise
 
     async def async_update_dashboard(self, dashboard: GrafanaDashboard) -> DashboardMeta:
         """Async version of update_dashboard"""
-        # Async implementation
-        pass
+        with DASHBOARD_LATENCY.labels("update").time():
+            try:
+                grafana = await self.client.get_async_client()
+                dashboard_meta = await grafana.dashboard.async_update_dashboard(
+                    {"dashboard": dashboard.model_dump(by_alias=True), "overwrite": True}
+                )
+                DASHBOARD_OPERATIONS.labels("update", "success").inc()
+                return dashboard_meta
+            except GrafanaError as e:
+                DASHBOARD_OPERATIONS.labels("update", "error").inc()
+                logger.error(f"Failed to update dashboard: {str(e)}")
+                raise
 
     async def async_delete_dashboard(self, uid: str) -> bool:
         """Async version of delete_dashboard"""
-        # Async implementation
-        pass
+        with DASHBOARD_LATENCY.labels("delete").time():
+            try:
+                grafana = await self.client.get_async_client()
+                await grafana.dashboard.async_delete_dashboard(uid)
+                DASHBOARD_OPERATIONS.labels("delete", "success").inc()
+                return True
+            except GrafanaError as e:
+                DASHBOARD_OPERATIONS.labels("delete", "error").inc()
+                logger.error(f"Failed to delete dashboard {uid}: {str(e)}")
+                raise
 
     async def async_search_dashboards(self, query: str = "") -> list[DashboardMeta]:
         """Async version of search_dashboards"""
-        # Async implementation
-        pass
+        with DASHBOARD_LATENCY.labels("search").time():
+            try:
+                grafana = await self.client.get_async_client()
+                dashboards = await grafana.search.async_search_dashboards(query)
+                DASHBOARD_OPERATIONS.labels("search", "success").inc()
+                return dashboards
+            except GrafanaError as e:
+                DASHBOARD_OPERATIONS.labels("search", "error").inc()
+                logger.error(f"Failed to search dashboards: {str(e)}")
+                raise
 
-    def list_dashboards(self) -> AsyncIterator[DashboardMeta]:
-        """Stream dashboards with pagination"""
-        # Implementation with pagination
-        pass
+    async def async_push_dashboard(
+        self,
+        model: dict[str, Any],
+        folder_uid: str = "",
+        message: str = "",
+    ) -> dict[str, Any]:
+        """Create or overwrite a dashboard from its raw JSON model (e.g. a provisioning file)"""
+        with DASHBOARD_LATENCY.labels("push").time():
+            try:
+                grafana = await self.client.get_async_client()
+                result = await grafana.dashboard.async_update_dashboard(
+                    {
+                        "dashboard": {**model, "id": None},
+                        "folderUid": folder_uid,
+                        "overwrite": True,
+                        "message": message,
+                    }
+                )
+                DASHBOARD_OPERATIONS.labels("push", "success").inc()
+                return result
+            except GrafanaError as e:
+                DASHBOARD_OPERATIONS.labels("push", "error").inc()
+                logger.error(f"Failed to push dashboard {model.get('uid')}: {str(e)}")
+                raise
+
+    async def list_dashboards(
+        self,
+        query: str = "",
+        page_size: int = 500,
+        prefetch_pages: int = 2,
+    ) -> AsyncIterator[DashboardMeta]:
+        """Stream dashboards with pagination.
+
+        Pages of ``/api/search`` are fetched by a background task that stays up
+        to ``prefetch_pages`` ahead of the consumer, so network time overlaps
+        with processing while memory stays bounded. Hits are parsed into
+        ``DashboardMeta`` lazily as they are yielded; hits that do not validate
+        are skipped.
+        """
+        async for hit in self.iter_search_hits(query, page_size, prefetch_pages):
+            try:
+                yield DashboardMeta.model_validate(hit)
+            except ValidationError as e:
+                DASHBOARD_OPERATIONS.labels("list", "invalid").inc()
+                logger.warning(f"Skipping unparseable dashboard {hit.get('uid')}: {str(e)}")
+
+    async def iter_search_hits(
+        self,
+        query: str = "",
+        page_size: int = 500,
+        prefetch_pages: int = 2,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Raw ``/api/search`` hits, paged and prefetched as in ``list_dashboards``"""
+        grafana = await self.client.get_async_client()
+        pages: asyncio.Queue = asyncio.Queue(maxsize=max(1, prefetch_pages))
+
+        async def fetch_pages() -> None:
+            page = 1
+            try:
+                while True:
+                    with DASHBOARD_LATENCY.labels("list").time():
+                        hits = await grafana.search.async_search_dashboards(
+                            query, limit=page_size, page=page
+                        )
+                    await pages.put(hits or [])
+                    if not hits or len(hits) < page_size:
+                        break
+                    page += 1
+            except Exception as e:
+                await pages.put(e)
+                return
+            await pages.put(None)
+
+        producer = asyncio.create_task(fetch_pages())
+        try:
+            while (hits := await pages.get()) is not None:
+                if isinstance(hits, Exception):
+                    DASHBOARD_OPERATIONS.labels("list", "error").inc()
+                    logger.error(f"Failed to list dashboards: {str(hits)}")
+                    raise hits
+                for hit in hits:
+                    yield hit
+            DASHBOARD_OPERATIONS.labels("list", "success").inc()
+        finally:
+            producer.cancel()
@@ -0,0 +1,240 @@
+"""
+Content-hash diff sync of provisioning dashboards into Grafana.
+
+Replaces the rsync + ``grafana-server`` restart in ``deploy_dashboards.sh``
+for dashboards:
+- Hashes every JSON file under ``provisioning/dashboards/**``
+- Compares against a local state file (path -> hash, uid, pushed version)
+  and one paged listing of remote dashboards; a dashboard whose listed
+  version differs from the one its last push created is pushed again
+- Pushes only new/changed (or remotely missing) dashboards, concurrently
+  with bounded parallelism, into folders named after their directory
+  (same layout as ``foldersFromFilesStructure``)
+
+Deploy time scales with the number of changed dashboards, not the total.
+
+Usage:
+    python -m app.core.grafana.dashboard_sync [--root DIR] [--concurrency N] [--dry-run]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+from app.core.grafana.client import GrafanaClient
+from app.core.grafana.dashboard_manager import DashboardManager
+
+logger = logging.getLogger("grafana.sync")
+
+DEFAULT_ROOT = Path(__file__).parent / "provisioning" / "dashboards"
+STATE_FILENAME = ".dashboard_sync_state.json"
+GENERAL_FOLDER = ""
+
+
+@dataclass
+class LocalDashboard:
+    """A provisioning file and its content hash"""
+
+    relpath: str
+    path: Path
+    content_hash: str
+    folder: str
+
+
+@dataclass
+class SyncReport:
+    """Outcome of a sync run"""
+
+    unchanged: list[str] = field(default_factory=list)
+    pushed: list[str] = field(default_factory=list)
+    failed: dict[str, str] = field(default_factory=dict)
+
+
+class DashboardSyncEngine:
+    def __init__(
+        self,
+        manager: DashboardManager,
+        root: Path = DEFAULT_ROOT,
+        state_path: Optional[Path] = None,
+        max_concurrency: int = 8,
+    ):
+        """Initialize with the dashboard manager and provisioning root"""
+        self.manager = manager
+        self.root = Path(root)
+        self.state_path = Path(state_path) if state_path else self.root / STATE_FILENAME
+        self.max_concurrency = max_concurrency
+
+    def scan(self) -> list[LocalDashboard]:
+        """Hash every dashboard JSON under the root (no parsing needed)"""
+        dashboards = []
+        for path in sorted(self.root.rglob("*.json")):
+            if path.name.startswith("."):
+                continue  # the state file and other hidden files are not dashboards
+            relpath = path.relative_to(self.root).as_posix()
+            parent = path.parent
+            dashboards.append(
+                LocalDashboard(
+                    relpath=relpath,
+                    path=path,
+                    content_hash=hashlib.sha256(path.read_bytes()).hexdigest(),
+                    folder=GENERAL_FOLDER if parent == self.root else parent.name,
+                )
+            )
+        return dashboards
+
+    def load_state(self) -> dict[str, dict[str, Any]]:
+        if not self.state_path.exists():
+            return {}
+        with open(self.state_path) as f:
+            return json.load(f)
+
+    def save_state(self, state: dict[str, dict[str, Any]]) -> None:
+        """Write the state file atomically"""
+        tmp_path = self.state_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(state, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.state_path)
+
+    def diff(
+        self,
+        local: list[LocalDashboard],
+        state: dict[str, dict[str, Any]],
+        remote_versions: dict[str, Optional[int]],
+    ) -> tuple[list[LocalDashboard], list[LocalDashboard]]:
+        """Split local dashboards into (changed, unchanged).
+
+        A dashboard is unchanged if its file hash matches the state and it
+        still exists remotely. The version Grafana returned from the last push
+        is trusted unless search reports a different one.
+        """
+        changed, unchanged = [], []
+        for dashboard in local:
+            known = state.get(dashboard.relpath)
+            if (
+                known is not None
+                and known.get("hash") == dashboard.content_hash
+                and known.get("uid") in remote_versions
+                and remote_versions[known["uid"]] in (None, known.get("version"))
+            ):
+                unchanged.append(dashboard)
+            else:
+                changed.append(dashboard)
+        return changed, unchanged
+
+    async def sync(self, dry_run: bool = False) -> SyncReport:
+        """Push changed dashboards and return what happened"""
+        report = SyncReport()
+        local = self.scan()
+        state = self.load_state()
+        remote_versions = await self._remote_versions()
+        changed, unchanged = self.diff(local, state, remote_versions)
+        report.unchanged = [dashboard.relpath for dashboard in unchanged]
+        logger.info(f"Dashboard sync: {len(changed)} changed, {len(unchanged)} unchanged")
+
+        if dry_run:
+            report.pushed = [dashboard.relpath for dashboard in changed]
+            return report
+
+        if changed:
+            folder_uids = await self._ensure_folders({d.folder for d in changed})
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            results = await asyncio.gather(
+                *(self._push(dashboard, folder_uids, semaphore) for dashboard in changed),
+                return_exceptions=True,
+            )
+            for dashboard, result in zip(changed, results):
+                if isinstance(result, BaseException):
+                    report.failed[dashboard.relpath] = str(result)
+                else:
+                    state[dashboard.relpath] = result
+                    report.pushed.append(dashboard.relpath)
+
+        present = {dashboard.relpath for dashboard in local}
+        self.save_state({path: entry for path, entry in state.items() if path in present})
+        return report
+
+    async def _remote_versions(self) -> dict[str, Optional[int]]:
+        """Remote dashboards by uid, with the version search reports (None if none).
+
+        Raw search hits are used, so dashboards whose metadata
+        ``DashboardMeta`` rejects still count as present remotely.
+        """
+        return {
+            hit["uid"]: hit.get("version")
+            async for hit in self.manager.iter_search_hits()
+            if hit.get("uid")
+        }
+
+    async def _push(
+        self,
+        dashboard: LocalDashboard,
+        folder_uids: dict[str, str],
+        semaphore: asyncio.Semaphore,
+    ) -> dict[str, Any]:
+        async with semaphore:
+            with open(dashboard.path) as f:
+                model = json.load(f)
+            model = model.get("dashboard", model)
+            if not model.get("uid"):
+                model["uid"] = _uid_for(dashboard.relpath)
+            result = await self.manager.async_push_dashboard(
+                model,
+                folder_uid=folder_uids[dashboard.folder],
+                message=f"sync {dashboard.content_hash[:12]}",
+            )
+            return {
+                "hash": dashboard.content_hash,
+                "uid": model["uid"],
+                "version": (result or {}).get("version"),
+            }
+
+    async def _ensure_folders(self, titles: set[str]) -> dict[str, str]:
+        """Map folder titles to uids, creating missing folders"""
+        folder_uids = {GENERAL_FOLDER: ""}
+        titles = titles - {GENERAL_FOLDER}
+        if not titles:
+            return folder_uids
+        grafana = await self.manager.client.get_async_client()
+        existing = {f["title"]: f["uid"] for f in await grafana.folder.async_get_all_folders()}
+        for title in sorted(titles):
+            if title not in existing:
+                created = await grafana.folder.async_create_folder(title)
+                existing[title] = created["uid"]
+            folder_uids[title] = existing[title]
+        return folder_uids
+
+
+def _uid_for(relpath: str) -> str:
+    """Stable uid for provisioning files that do not declare one"""
+    return "prov-" + hashlib.sha1(relpath.encode()).hexdigest()[:20]
+
+
+async def _main(args: argparse.Namespace) -> int:
+    client = GrafanaClient()
+    try:
+        engine = DashboardSyncEngine(
+            DashboardManager(client), root=args.root, max_concurrency=args.concurrency
+        )
+        report = await engine.sync(dry_run=args.dry_run)
+    finally:
+        await client.aclose()
+    print(
+        f"pushed={len(report.pushed)} unchanged={len(report.unchanged)} failed={len(report.failed)}"
+    )
+    for relpath, error in report.failed.items():
+        print(f"FAILED {relpath}: {error}")
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sync changed provisioning dashboards to Grafana")
+    parser.add_argument("--root", type=Path, default=DEFAULT_ROOT)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--dry-run", action="store_true")
+    raise SystemExit(asyncio.run(_main(parser.parse_args())))
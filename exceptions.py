@@ -197,6 +197,8 @@ class GrafanaTimeoutError(Exception):
         threshold: The configured threshold for this operation
     """
 
+    DEFAULT_CODE = "grafana_timeout"
+
     def __init__(self, operation: str, timeout: float, threshold: TimeoutThresholds):
         self.operation = operation
         self.timeout = timeout
@@ -206,3 +208,22 @@ class GrafanaTimeoutError(Exception):
             f"Configured thresholds: {threshold}"
         )
         super().__init__(message)
+
+
+class GrafanaCircuitOpenError(GrafanaError):
+    """Requests to an endpoint family are short-circuited after repeated failures"""
+
+    DEFAULT_CODE = "grafana_circuit_open"
+
+    def __init__(
+        self,
+        endpoint: str,
+        retry_in: float,
+        context: dict[str, Any] | None,
+    ):
+        detail = ErrorDetail(
+            code=self.DEFAULT_CODE,
+            message=f"Circuit open for Grafana {endpoint} API, retry in {retry_in:.1f}s",
+            context={"endpoint": endpoint, "retry_in": retry_in, **(context or {})},
+        )
+        super().__init__(detail)
@@ -0,0 +1,195 @@
+"""
+Buffered, batched recording of Prometheus metrics for hot paths.
+
+Every direct ``inc()`` / ``observe()`` takes the metric's lock, and labelled
+metrics also resolve ``.labels(...)`` per call. ``BufferedMetricRecorder``
+instead accumulates events in per-thread buffers (an asyncio loop records
+into its own thread's buffer) and applies them in bulk:
+- on an interval, from a background thread (``start``)
+- at scrape time, through the registry returned by ``scrape_registry``
+- on demand (``flush``)
+
+The hot path takes no lock: each thread only adds to its own running
+totals, and the flusher applies the difference since its previous flush,
+so nothing recorded while a flush is running is lost. Targets may be a
+metric, a metric child, or a zero-argument factory returning one (such as
+the ``get_*()`` helpers), resolved once per flush instead of once per event.
+"""
+
+import itertools
+import threading
+from collections import deque
+from collections.abc import Callable, Iterable
+from typing import Any, Optional, Union
+
+from prometheus_client import REGISTRY
+from prometheus_client.metrics import MetricWrapperBase
+
+Target = Union[MetricWrapperBase, Callable[[], MetricWrapperBase]]
+Labels = tuple[tuple[str, str], ...]
+_Key = tuple[Target, Labels]
+
+
+class _Buffer:
+    """Events recorded by one thread; only that thread writes to it"""
+
+    __slots__ = ("thread", "counts", "flushed", "gauges", "observations")
+
+    def __init__(self, thread: threading.Thread):
+        self.thread = thread
+        # Running totals per key; the flusher applies counts - flushed
+        self.counts: dict[_Key, float] = {}
+        self.flushed: dict[_Key, float] = {}
+        self.gauges: dict[_Key, tuple[int, float]] = {}
+        self.observations: deque[tuple[_Key, float]] = deque()
+
+
+class BufferedMetricRecorder:
+    """Accumulates counter, gauge and histogram/summary updates and applies them in bulk"""
+
+    def __init__(self):
+        self._local = threading.local()
+        self._buffers: list[_Buffer] = []
+        self._buffers_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._gauge_seq = itertools.count()
+        self._applied_gauges: dict[_Key, int] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def inc(self, target: Target, amount: float = 1.0, labels: Labels = ()) -> None:
+        """Buffer ``target.labels(**dict(labels)).inc(amount)``"""
+        try:
+            counts = self._local.counts
+        except AttributeError:
+            counts = self._buffer().counts
+        key = (target, labels)
+        counts[key] = counts.get(key, 0.0) + amount
+
+    def observe(self, target: Target, value: float, labels: Labels = ()) -> None:
+        """Buffer ``target.labels(**dict(labels)).observe(value)``"""
+        self._buffer().observations.append(((target, labels), value))
+
+    def observe_many(self, target: Target, values: Iterable[float], labels: Labels = ()) -> None:
+        key = (target, labels)
+        self._buffer().observations.extend((key, value) for value in values)
+
+    def set(self, target: Target, value: float, labels: Labels = ()) -> None:
+        """Buffer ``target.labels(**dict(labels)).set(value)``; the latest value wins on flush"""
+        try:
+            gauges = self._local.gauges
+        except AttributeError:
+            gauges = self._buffer().gauges
+        gauges[(target, labels)] = (next(self._gauge_seq), value)
+
+    def flush(self) -> None:
+        """Apply everything buffered so far to the underlying metrics"""
+        with self._flush_lock:
+            with self._buffers_lock:
+                buffers = list(self._buffers)
+            resolved: dict[_Key, MetricWrapperBase] = {}
+
+            def metric(key: _Key) -> MetricWrapperBase:
+                if key not in resolved:
+                    target, labels = key
+                    if not isinstance(target, MetricWrapperBase):
+                        target = target()
+                    resolved[key] = target.labels(**dict(labels)) if labels else target
+                return resolved[key]
+
+            deltas: dict[_Key, float] = {}
+            gauges: dict[_Key, tuple[int, float]] = {}
+
+            def collect(buffer: _Buffer) -> None:
+                for key, total in buffer.counts.copy().items():
+                    delta = total - buffer.flushed.get(key, 0.0)
+                    if delta:
+                        deltas[key] = deltas.get(key, 0.0) + delta
+                        buffer.flushed[key] = total
+                for key, (seq, value) in buffer.gauges.copy().items():
+                    if seq > gauges.get(key, (-1, 0.0))[0]:
+                        gauges[key] = (seq, value)
+                observations = buffer.observations
+                for _ in range(len(observations)):
+                    key, value = observations.popleft()
+                    metric(key).observe(value)
+
+            def apply() -> None:
+                for key, delta in deltas.items():
+                    metric(key).inc(delta)
+                for key, (seq, value) in gauges.items():
+                    if seq > self._applied_gauges.get(key, -1):
+                        metric(key).set(value)
+                        self._applied_gauges[key] = seq
+                deltas.clear()
+                gauges.clear()
+
+            for buffer in buffers:
+                collect(buffer)
+            apply()
+
+            # A finished thread records nothing more, but it may have recorded
+            # after its totals were copied above: apply what is left, then drop it
+            dead = [b for b in buffers if not b.thread.is_alive()]
+            if dead:
+                for buffer in dead:
+                    collect(buffer)
+                apply()
+                with self._buffers_lock:
+                    self._buffers = [b for b in self._buffers if b not in dead]
+
+    def start(self, interval: float) -> None:
+        """Flush every ``interval`` seconds from a daemon thread"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(interval,), name="grafana-metric-flush", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the flush thread and apply what is still buffered"""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def scrape_registry(self, registry: Any = REGISTRY) -> "FlushingRegistry":
+        """Registry to expose (``start_http_server``, ``generate_latest``) that flushes first"""
+        return FlushingRegistry(self, registry)
+
+    def _run(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            self.flush()
+
+    def _buffer(self) -> _Buffer:
+        try:
+            return self._local.buffer
+        except AttributeError:
+            buffer = self._local.buffer = _Buffer(threading.current_thread())
+            self._local.counts = buffer.counts
+            self._local.gauges = buffer.gauges
+            with self._buffers_lock:
+                self._buffers.append(buffer)
+            return buffer
+
+
+class FlushingRegistry:
+    """Registry proxy that flushes a recorder before every collection"""
+
+    def __init__(self, recorder: BufferedMetricRecorder, registry: Any):
+        self._recorder = recorder
+        self._registry = registry
+
+    def collect(self):
+        self._recorder.flush()
+        return self._registry.collect()
+
+    def restricted_registry(self, names: Iterable[str]) -> Any:
+        self._recorder.flush()
+        return self._registry.restricted_registry(names)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._registry, name)
@@ -0,0 +1,103 @@
+"""
+Bounded-cardinality label policy for Grafana operation metrics.
+
+Every distinct label value is a new Prometheus time series, so labels must
+come from small, fixed sets:
+- Errors are reduced to an error class: the ``DEFAULT_CODE`` of the matching
+  Grafana exception type, ``grafana_error`` for other Grafana errors, and
+  ``unknown`` for anything else. Raw error text never becomes a label.
+- Free-text fields (titles) are dropped or replaced by a short hash,
+  per ``GrafanaConfig.METRIC_LABEL_POLICY``.
+
+``MetricChildren`` caches the resolved ``.labels(...)`` children by their raw
+inputs, so recording a metric again is one dict lookup plus the update.
+"""
+
+import asyncio
+import hashlib
+from collections.abc import Callable, Hashable
+from typing import Any, Optional, Union
+
+from app.core.grafana.config import GrafanaConfig
+from app.core.grafana.exceptions import GrafanaError, GrafanaTimeoutError
+
+GENERIC_ERROR_CLASS = "grafana_error"
+UNKNOWN_ERROR_CLASS = "unknown"
+
+
+def _default_codes() -> dict[type, str]:
+    codes: dict[type, str] = {GrafanaTimeoutError: GrafanaTimeoutError.DEFAULT_CODE}
+    pending = [GrafanaError]
+    while pending:
+        cls = pending.pop()
+        if "DEFAULT_CODE" in vars(cls):
+            codes[cls] = cls.DEFAULT_CODE
+        pending.extend(cls.__subclasses__())
+    return codes
+
+
+_DEFAULT_CODES = _default_codes()
+ERROR_CLASSES = frozenset(_DEFAULT_CODES.values()) | {GENERIC_ERROR_CLASS, UNKNOWN_ERROR_CLASS}
+# Exception type -> error class, filled on first sight of each type
+_CLASS_BY_TYPE: dict[type, str] = {asyncio.TimeoutError: GrafanaTimeoutError.DEFAULT_CODE}
+
+
+def error_class(error: Union[BaseException, str, None]) -> str:
+    """Fixed error class for an exception (or its ``str()``); "" for no error"""
+    if not error:
+        return ""
+    if isinstance(error, str):
+        # str(GrafanaError) is "<code>: <message>"
+        code = error.split(":", 1)[0]
+        return code if code in ERROR_CLASSES else UNKNOWN_ERROR_CLASS
+    cls = type(error)
+    if cls not in _CLASS_BY_TYPE:
+        _CLASS_BY_TYPE[cls] = next(
+            (_DEFAULT_CODES[base] for base in cls.__mro__ if base in _DEFAULT_CODES),
+            GENERIC_ERROR_CLASS if isinstance(error, GrafanaError) else UNKNOWN_ERROR_CLASS,
+        )
+    return _CLASS_BY_TYPE[cls]
+
+
+def apply_label_policy(
+    labels: dict[str, str], policy: Optional[dict[str, str]] = None
+) -> dict[str, str]:
+    """Drop or hash the free-text labels named in ``policy``"""
+    policy = GrafanaConfig.METRIC_LABEL_POLICY if policy is None else policy
+    bounded = dict(labels)
+    for name, action in policy.items():
+        value = bounded.get(name)
+        if not value or action == "keep":
+            continue
+        if action == "hash":
+            bounded[name] = hashlib.blake2b(value.encode(), digest_size=4).hexdigest()
+        elif action == "drop":
+            bounded[name] = ""
+        else:
+            raise ValueError(f"Unknown label policy {action!r} for {name}")
+    return bounded
+
+
+class MetricChildren:
+    """Cache of resolved metric children keyed by the raw label inputs.
+
+    ``resolve`` builds the children for a key on a miss. The cache is
+    cleared when it exceeds ``max_size`` so unbounded inputs cannot grow it
+    without limit.
+    """
+
+    def __init__(self, resolve: Callable[..., Any], max_size: int = 10000):
+        self._resolve = resolve
+        self._children: dict[Hashable, Any] = {}
+        self.max_size = max_size
+
+    def get(self, key: tuple) -> Any:
+        children = self._children.get(key)
+        if children is None:
+            if len(self._children) >= self.max_size:
+                self._children.clear()
+            children = self._children[key] = self._resolve(*key)
+        return children
+
+    def clear(self) -> None:
+        self._children.clear()
@@ -16,14 +16,19 @@ See _docs/alerts.md for more details.
 """
 
 import logging
-from typing import Union
+from collections.abc import Callable, Iterable
+from typing import Any, Optional
 
 from prometheus_client import Counter, Gauge
 
 from app.core.grafana.alert_manager import AlertRule
+from app.core.grafana.config import GrafanaConfig
+from app.core.grafana.metric_buffer import BufferedMetricRecorder
+from app.core.grafana.metric_labels import MetricChildren, apply_label_policy, error_class
 from app.core.grafana.models.index import DashboardMeta, GrafanaDashboard
 from app.core.prometheus.metrics import (
-   
+    get_celery_task_count,
+    get_celery_task_latency,
     get_pulsar_cache_deletes,
     get_pulsar_cache_hits,
     get_pulsar_cache_misses,
@@ -83,124 +88,258 @@ TEST_FAILURE = Counter(
 
 
 # --- Unified Metric Recording Helper ---
+def _resolve_children(
+    operation: str,
+    status: str,
+    model_type: type,
+    uid: str,
+    title: str,
+    severity: str,
+    error: str,
+) -> tuple:
+    """(outcome counter child, response time gauge child) for one label combination"""
+    is_alert = issubclass(model_type, AlertRule)
+    labels = apply_label_policy(
+        {
+            "operation": operation,
+            "status": status,
+            "dashboard_uid": "" if is_alert else uid,
+            "dashboard_title": "" if is_alert else title,
+            "alert_uid": uid if is_alert else "",
+            "alert_title": title if is_alert else "",
+            "severity": severity,
+        }
+    )
+    if error:
+        counter = TEST_FAILURE.labels(**labels, error=error)
+    else:
+        counter = TEST_SUCCESS.labels(**labels)
+    return counter, API_RESPONSE_TIME.labels(**labels, error=error)
+
+
+_CHILDREN = MetricChildren(_resolve_children)
+
+
 def record_grafana_metric(
     operation: str,
     model: GrafanaDashboard | DashboardMeta | AlertRule,
     status: str,
     duration: float,
-    error: str | None,
+    error: BaseException | str | None,
 ) -> None:
     """
     Record Prometheus metrics for a Grafana operation using typed models for labels.
 
+    Label values are bounded (see ``metric_labels``): errors become an error
+    class and titles follow ``GrafanaConfig.METRIC_LABEL_POLICY``.
+
     Args:
         operation: The operation performed (e.g., 'dashboard_get', 'alert_create').
         model: The relevant Grafana model instance (dashboard, alert, etc.).
         status: The status/result (e.g., 'success', 'error', HTTP status).
         duration: Time taken for the operation in seconds.
-        error: Optional error message for failures.
+        error: Optional exception (or its message) for failures.
     """
-    labels = {
-        "operation": operation,
-        "status": status,
-        "dashboard_uid": getattr(model, "uid", ""),
-        "dashboard_title": getattr(model, "title", ""),
-        "alert_uid": getattr(model, "uid", "") if isinstance(model, AlertRule) else "",
-        "alert_title": getattr(model, "title", "")
-        if isinstance(model, AlertRule)
-        else "",
-        "severity": getattr(model, "severity", "")
-        if hasattr(model, "severity")
-        else "",
-        "error": error or "",
-    }
-    # Remove empty labels for metrics that don't use them
-    clean_labels = {k: v for k, v in labels.items() if v != ""}
-    if error:
-        TEST_FAILURE.labels(**clean_labels).inc()
-    else:
-        TEST_SUCCESS.labels(
-            **{k: v for k, v in clean_labels.items() if k != "error"}
-        ).inc()
-    API_RESPONSE_TIME.labels(**clean_labels).set(duration)
-    logger.info(
-        f"Recorded metric for {operation} | status={status} | duration={duration:.3f}s | labels={clean_labels}"
+    children = _CHILDREN.get(
+        (
+            operation,
+            status,
+            type(model),
+            getattr(model, "uid", "") or "",
+            getattr(model, "title", "") or "",
+            getattr(model, "severity", "") or "",
+            error_class(error),
+        )
     )
+    if _recorder is not None:
+        _recorder.inc(children[0])
+        _recorder.set(children[1], duration)
+    else:
+        children[0].inc()
+        children[1].set(duration)
+    logger.debug("Recorded metric for %s | status=%s | duration=%.3fs", operation, status, duration)
 
 
 def handle_grafana_exception(operation: str, model: object, exc: Exception) -> None:
     """
     Standardized error handling: log exception and increment failure metric.
     """
-    error_msg = str(exc)
-    logger.error(f"Grafana operation '{operation}' failed: {error_msg}")
+    logger.error(f"Grafana operation '{operation}' failed: {str(exc)}")
     record_grafana_metric(
         operation=operation,
         model=model,
         status="error",
         duration=0.0,
-        error=error_msg,
+        error=exc,
     )
 
 
+# --- Optional buffered recording (see metric_buffer) ---
+_recorder: Optional[BufferedMetricRecorder] = None
+
+
+def enable_buffered_metrics(
+    interval: Optional[float] = None,
+) -> BufferedMetricRecorder:
+    """Route the helpers below through a buffered recorder flushed every ``interval`` seconds.
+
+    Expose ``recorder.scrape_registry()`` instead of the default registry so
+    scrapes also see events recorded since the last interval flush.
+    """
+    global _recorder
+    if _recorder is None:
+        _recorder = BufferedMetricRecorder()
+        _recorder.start(interval or GrafanaConfig.METRICS_FLUSH_INTERVAL)
+    return _recorder
+
+
+def disable_buffered_metrics() -> None:
+    """Flush outstanding events and go back to direct recording"""
+    global _recorder
+    recorder, _recorder = _recorder, None
+    if recorder is not None:
+        recorder.stop()
+
+
+def _inc(factory: Callable[[], Any], amount: float = 1) -> None:
+    recorder = _recorder
+    if recorder is not None:
+        recorder.inc(factory, amount)
+    else:
+        factory().inc(amount)
+
+
+def _inc_labelled(factory: Callable[[], Any], amount: float, **labels: str) -> None:
+    recorder = _recorder
+    if recorder is not None:
+        recorder.inc(factory, amount, tuple(labels.items()))
+    else:
+        factory().labels(**labels).inc(amount)
+
+
 # Pulsar cache metric helpers
+def record_pulsar_cache_hits(n: int = 1) -> None:
+    """Increment Pulsar cache hit metric by ``n``"""
+    _inc(get_pulsar_cache_hits, n)
+
+
+def record_pulsar_cache_misses(n: int = 1) -> None:
+    """Increment Pulsar cache miss metric by ``n``"""
+    _inc(get_pulsar_cache_misses, n)
+
+
+def record_pulsar_cache_sets(n: int = 1) -> None:
+    """Increment Pulsar cache set metric by ``n``"""
+    _inc(get_pulsar_cache_sets, n)
+
+
+def record_pulsar_cache_deletes(n: int = 1) -> None:
+    """Increment Pulsar cache delete metric by ``n``"""
+    _inc(get_pulsar_cache_deletes, n)
+
+
 def record_pulsar_cache_hit():
     """Increment Pulsar cache hit metric"""
-    get_pulsar_cache_hits().inc()
+    _inc(get_pulsar_cache_hits)
 
 
 def record_pulsar_cache_miss():
     """Increment Pulsar cache miss metric"""
-    get_pulsar_cache_misses().inc()
+    _inc(get_pulsar_cache_misses)
 
 
 def record_pulsar_cache_set():
     """Increment Pulsar cache set metric"""
-    get_pulsar_cache_sets().inc()
+    _inc(get_pulsar_cache_sets)
 
 
 def record_pulsar_cache_delete():
     """Increment Pulsar cache delete metric"""
-    get_pulsar_cache_deletes().inc()
+    _inc(get_pulsar_cache_deletes)
 
 
 # Celery metric helpers
 def record_celery_task_success(task_name: str) -> None:
     """Increment Celery task success counter"""
-    get_celery_task_count().labels(task_name=task_name, status="success").inc()
+    _inc_labelled(get_celery_task_count, 1, task_name=task_name, status="success")
 
 
 def record_celery_task_failure(task_name: str) -> None:
     """Increment Celery task failure counter"""
-    get_celery_task_count().labels(task_name=task_name, status="failure").inc()
+    _inc_labelled(get_celery_task_count, 1, task_name=task_name, status="failure")
+
+
+def record_celery_task_successes(task_name: str, n: int) -> None:
+    """Increment Celery task success counter by ``n``"""
+    _inc_labelled(get_celery_task_count, n, task_name=task_name, status="success")
+
+
+def record_celery_task_failures(task_name: str, n: int) -> None:
+    """Increment Celery task failure counter by ``n``"""
+    _inc_labelled(get_celery_task_count, n, task_name=task_name, status="failure")
 
 
 def record_celery_task_latency(task_name: str, duration: float) -> None:
     """Observe Celery task execution duration"""
-    get_celery_task_latency().labels(task_name=task_name).observe(duration)
+    record_celery_task_latencies(task_name, (duration,))
+
+
+def record_celery_task_latencies(task_name: str, durations: Iterable[float]) -> None:
+    """Observe several Celery task execution durations"""
+    if _recorder is not None:
+        _recorder.observe_many(get_celery_task_latency, durations, (("task_name", task_name),))
+        return
+    histogram = get_celery_task_latency().labels(task_name=task_name)
+    for duration in durations:
+        histogram.observe(duration)
 
 
 # Valkey cache metric helpers
+def record_valkey_cache_hits(n: int = 1) -> None:
+    """Increment Valkey cache hit metric by ``n``"""
+    _inc(get_valkey_cache_hits, n)
+
+
+def record_valkey_cache_misses(n: int = 1) -> None:
+    """Increment Valkey cache miss metric by ``n``"""
+    _inc(get_valkey_cache_misses, n)
+
+
+def record_valkey_cache_sets(n: int = 1) -> None:
+    """Increment Valkey cache set metric by ``n``"""
+    _inc(get_valkey_cache_sets, n)
+
+
+def record_valkey_cache_deletes(n: int = 1) -> None:
+    """Increment Valkey cache delete metric by ``n``"""
+    _inc(get_valkey_cache_deletes, n)
+
+
+def record_valkey_cache_errors(n: int = 1) -> None:
+    """Increment Valkey cache error metric by ``n``"""
+    _inc(get_valkey_cache_errors, n)
+
+
 def record_valkey_cache_hit() -> None:
     """Increment Valkey cache hit metric"""
-    get_valkey_cache_hits().inc()
+    _inc(get_valkey_cache_hits)
 
 
 def record_valkey_cache_miss() -> None:
     """Increment Valkey cache miss metric"""
-    get_valkey_cache_misses().inc()
+    _inc(get_valkey_cache_misses)
 
 
 def record_valkey_cache_set() -> None:
     """Increment Valkey cache set metric"""
-    get_valkey_cache_sets().inc()
+    _inc(get_valkey_cache_sets)
 
 
 def record_valkey_cache_delete() -> None:
     """Increment Valkey cache delete metric"""
-    get_valkey_cache_deletes().inc()
+    _inc(get_valkey_cache_deletes)
 
 
 def record_valkey_cache_error() -> None:
     """Increment Valkey cache error metric"""
-    get_valkey_cache_errors().inc()
+    _inc(get_valkey_cache_errors)
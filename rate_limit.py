@@ -0,0 +1,140 @@
+"""
+Client-side adaptive rate limiting for Grafana API calls.
+
+A single ``AdaptiveTokenBucket`` lives on each ``GrafanaClient`` and every
+request (sync adapter and async transport) reserves a token before it is
+sent. The bucket re-tunes itself from the ``X-RateLimit-Limit``,
+``X-RateLimit-Remaining`` and ``X-RateLimit-Reset`` response headers so bulk
+jobs run close to the server's allowed rate instead of tripping 429s.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections.abc import Mapping
+from typing import Any, Optional
+
+from prometheus_client import Gauge, Histogram
+
+logger = logging.getLogger("grafana.rate_limit")
+
+RATE_LIMIT_WAIT = Histogram(
+    "grafana_client_rate_limit_wait_seconds",
+    "Time spent waiting for a rate limit token",
+)
+RATE_LIMIT_RATE = Gauge(
+    "grafana_client_rate_limit_tokens_per_second",
+    "Current adaptive token refill rate",
+)
+
+# Reset values above this are epoch timestamps rather than relative seconds
+_EPOCH_THRESHOLD = 1_000_000_000
+
+
+class AdaptiveTokenBucket:
+    """Thread- and asyncio-safe token bucket tuned by server rate limit headers.
+
+    Tokens are reserved under a short lock; the balance may go negative, in
+    which case the caller sleeps for the deficit. This keeps the ordering fair
+    between threads and tasks without holding the lock while sleeping.
+    """
+
+    def __init__(self, rate: float, capacity: float, min_rate: float = 0.1):
+        self.max_rate = rate
+        self.min_rate = min_rate
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+        RATE_LIMIT_RATE.set(rate)
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block the current thread until ``tokens`` are available"""
+        delay = self._reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+        RATE_LIMIT_WAIT.observe(delay)
+        return delay
+
+    async def async_acquire(self, tokens: float = 1.0) -> float:
+        """Suspend the current task until ``tokens`` are available"""
+        delay = self._reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        RATE_LIMIT_WAIT.observe(delay)
+        return delay
+
+    def update_from_headers(self, headers: Mapping[str, Any]) -> None:
+        """Re-tune the bucket from ``X-RateLimit-*`` response headers"""
+        limit = _to_float(headers.get("X-RateLimit-Limit"))
+        remaining = _to_float(headers.get("X-RateLimit-Remaining"))
+        reset_in = _seconds_until(headers.get("X-RateLimit-Reset"))
+        if limit is None or remaining is None:
+            return
+
+        with self._lock:
+            self._refill(time.monotonic())
+            self.capacity = max(limit, 1.0)
+            self._tokens = min(self._tokens, remaining)
+            if reset_in is not None and reset_in > 0 and remaining <= 0:
+                # Nothing left: hold everyone until the reset, then the server
+                # grants a fresh window, so resume at full speed rather than
+                # at the trickle a zero budget would otherwise compute
+                self._blocked_until = time.monotonic() + reset_in
+                self.rate = self.max_rate
+            elif reset_in is not None and reset_in > 0:
+                # Spread what is left of the window evenly over the time until reset
+                self.rate = min(self.max_rate, max(self.min_rate, remaining / reset_in))
+            else:
+                self.rate = self.max_rate
+            RATE_LIMIT_RATE.set(self.rate)
+
+    def pause(self, seconds: float) -> None:
+        """Stop handing out tokens for ``seconds`` (e.g. after a 429)"""
+        with self._lock:
+            self._tokens = min(self._tokens, 0.0)
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+        logger.warning(f"Grafana rate limit hit, pausing requests for {seconds:.2f}s")
+
+    def _reserve(self, tokens: float) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= tokens
+            delay = max(0.0, self._blocked_until - now)
+            if self._tokens < 0:
+                delay += -self._tokens / self.rate
+            return delay
+
+    def _refill(self, now: float) -> None:
+        start = max(self._updated, self._blocked_until)
+        if now > start:
+            self._tokens = min(self.capacity, self._tokens + (now - start) * self.rate)
+        self._updated = max(now, self._updated)
+
+
+def retry_after_seconds(headers: Mapping[str, Any]) -> Optional[float]:
+    """Seconds to wait after a 429 from ``Retry-After`` or ``X-RateLimit-Reset``"""
+    retry_after = _to_float(headers.get("Retry-After"))
+    if retry_after is not None:
+        return max(retry_after, 0.0)
+    return _seconds_until(headers.get("X-RateLimit-Reset"))
+
+
+def _to_float(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _seconds_until(reset: Any) -> Optional[float]:
+    value = _to_float(reset)
+    if value is None:
+        return None
+    if value > _EPOCH_THRESHOLD:
+        return max(value - time.time(), 0.0)
+    return max(value, 0.0)
@@ -0,0 +1,182 @@
+"""
+Central retry policy for Grafana operations.
+
+Replaces the per-method ``wait_exponential(min=4, max=10)`` stacks with:
+- Decorrelated jitter starting in the tens of milliseconds
+- ``Retry-After`` / ``X-RateLimit-Reset`` honored for rate limit errors
+- A total deadline per operation class (``read``/``write``/``backup`` from
+  ``TimeoutThresholds``) shared by all attempts, so no call outlives its budget:
+  sleeps stop at the deadline, and the client clamps every attempt's request
+  timeout to what is left of it (``attempt_timeout``), failing with
+  ``GrafanaTimeoutError`` once nothing is left
+- Bulk operations made of many requests (``backup``) bound their retries by
+  the budget but do not impose it on each request; the deadline lives in a
+  ContextVar, which worker threads would not see anyway
+"""
+
+import asyncio
+import functools
+import random
+import time
+from contextvars import ContextVar
+from typing import Any, Optional
+
+from tenacity import RetryCallState, retry, retry_if_exception_type
+from tenacity.stop import stop_base
+from tenacity.wait import wait_base
+
+from app.core.grafana.config import GrafanaConfig
+from app.core.grafana.exceptions import (
+    GrafanaRateLimitError,
+    GrafanaTimeoutError,
+)
+from app.core.grafana.models.index import TimeoutThresholds
+
+RETRYABLE_ERRORS = (GrafanaRateLimitError, GrafanaTimeoutError)
+
+_DEFAULT_THRESHOLDS = TimeoutThresholds()
+
+# (monotonic deadline, operation, thresholds) of the tightest retried operation
+# running in this context
+_DEADLINE: ContextVar[Optional[tuple[float, str, TimeoutThresholds]]] = ContextVar(
+    "grafana_retry_deadline", default=None
+)
+
+
+def _owner_thresholds(args: tuple) -> TimeoutThresholds:
+    """Thresholds of the decorated method's owner (``self.timeout``), if any"""
+    thresholds = getattr(args[0], "timeout", None) if args else None
+    if isinstance(thresholds, TimeoutThresholds):
+        return thresholds
+    return _DEFAULT_THRESHOLDS
+
+
+def _thresholds(retry_state: RetryCallState) -> TimeoutThresholds:
+    return _owner_thresholds(retry_state.args)
+
+
+def attempt_timeout(timeout: float) -> float:
+    """``timeout`` clamped to what is left of the current operation's budget.
+
+    Raises ``GrafanaTimeoutError`` if the budget is already spent.
+    """
+    current = _DEADLINE.get()
+    if current is None:
+        return timeout
+    deadline, operation, thresholds = current
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise GrafanaTimeoutError(
+            operation=operation, timeout=thresholds.get(operation), threshold=thresholds
+        )
+    return min(timeout, remaining)
+
+
+def _enter_deadline(operation: str, args: tuple) -> Any:
+    thresholds = _owner_thresholds(args)
+    current = (time.monotonic() + thresholds.get(operation), operation, thresholds)
+    outer = _DEADLINE.get()
+    return _DEADLINE.set(current if outer is None or current[0] < outer[0] else outer)
+
+
+def _retry_after(retry_state: RetryCallState) -> Optional[float]:
+    """Server-requested delay carried by a rate limit error"""
+    if retry_state.outcome is None or not retry_state.outcome.failed:
+        return None
+    error = retry_state.outcome.exception()
+    if isinstance(error, GrafanaRateLimitError):
+        return (error.detail.context or {}).get("retry_after")
+    return None
+
+
+def _remaining(retry_state: RetryCallState, operation: str) -> float:
+    budget = _thresholds(retry_state).get(operation)
+    return budget - (retry_state.seconds_since_start or 0.0)
+
+
+class wait_decorrelated_jitter(wait_base):
+    """Decorrelated jitter (``min(cap, uniform(base, prev * 3))``) that never
+    sleeps less than ``Retry-After`` nor past the operation deadline"""
+
+    def __init__(self, operation: str, base: float, cap: float):
+        self.operation = operation
+        self.base = base
+        self.cap = cap
+
+    def __call__(self, retry_state: RetryCallState) -> float:
+        previous = max(getattr(retry_state, "upcoming_sleep", 0.0) or 0.0, self.base)
+        sleep = min(self.cap, random.uniform(self.base, previous * 3))
+        retry_after = _retry_after(retry_state)
+        if retry_after is not None:
+            sleep = max(sleep, retry_after)
+        return max(0.0, min(sleep, _remaining(retry_state, self.operation)))
+
+
+class stop_after_budget(stop_base):
+    """Stop on ``retry_attempts`` or when the operation budget cannot cover
+    the next attempt (including any server-requested ``Retry-After``)"""
+
+    def __init__(self, operation: str):
+        self.operation = operation
+
+    def __call__(self, retry_state: RetryCallState) -> bool:
+        if retry_state.attempt_number >= max(1, _thresholds(retry_state).retry_attempts):
+            return True
+        return _remaining(retry_state, self.operation) <= (_retry_after(retry_state) or 0.0)
+
+
+def grafana_retry(
+    operation: str,
+    retry_on: Any = RETRYABLE_ERRORS,
+    bound_requests: bool = True,
+    **kwargs: Any,
+):
+    """Retry decorator for a Grafana operation class (``read``, ``write``, ``backup``).
+
+    Works for sync and async callables. Extra keyword arguments are passed
+    through to ``tenacity.retry`` (e.g. ``before_sleep``). While the call runs,
+    its deadline bounds the timeout of every request it makes, unless
+    ``bound_requests`` is False (bulk operations whose total runtime grows
+    with the instance).
+    """
+    retrying = retry(
+        stop=stop_after_budget(operation),
+        wait=wait_decorrelated_jitter(
+            operation,
+            base=GrafanaConfig.RETRY_BASE_DELAY,
+            cap=GrafanaConfig.RETRY_MAX_DELAY,
+        ),
+        retry=retry_if_exception_type(retry_on),
+        **kwargs,
+    )
+
+    def decorator(fn):
+        retried = retrying(fn)
+        if not bound_requests:
+            return retried
+
+        if asyncio.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def run_async(*args, **kw):
+                token = _enter_deadline(operation, args)
+                try:
+                    return await retried(*args, **kw)
+                finally:
+                    _DEADLINE.reset(token)
+
+            run_async.retry = retried.retry
+            return run_async
+
+        @functools.wraps(fn)
+        def run(*args, **kw):
+            token = _enter_deadline(operation, args)
+            try:
+                return retried(*args, **kw)
+            finally:
+                _DEADLINE.reset(token)
+
+        run.retry = retried.retry
+        return run
+
+    return decorator
@@ -0,0 +1,100 @@
+"""
+Single-flight request coalescing for identical concurrent reads.
+
+While a call for a key is in flight, later callers with the same key wait for
+it and share its outcome instead of issuing their own upstream request.
+Works across threads (``do``) and asyncio tasks (``do_async``).
+"""
+
+import asyncio
+import threading
+import weakref
+from collections.abc import Awaitable, Hashable
+from typing import Any, Callable, Optional
+
+from prometheus_client import Counter
+
+SINGLE_FLIGHT_SHARED = Counter(
+    "grafana_client_single_flight_shared_total",
+    "Requests served by joining an identical in-flight request",
+    ["mode"],
+)
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Collapse concurrent calls with the same key into one execution"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+        # Tasks are bound to their event loop, so in-flight async calls are tracked per loop
+        self._async_calls: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def do(
+        self,
+        key: Hashable,
+        fn: Callable[[], Any],
+        clone: Optional[Callable[[Any], Any]] = None,
+    ) -> Any:
+        """Run ``fn`` once for all threads asking for ``key`` concurrently.
+
+        Followers receive ``clone(result)`` when ``clone`` is given, so callers
+        that mutate the result do not see each other's changes.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            SINGLE_FLIGHT_SHARED.labels("thread").inc()
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return clone(call.result) if clone else call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Await one shared ``fn()`` for all tasks asking for ``key`` concurrently.
+
+        The shared call runs in its own task, so cancelling one waiter does not
+        cancel the request for the others.
+        """
+        loop = asyncio.get_running_loop()
+        calls = self._async_calls.setdefault(loop, {})
+        task = calls.get(key)
+        if task is None:
+            task = loop.create_task(fn())
+            calls[key] = task
+
+            def _forget(finished: asyncio.Task) -> None:
+                if calls.get(key) is finished:
+                    del calls[key]
+
+            task.add_done_callback(_forget)
+        else:
+            SINGLE_FLIGHT_SHARED.labels("async").inc()
+        return await asyncio.shield(task)